@@ -1,4 +1,8 @@
-from flask import Flask, request, jsonify, send_from_directory
+import time
+# Start of the import-time profile reported at the end of this module
+BOOT_STARTED = time.perf_counter()
+
+from flask import Flask, Request, request, jsonify, send_from_directory, Response, stream_with_context
 from flask_cors import CORS
 import os
 import sqlite3
@@ -6,49 +10,218 @@ from datetime import datetime
 import json
 from werkzeug.utils import secure_filename
 import uuid
+from dotenv import load_dotenv
+
+# Load backend/.env before any configuration is read
+load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env'))
 
-from services.resume_parser import ResumeParser
-from services.gemini_service import GeminiService
-from services.bias_detection import BiasDetector
+from services.lazy_service import LazyService, import_object, service_status
+from services.gemini_client import RateLimitError
 from services.database import DatabaseManager
-from services.email_service import EmailService
+from services.prompt_builder import PromptBuilder
+from services.screening import ScreeningService
+from services.chat_sessions import ChatSessionManager
+from services.upload_pipeline import UploadPipeline
+from services.job_queue import UploadJobQueue
+from services.batch_upload import BatchUploader
+from services.candidate_query import CandidateQueryService
+from services.response_cache import ResponseCache
+from services.response_encoding import FastJSONProvider, ResponseCompressor
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 CORS(app)
 
 # Configuration
 UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'pdf', 'docx'}
 MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
+# /api/upload/batch takes many resumes (or a ZIP) in one request
+BATCH_MAX_CONTENT_LENGTH = int(os.getenv('BATCH_UPLOAD_MAX_BYTES', str(512 * 1024 * 1024)))
+# /api/statistics counts recent uploads, so its cached copy also expires
+STATISTICS_CACHE_SECONDS = 60
+# Upload job progress streams poll the job table and end after the timeout.
+# A stream holds its worker the whole time: serve it from gthread or gevent
+# workers, on sync workers keep the timeout below gunicorn's --timeout
+JOB_EVENTS_POLL_SECONDS = 0.5
+JOB_EVENTS_TIMEOUT = float(os.getenv('JOB_EVENTS_TIMEOUT', '300'))
 
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
 
+
+class UploadRequest(Request):
+    """Request whose body limit is raised for the batch endpoint only.
+
+    Werkzeug enforces max_content_length while reading the body, so chunked
+    requests without a Content-Length are cut off at the limit too.
+    """
+
+    @property
+    def max_content_length(self):
+        if self.endpoint == 'upload_batch':
+            return BATCH_MAX_CONTENT_LENGTH
+        return super().max_content_length
+
+
+app.request_class = UploadRequest
+
 # Ensure upload directory exists
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
-# Initialize services
-resume_parser = ResumeParser()
-ai_service = GeminiService()
-bias_detector = BiasDetector()
+# Initialize services. Services with heavy imports (NumPy, PyPDF2, python-docx,
+# the Google SDK) or start-up work are built on first use, so importing this
+# module (and booting a gunicorn worker) stays fast.
 db_manager = DatabaseManager()
-email_service = EmailService()
+# Shared so compacting a JD does not build the AI service
+prompt_builder = PromptBuilder()
+resume_parser = LazyService('resume_parser', lambda: import_object('services.resume_parser.ResumeParser')())
+local_scorer = LazyService('local_scorer', lambda: import_object('services.local_scorer.LocalScorer')(
+    resume_parser, db_manager
+))
+ai_service = LazyService('ai_service', lambda: import_object('services.gemini_service.GeminiService')(
+    local_scorer=local_scorer, prompt_builder=prompt_builder
+))
+bias_detector = LazyService('bias_detector', lambda: import_object('services.bias_detection.BiasDetector')())
+email_service = LazyService('email_service', lambda: import_object('services.email_service.EmailService')())
+bias_rescorer = LazyService('bias_rescorer', lambda: import_object('services.bias_rescoring.BiasRescorer')(
+    bias_detector, db_manager
+))
+bias_analytics = LazyService('bias_analytics', lambda: import_object('services.bias_analytics.BiasAnalytics')(
+    db_manager
+))
+job_profiles = LazyService('job_profiles', lambda: import_object('services.job_profile.JobProfileService')(
+    db_manager, resume_parser, prompt_builder
+))
+screening = ScreeningService(ai_service, local_scorer, job_profiles, db_manager)
+vector_index = LazyService('vector_index', lambda: import_object('services.vector_index.VectorIndex')(
+    db_manager, resume_parser
+))
+hr_context = LazyService('hr_context', lambda: import_object('services.hr_context.HRContextRetriever')(
+    db_manager, vector_index, prompt_builder
+))
+chat_sessions = ChatSessionManager(db_manager, ai_service)
+upload_pipeline = UploadPipeline(
+    resume_parser, bias_detector, bias_rescorer, job_profiles, screening, db_manager, vector_index
+)
+upload_jobs = UploadJobQueue(db_manager, upload_pipeline)
+batch_uploader = BatchUploader(upload_pipeline, UPLOAD_FOLDER)
+candidate_query = CandidateQueryService(db_manager)
+response_cache = ResponseCache(db_manager)
+compressor = ResponseCompressor()
+
+@app.before_request
+def read_body_within_limit():
+    """Read request bodies before the view, so an oversized one is answered with a 413
+    instead of the view's generic error handling"""
+    if request.method in ('POST', 'PUT', 'PATCH'):
+        if request.mimetype in ('multipart/form-data', 'application/x-www-form-urlencoded'):
+            request.form
+        else:
+            request.get_data()
+
+@app.errorhandler(413)
+def request_too_large(error):
+    limit_mb = request.max_content_length // (1024 * 1024)
+    return jsonify({'error': f'Request too large. Maximum size is {limit_mb}MB'}), 413
+
+@app.after_request
+def compress_response(response):
+    """gzip/brotli for large buffered responses (streams are left alone)"""
+    return compressor.finish(response, request.accept_encodings)
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def rate_limited_response(error):
+    """429 with Retry-After for a RateLimitError from the Gemini client"""
+    response = jsonify({'error': 'AI quota exceeded. Please try again shortly.', 'retry_after': error.retry_after})
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response, 429
+
+def cached_json(key, build, ttl=None, not_found='Not found'):
+    """JSON response served from the response cache, with an ETag for conditional GETs.
+
+    build() returns the payload, or None for a 404. Clients whose
+    If-None-Match is still current get an empty 304. Compressed bodies are
+    cached too, per encoding.
+    """
+    etag = response_cache.etag(ttl)
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        response.vary.add('Accept-Encoding')
+    else:
+        def serialize():
+            payload = build()
+            return None if payload is None else app.json.dumps_bytes(payload)
+        body = response_cache.get(key, etag, serialize)
+        if body is None:
+            return jsonify({'error': not_found}), 404
+        encoding = compressor.choose(request.accept_encodings, len(body))
+        if encoding:
+            raw = body
+            body = response_cache.get(f'{key}|{encoding}', etag, lambda: compressor.compress(raw, encoding))
+        response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        if encoding:
+            compressor.finish(response, request.accept_encodings, encoding)
+    # Always revalidate, the ETag makes that cheap
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def sse_event(event, data):
+    """Format one Server-Sent Event with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def sse_response(events):
+    return Response(
+        stream_with_context(events),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+def stream_chat(chunks, on_complete):
+    """Forward text chunks as 'token' events, then persist and send 'done'.
+
+    on_complete may return a dict of extra fields for the 'done' payload.
+    """
+    parts = []
+    try:
+        for text in chunks:
+            parts.append(text)
+            yield sse_event('token', {'text': text})
+        response_text = ''.join(parts)
+        extra = on_complete(response_text) or {}
+        yield sse_event('done', dict(extra, response=response_text, timestamp=datetime.now().isoformat()))
+    except Exception as e:
+        print(f"Error in streaming chat: {e}")
+        yield sse_event('error', {'error': 'Failed to process chat message'})
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
-    return jsonify({'status': 'healthy', 'timestamp': datetime.now().isoformat()})
+    # Health probes must not build the AI service on a fresh worker
+    services_ms = service_status()
+    return jsonify({
+        'status': 'healthy',
+        'llm_circuit': ai_service.client.breaker.stats() if services_ms['ai_service'] is not None else None,
+        'response_cache': response_cache.stats(),
+        'boot': {'import_ms': IMPORT_MS, 'services_ms': services_ms},
+        'timestamp': datetime.now().isoformat()
+    })
 
 @app.route('/api/upload', methods=['POST'])
 def upload_resume():
+    """Analyze a resume; with async=true it is queued and 202 + a job id is returned"""
     try:
         if 'file' not in request.files:
             return jsonify({'error': 'No file provided'}), 400
         
         file = request.files['file']
         job_description = request.form.get('job_description', '')
+        bypass_cache = request.form.get('bypass_cache', '').lower() in ('1', 'true', 'yes')
+        screening_mode = request.form.get('screening_mode')
+        run_async = (request.form.get('async') or request.args.get('async', '')).lower() in ('1', 'true', 'yes')
         
         if file.filename == '':
             return jsonify({'error': 'No file selected'}), 400
@@ -62,85 +235,195 @@ def upload_resume():
         file_path = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
         file.save(file_path)
         
-        # Parse resume
-        resume_text = resume_parser.extract_text(file_path)
-        
-        # Local Contact Info Extraction (Privacy First)
-        local_contact_info = resume_parser.extract_contact_info(resume_text)
-        
-        # Anonymize resume before sending to AI
-        blind_resume = bias_detector.create_blind_resume(resume_text)
-        
-        # AI Analysis (using anonymized text)
-        analysis = ai_service.analyze_resume(blind_resume, job_description)
-        
-        # Restore real contact info to the analysis object before saving/returning
-        if 'contact_info' not in analysis:
-            analysis['contact_info'] = {}
-        
-        # Get extracted info or existing values
-        real_name = local_contact_info.get('name')
-        real_email = local_contact_info.get('email')
-        real_phone = local_contact_info.get('phone')
-        
-        # Fallback logic: If local extraction failed, check if AI returned a placeholder
-        # and replace it with something meaningful (like the filename)
-        current_ai_name = analysis.get('contact_info', {}).get('name', 'Candidate Name')
-        if not real_name or '[CANDIDATE' in current_ai_name:
-            # Try once more to get name from the very first line if locals failed
-            lines = [l.strip() for l in resume_text.split('\n') if l.strip()]
-            if lines:
-                real_name = real_name or lines[0]
-            else:
-                real_name = real_name or filename.split('_')[-1] # Fallback to filename (stripped of UUID)
-        
-        # Update analysis with the best local data available
-        analysis['contact_info'].update({
-            'name': real_name if real_name else filename,
-            'email': real_email if real_email else 'Email not found',
-            'phone': real_phone if real_phone else 'Phone not found'
-        })
-        
-        # Bias Detection (also done locally)
-        bias_analysis = bias_detector.analyze_bias(resume_text)
-        
-        # Save to database
-        candidate_id = db_manager.save_candidate({
-            'filename': filename,
-            'file_path': file_path,
-            'resume_text': resume_text,
-            'job_description': job_description,
-            'analysis': analysis,
-            'bias_analysis': bias_analysis,
-            'blind_resume': blind_resume,
-            'upload_date': datetime.now().isoformat()
-        })
-        
-        return jsonify({
-            'success': True,
-            'candidate_id': candidate_id,
-            'analysis': analysis,
-            'bias_analysis': bias_analysis
-        })
-        
+        if run_async:
+            job_id = upload_jobs.submit({
+                'file_path': file_path,
+                'filename': filename,
+                'job_description': job_description,
+                'screening_mode': screening_mode,
+                'bypass_cache': bypass_cache
+            })
+            return jsonify({
+                'success': True,
+                'job_id': job_id,
+                'status': 'queued',
+                'status_url': f'/api/jobs/{job_id}',
+                'events_url': f'/api/jobs/{job_id}/events'
+            }), 202
+        
+        result = upload_pipeline.process(
+            file_path, filename, job_description,
+            screening_mode=screening_mode, bypass_cache=bypass_cache
+        )
+        return jsonify(dict(result, success=True))
+        
+    except RateLimitError as e:
+        return rate_limited_response(e)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/upload/batch', methods=['POST'])
+def upload_batch():
+    """Analyze many resumes (files and/or ZIP archives), streaming one NDJSON line per resume"""
+    uploads = [upload for upload in request.files.getlist('files') + request.files.getlist('file') if upload.filename]
+    if not uploads:
+        return jsonify({'error': 'No files provided'}), 400
+    
+    # Resuming a paused batch: per file, how many resumes were already started
+    try:
+        skip = [int(count) for count in json.loads(request.form.get('skip') or '[]')]
+    except (TypeError, ValueError):
+        return jsonify({'error': 'skip must be a JSON list of integers'}), 400
+
+    try:
+        items, skipped = batch_uploader.plan(uploads, skip=skip)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if not items:
+        return jsonify({'error': 'No PDF or DOCX resumes found', 'skipped': skipped}), 400
+    
+    options = {
+        'job_description': request.form.get('job_description', ''),
+        'screening_mode': request.form.get('screening_mode'),
+        'bypass_cache': request.form.get('bypass_cache', '').lower() in ('1', 'true', 'yes')
+    }
+    lines = (json.dumps(event) + '\n' for event in batch_uploader.run(items, skipped, **options))
+    return Response(
+        stream_with_context(lines),
+        mimetype='application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_upload_job(job_id):
+    job = upload_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify({'job': job})
+
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def upload_job_events(job_id):
+    """SSE stream of 'progress' events, ending with 'done' (the upload result) or 'failed'.
+
+    Needs gthread or gevent workers; the frontend polls /api/jobs/<job_id>
+    instead, which works with any worker class.
+    """
+    if upload_jobs.get(job_id) is None:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    def events():
+        last = None
+        last_sent = time.time()
+        deadline = last_sent + JOB_EVENTS_TIMEOUT
+        while time.time() < deadline:
+            job = upload_jobs.get(job_id)
+            if job['status'] == 'done':
+                yield sse_event('done', dict(job['result'], success=True, job_id=job_id))
+                return
+            if job['status'] == 'failed':
+                yield sse_event('failed', {'job_id': job_id, 'error': job['error']})
+                return
+            state = (job['status'], job['stage'], job['attempts'])
+            if state != last:
+                last = state
+                last_sent = time.time()
+                yield sse_event('progress', {
+                    'job_id': job_id, 'status': job['status'], 'stage': job['stage'], 'attempts': job['attempts']
+                })
+            elif time.time() - last_sent > 15:
+                # Keeps proxies from closing an idle stream
+                last_sent = time.time()
+                yield ': keep-alive\n\n'
+            time.sleep(JOB_EVENTS_POLL_SECONDS)
+        # EventSource reconnects on its own and resumes from the current state
+    
+    return sse_response(events())
+
+@app.route('/api/job-profile', methods=['POST'])
+def get_job_profile():
+    try:
+        data = request.get_json() or {}
+        job_profile = job_profiles.get_profile(data.get('job_description', ''))
+        if job_profile is None:
+            return jsonify({'error': 'Job description is required'}), 400
+        return jsonify({'job_profile': job_profile.to_dict()})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/candidates/<int:candidate_id>/promote', methods=['POST'])
+def promote_candidate(candidate_id):
+    try:
+        data = request.get_json(silent=True) or {}
+        analysis = screening.promote(candidate_id, bypass_cache=bool(data.get('bypass_cache')))
+        if analysis is None:
+            return jsonify({'error': 'Candidate not found'}), 404
+        return jsonify({'success': analysis.get('analysis_source') != 'local', 'analysis': analysis})
+    except RateLimitError as e:
+        return rate_limited_response(e)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/screening/promote', methods=['POST'])
+def promote_top_candidates():
+    try:
+        data = request.get_json() or {}
+        top_k = data.get('top_k')
+        promoted = screening.promote_top(data.get('job_description', ''), int(top_k) if top_k else None)
+        return jsonify({'success': True, 'promoted': promoted})
+    except RateLimitError as e:
+        return rate_limited_response(e)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/match', methods=['GET'])
+def match_candidates():
+    """Candidates most similar to a job description (cosine over local vectors)"""
+    try:
+        job_description = request.args.get('jd', '')
+        top_k = max(1, min(request.args.get('top', 20, type=int), 500))
+        if not job_description.strip():
+            return jsonify({'error': 'Query parameter jd is required'}), 400
+        
+        matches = vector_index.search(job_description, top_k)
+        summaries = db_manager.get_candidate_summaries([candidate_id for candidate_id, _ in matches])
+        results = [
+            dict(summaries[candidate_id], similarity=similarity)
+            for candidate_id, similarity in matches if candidate_id in summaries
+        ]
+        return jsonify({'matches': results, 'indexed': len(vector_index)})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/candidates', methods=['GET'])
 def get_candidates():
     try:
-        candidates = db_manager.get_all_candidates()
-        return jsonify({'candidates': candidates})
+        return cached_json('candidates', lambda: {'candidates': db_manager.get_all_candidates()})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/candidates/query', methods=['GET'])
+def query_candidates():
+    """Filtered, sorted page of candidates with facet counts.
+
+    Filters: q, min_score, max_score, min_experience, max_experience,
+    date_range (all|today|week|month|year) and repeatable category, skill,
+    location and education. Sort with sort (score|experience|date|name) and
+    order (asc|desc), page with limit and the returned next_cursor.
+    """
+    try:
+        return jsonify(candidate_query.query(request.args))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/candidates/<int:candidate_id>', methods=['GET'])
 def get_candidate(candidate_id):
     try:
-        candidate = db_manager.get_candidate(candidate_id)
-        if not candidate:
-            return jsonify({'error': 'Candidate not found'}), 404
-        return jsonify({'candidate': candidate})
+        def build():
+            candidate = db_manager.get_candidate(candidate_id)
+            return {'candidate': candidate} if candidate else None
+        return cached_json(f'candidate:{candidate_id}', build, not_found='Candidate not found')
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -158,14 +441,42 @@ def get_bias_analysis(candidate_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/bias-analysis/summary', methods=['GET'])
+def get_bias_summary():
+    """Cohort-level bias distributions, indicator frequencies and risk breakdown"""
+    try:
+        job_description = request.args.get('job_description')
+        top_indicators = request.args.get('top', 25, type=int)
+        
+        summary = bias_analytics.summary(job_description, top_indicators)
+        return jsonify({'summary': summary})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/bias-analysis/rescore', methods=['GET', 'POST'])
+def rescore_bias_analysis():
+    """Start (POST) or inspect (GET) incremental re-scoring of stale bias analyses"""
+    try:
+        started = False
+        if request.method == 'POST':
+            started = bias_rescorer.start_background()
+        
+        return jsonify({
+            'started': started,
+            'detector_version': bias_rescorer.version,
+            'stale_candidates': bias_rescorer.stale_count(),
+            'status': bias_rescorer.status
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/blind-resume/<int:candidate_id>', methods=['GET'])
 def get_blind_resume(candidate_id):
     try:
-        candidate = db_manager.get_candidate(candidate_id)
-        if not candidate:
-            return jsonify({'error': 'Candidate not found'}), 404
-        
-        return jsonify({'blind_resume': candidate.get('blind_resume', '')})
+        def build():
+            candidate = db_manager.get_candidate(candidate_id)
+            return {'blind_resume': candidate.get('blind_resume', '')} if candidate else None
+        return cached_json(f'blind-resume:{candidate_id}', build, not_found='Candidate not found')
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -173,22 +484,72 @@ def get_blind_resume(candidate_id):
 def candidate_chat():
     try:
         data = request.get_json()
-        candidate_id = data.get('candidate_id')
         message = data.get('message')
+        try:
+            candidate_id = int(data.get('candidate_id'))
+        except (TypeError, ValueError):
+            return jsonify({'error': 'Missing or invalid candidate_id'}), 400
         
-        if not candidate_id or not message:
+        if not message:
             return jsonify({'error': 'Missing candidate_id or message'}), 400
         
-        candidate = db_manager.get_candidate(candidate_id)
-        if not candidate:
+        session = chat_sessions.get_session(candidate_id, data.get('session_id'))
+        if not session:
             return jsonify({'error': 'Candidate not found'}), 404
         
-        response = ai_service.chat_about_candidate(candidate, message)
-        return jsonify({'response': response})
+        response = ai_service.chat_about_candidate(chat_sessions.conversation(session), message)
+        chat_sessions.record_turn(session, message, response)
+        return jsonify({'response': response, 'session_id': session['id']})
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/chat/stream', methods=['POST'])
+def candidate_chat_stream():
+    """Streaming candidate chat over Server-Sent Events"""
+    try:
+        data = request.get_json()
+        message = data.get('message')
+        try:
+            candidate_id = int(data.get('candidate_id'))
+        except (TypeError, ValueError):
+            return jsonify({'error': 'Missing or invalid candidate_id'}), 400
+        
+        if not message:
+            return jsonify({'error': 'Missing candidate_id or message'}), 400
+        
+        session = chat_sessions.get_session(candidate_id, data.get('session_id'))
+        if not session:
+            return jsonify({'error': 'Candidate not found'}), 404
+        
+        def on_complete(response_text):
+            chat_sessions.record_turn(session, message, response_text)
+            return {'session_id': session['id']}
+        
+        return sse_response(stream_chat(
+            ai_service.chat_about_candidate_stream(chat_sessions.conversation(session), message),
+            on_complete
+        ))
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/chat/<int:candidate_id>/history', methods=['GET'])
+def get_candidate_chat_history(candidate_id):
+    """Turns of the candidate's latest chat session (or ?session_id=)"""
+    try:
+        session = db_manager.get_chat_session(
+            session_id=request.args.get('session_id', type=int), candidate_id=candidate_id
+        )
+        if not session or session['candidate_id'] != candidate_id:
+            return jsonify({'session_id': None, 'history': []})
+        return jsonify({
+            'session_id': session['id'],
+            'history': db_manager.get_chat_history(candidate_id, session['id'])
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/hr-chat', methods=['POST'])
 def hr_chat():
     """HR assistant chat endpoint"""
@@ -199,11 +560,11 @@ def hr_chat():
         if not message:
             return jsonify({'error': 'Message is required'}), 400
         
-        # Get all candidates for context
-        candidates = db_manager.get_all_candidates()
+        # Only the candidates relevant to the question, within a token budget
+        context = hr_context.retrieve(message)
         
         # Get AI response with candidate context
-        response = ai_service.hr_assistant_chat(candidates, message)
+        response = ai_service.hr_assistant_chat(context, message)
         
         # Save chat history
         db_manager.save_hr_chat_message(message, response)
@@ -217,6 +578,47 @@ def hr_chat():
         print(f"Error in HR chat: {e}")
         return jsonify({'error': 'Failed to process chat message'}), 500
 
+@app.route('/api/llm-cache/stats', methods=['GET'])
+def get_llm_cache_stats():
+    try:
+        return jsonify({'llm_cache': ai_service.response_cache.stats()})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/llm-metrics', methods=['GET'])
+def get_llm_metrics():
+    """Per-endpoint LLM call metrics: totals since start and a rolling window"""
+    try:
+        return jsonify({
+            'llm_metrics': ai_service.metrics.summary(),
+            'llm_cache': ai_service.response_cache.stats(),
+            'llm_circuit': ai_service.client.breaker.stats()
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/hr-chat/stream', methods=['POST'])
+def hr_chat_stream():
+    """Streaming HR assistant chat over Server-Sent Events"""
+    try:
+        data = request.get_json()
+        message = data.get('message', '')
+        
+        if not message:
+            return jsonify({'error': 'Message is required'}), 400
+        
+        # Only the candidates relevant to the question, within a token budget
+        context = hr_context.retrieve(message)
+        
+        return sse_response(stream_chat(
+            ai_service.hr_assistant_chat_stream(context, message),
+            lambda response_text: db_manager.save_hr_chat_message(message, response_text)
+        ))
+        
+    except Exception as e:
+        print(f"Error in HR chat: {e}")
+        return jsonify({'error': 'Failed to process chat message'}), 500
+
 @app.route('/api/fair-screening/toggle', methods=['POST'])
 def toggle_fair_screening():
     try:
@@ -236,8 +638,8 @@ def toggle_fair_screening():
 @app.route('/api/statistics', methods=['GET'])
 def get_statistics():
     try:
-        stats = db_manager.get_statistics()
-        return jsonify({'statistics': stats})
+        return cached_json('statistics', lambda: {'statistics': db_manager.get_statistics()},
+                           ttl=STATISTICS_CACHE_SECONDS)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -291,7 +693,13 @@ def send_notification():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Import-time profile; `python boot_profile.py` breaks it down per module
+IMPORT_MS = round((time.perf_counter() - BOOT_STARTED) * 1000, 1)
+print(f"✅ App imported in {IMPORT_MS:.0f}ms")
+
 if __name__ == '__main__':
     # Initialize database
     db_manager.init_db()
+    # Re-score candidates whose bias analysis predates the current detector config
+    bias_rescorer.start_background(only_if_stale=True)
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+SmartHire AI - Boot profile
+Imports app.py in a fresh interpreter with `python -X importtime` and reports
+the total import time and the slowest modules, so start-up regressions (a
+heavy import or service set-up moved back to import time) are easy to spot:
+
+    python boot_profile.py --top 20
+    python boot_profile.py --budget-ms 500   # exits 1 when over budget
+"""
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def profile_imports():
+    """Return (wall seconds, [(cumulative us, self us, module)]) for `import app`"""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app'],
+        cwd=BACKEND_DIR, capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        raise SystemExit(f"❌ Importing app failed:\n{result.stderr[-2000:]}")
+
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules.append((int(cumulative_us), int(self_us), name.rstrip()))
+    return elapsed, modules
+
+
+def depth(name):
+    return len(name) - len(name.lstrip())
+
+
+def direct_imports(modules):
+    """Modules imported by app.py itself; -X importtime lists them just before app"""
+    app_index = next((i for i, (_, _, name) in enumerate(modules) if name.strip() == 'app'), None)
+    if app_index is None:
+        return []
+    app_depth = depth(modules[app_index][2])
+    children = []
+    for module in reversed(modules[:app_index]):
+        if depth(module[2]) <= app_depth:
+            break
+        if depth(module[2]) == app_depth + 2:
+            children.append(module)
+    return children
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile how long importing app.py takes")
+    parser.add_argument('--top', type=int, default=15, help="slowest modules to list")
+    parser.add_argument('--budget-ms', type=float, default=None, help="fail when `import app` takes longer")
+    args = parser.parse_args()
+
+    elapsed, modules = profile_imports()
+    app_ms = next((cumulative / 1000 for cumulative, _, name in modules if name.strip() == 'app'), None)
+
+    print(f"Interpreter + import app: {elapsed * 1000:.0f}ms")
+    if app_ms is not None:
+        print(f"import app:               {app_ms:.0f}ms")
+    print("\nSlowest imports of app.py (cumulative ms):")
+    for cumulative, _, name in sorted(direct_imports(modules), reverse=True)[:args.top]:
+        print(f"  {cumulative / 1000:8.1f}  {name.strip()}")
+
+    print("\nSlowest modules by own time (ms):")
+    for _, self_us, name in sorted(modules, key=lambda m: -m[1])[:args.top]:
+        print(f"  {self_us / 1000:8.1f}  {name.strip()}")
+
+    if args.budget_ms is not None and app_ms is not None and app_ms > args.budget_ms:
+        print(f"\n❌ import app took {app_ms:.0f}ms, over the {args.budget_ms:.0f}ms budget")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+SmartHire AI - Load test
+Drives uploads and chat against a running server and reports throughput and
+tail latency. Start the server with LLM_PROVIDER=fake (see .env.example) to
+benchmark the pipeline offline, e.g.:
+
+    LLM_PROVIDER=fake FAKE_LLM_LATENCY_MS=800 FAKE_LLM_429_RATE=0.05 python run.py
+    python load_test.py --uploads 200 --chats 200 --concurrency 16
+"""
+
+import io
+import time
+import random
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from docx import Document
+
+SKILLS = ['Python', 'Java', 'React', 'SQL', 'AWS', 'Docker', 'Kubernetes', 'Flask', 'Go', 'Leadership']
+JOB_DESCRIPTION = """Senior Backend Engineer
+Requirements: 5+ years of Python, SQL, Docker and AWS.
+Nice to have: Kubernetes, React."""
+QUESTIONS = [
+    "What are this candidate's main strengths?",
+    "Is the candidate a good fit for a senior backend role?",
+    "What should we ask in the technical interview?",
+]
+HR_QUESTIONS = [
+    "Who are the best Python candidates?",
+    "Which candidates know Kubernetes and AWS?",
+    "Summarize the top candidates for the backend role",
+]
+
+
+def make_resume(index):
+    """A small synthetic DOCX resume"""
+    rng = random.Random(index)
+    document = Document()
+    document.add_paragraph(f"Candidate {index}")
+    document.add_paragraph(f"candidate{index}@example.com | +1 555 {index:07d}")
+    document.add_paragraph("Experience")
+    for year in range(rng.randint(1, 4)):
+        skills = ', '.join(rng.sample(SKILLS, 3))
+        document.add_paragraph(f"Software Engineer, Company {year} (201{year} - 202{year}): built services with {skills}")
+    document.add_paragraph("Skills")
+    document.add_paragraph(', '.join(rng.sample(SKILLS, 5)))
+    document.add_paragraph("Education")
+    document.add_paragraph("B.Sc. Computer Science")
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+class Recorder:
+    """Thread-safe per-endpoint latency and status recorder"""
+
+    def __init__(self):
+        self.samples = {}
+        self._lock = threading.Lock()
+
+    def add(self, endpoint, status, start, first_byte=None):
+        end = time.perf_counter()
+        with self._lock:
+            self.samples.setdefault(endpoint, []).append((status, start, end, first_byte))
+
+    @staticmethod
+    def _percentile(values, pct):
+        values = sorted(values)
+        return values[min(len(values) - 1, int(round(pct / 100.0 * (len(values) - 1))))]
+
+    def report(self):
+        print(f"\n{'endpoint':<22}{'count':>7}{'req/s':>8}{'p50':>8}{'p95':>8}{'p99':>8}{'max':>8}  statuses")
+        for endpoint, samples in sorted(self.samples.items()):
+            latencies = [end - start for _, start, end, _ in samples]
+            # Throughput over the wall-clock span of this endpoint's requests
+            span = max(end for _, _, end, _ in samples) - min(start for _, start, _, _ in samples)
+            statuses = {}
+            for status, _, _, _ in samples:
+                statuses[status] = statuses.get(status, 0) + 1
+            rate = f"{len(samples) / span:>8.2f}" if span > 0 else f"{'-':>8}"
+            print(f"{endpoint:<22}{len(samples):>7}{rate}"
+                  + ''.join(f"{self._percentile(latencies, pct):>8.2f}" for pct in (50, 95, 99))
+                  + f"{max(latencies):>8.2f}  {statuses}")
+            first_bytes = [fb for _, _, _, fb in samples if fb is not None]
+            if first_bytes:
+                print(f"{'  first chunk':<22}{len(first_bytes):>7}{'':>8}"
+                      + ''.join(f"{self._percentile(first_bytes, pct):>8.2f}" for pct in (50, 95, 99))
+                      + f"{max(first_bytes):>8.2f}")
+
+
+def timed(recorder, endpoint, call):
+    start = time.perf_counter()
+    try:
+        response = call()
+        status = response.status_code
+    except requests.RequestException as e:
+        print(f"❌ {endpoint}: {e}")
+        status, response = 'error', None
+    recorder.add(endpoint, status, start)
+    return response
+
+
+def timed_stream(recorder, endpoint, url, payload):
+    start = time.perf_counter()
+    first_byte = None
+    try:
+        with requests.post(url, json=payload, stream=True, timeout=300) as response:
+            for chunk in response.iter_content(chunk_size=None):
+                if chunk and first_byte is None:
+                    first_byte = time.perf_counter() - start
+            status = response.status_code
+    except requests.RequestException as e:
+        print(f"❌ {endpoint}: {e}")
+        status = 'error'
+    recorder.add(endpoint, status, start, first_byte)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the SmartHire AI API")
+    parser.add_argument('--url', default='http://localhost:5000', help="server base URL")
+    parser.add_argument('--uploads', type=int, default=50, help="resumes to upload")
+    parser.add_argument('--chats', type=int, default=50, help="candidate chat messages")
+    parser.add_argument('--hr-chats', type=int, default=20, help="HR assistant messages")
+    parser.add_argument('--concurrency', type=int, default=8, help="concurrent clients")
+    parser.add_argument('--stream', action='store_true', help="use the streaming chat endpoints")
+    parser.add_argument('--screening-mode', default=None, help="full or two_stage")
+    args = parser.parse_args()
+
+    api = args.url.rstrip('/') + '/api'
+    recorder = Recorder()
+    candidate_ids = []
+    ids_lock = threading.Lock()
+
+    def upload(index):
+        data = {'job_description': JOB_DESCRIPTION}
+        if args.screening_mode:
+            data['screening_mode'] = args.screening_mode
+        files = {'file': (f'candidate_{index}.docx', make_resume(index))}
+        response = timed(recorder, 'upload', lambda: requests.post(f'{api}/upload', data=data, files=files, timeout=300))
+        if response is not None and response.ok:
+            candidate_id = response.json().get('candidate_id')
+            if candidate_id:
+                with ids_lock:
+                    candidate_ids.append(candidate_id)
+
+    def chat(index):
+        payload = {'candidate_id': candidate_ids[index % len(candidate_ids)], 'message': QUESTIONS[index % len(QUESTIONS)]}
+        if args.stream:
+            timed_stream(recorder, 'chat/stream', f'{api}/chat/stream', payload)
+        else:
+            timed(recorder, 'chat', lambda: requests.post(f'{api}/chat', json=payload, timeout=300))
+
+    def hr_chat(index):
+        payload = {'message': HR_QUESTIONS[index % len(HR_QUESTIONS)]}
+        if args.stream:
+            timed_stream(recorder, 'hr-chat/stream', f'{api}/hr-chat/stream', payload)
+        else:
+            timed(recorder, 'hr-chat', lambda: requests.post(f'{api}/hr-chat', json=payload, timeout=300))
+
+    print(f"🚀 Load testing {api} with {args.concurrency} clients")
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(upload, range(args.uploads)))
+        if not candidate_ids and args.uploads:
+            print("⚠️  No uploads succeeded, skipping candidate chat")
+        elif candidate_ids:
+            list(pool.map(chat, range(args.chats)))
+        list(pool.map(hr_chat, range(args.hr_chats)))
+    recorder.report()
+
+
+if __name__ == '__main__':
+    main()
@@ -14,7 +14,7 @@ load_dotenv()
 # Add the current directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from app import app, db_manager
+from app import app, db_manager, bias_rescorer, upload_jobs
 
 def initialize_app():
     """Initialize the application and database"""
@@ -28,6 +28,13 @@ def initialize_app():
         print(f"❌ Database initialization failed: {e}")
         return False
     
+    # Incrementally re-score bias analyses made with an older detector config;
+    # the stale check runs in the background so the detector is not built at boot
+    bias_rescorer.start_background(only_if_stale=True)
+    
+    # Resume processing of queued uploads (including ones left over from a restart)
+    upload_jobs.start()
+    
     # Create uploads directory if it doesn't exist
     uploads_dir = os.path.join(os.path.dirname(__file__), 'uploads')
     if not os.path.exists(uploads_dir):
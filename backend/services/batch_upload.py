@@ -0,0 +1,145 @@
+import os
+import time
+import uuid
+import shutil
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from werkzeug.utils import secure_filename
+
+from services.gemini_client import RateLimitError
+
+RESUME_EXTENSIONS = {'pdf', 'docx'}
+
+
+class BatchUploader:
+    """Run many resumes, uploaded as files and/or ZIP archives, through the upload pipeline.
+
+    ZIP members are read straight from the uploaded archive one at a time,
+    and each resume is copied into the uploads folder only when its turn
+    comes, like a single upload would be. Resumes are processed by `workers`
+    threads, with at most two per worker in flight, and `run` yields a result
+    as soon as each one finishes. A resume handed to a worker is announced
+    with a 'started' event and finishes even if the client disconnects, so a
+    paused batch is resumed by skipping the resumes already started.
+    """
+
+    def __init__(self, pipeline, upload_folder, workers=None, max_files=None, max_file_size=16 * 1024 * 1024):
+        self.pipeline = pipeline
+        self.upload_folder = upload_folder
+        self.workers = workers or int(os.getenv('BATCH_UPLOAD_WORKERS', '4'))
+        self.max_files = max_files or int(os.getenv('BATCH_UPLOAD_MAX_FILES', '500'))
+        self.max_file_size = max_file_size
+
+    @staticmethod
+    def _extension(name):
+        return name.rsplit('.', 1)[1].lower() if '.' in name else ''
+
+    def plan(self, uploads, skip=None):
+        """Return (items, skipped) for the uploaded files; raises ValueError for a bad archive.
+
+        Each item is (source index, filename, opener) where opener() returns
+        a readable file object. `skip` gives, per uploaded file, how many of
+        its resumes to leave out from the start (those already started).
+        """
+        items, skipped = [], []
+        skip = skip or []
+        for source, upload in enumerate(uploads):
+            name = upload.filename or ''
+            extension = self._extension(name)
+            to_skip = skip[source] if source < len(skip) else 0
+            if extension in RESUME_EXTENSIONS:
+                if to_skip < 1:
+                    items.append((source, name, lambda upload=upload: upload.stream))
+            elif extension == 'zip':
+                try:
+                    archive = zipfile.ZipFile(upload.stream)
+                except zipfile.BadZipFile:
+                    raise ValueError(f'{name} is not a valid ZIP archive')
+                for info in archive.infolist():
+                    member = os.path.basename(info.filename)
+                    if info.is_dir() or not member or info.filename.startswith('__MACOSX/'):
+                        continue
+                    if self._extension(member) not in RESUME_EXTENSIONS:
+                        skipped.append({'filename': info.filename, 'reason': 'unsupported file type'})
+                    elif info.file_size > self.max_file_size:
+                        skipped.append({'filename': info.filename, 'reason': 'file too large'})
+                    elif to_skip > 0:
+                        to_skip -= 1
+                    else:
+                        items.append((source, member, lambda archive=archive, info=info: archive.open(info)))
+            else:
+                skipped.append({'filename': name, 'reason': 'unsupported file type'})
+
+        for source, name, _ in items[self.max_files:]:
+            skipped.append({'filename': name, 'reason': f'batch limit of {self.max_files} files reached'})
+        return items[:self.max_files], skipped
+
+    def _save(self, name, opener):
+        filename = secure_filename(name) or 'resume'
+        file_path = os.path.join(self.upload_folder, f"{uuid.uuid4()}_{filename}")
+        with opener() as source, open(file_path, 'wb') as target:
+            shutil.copyfileobj(source, target)
+        return filename, file_path
+
+    def _process(self, index, source, filename, file_path, options):
+        try:
+            result = self.pipeline.process(file_path, filename, **options)
+            return dict(result, type='result', index=index, source=source, filename=filename, success=True)
+        except RateLimitError as e:
+            return {'type': 'result', 'index': index, 'source': source, 'filename': filename,
+                    'success': False, 'error': 'AI quota exceeded', 'retry_after': e.retry_after}
+        except Exception as e:
+            return {'type': 'result', 'index': index, 'source': source, 'filename': filename,
+                    'success': False, 'error': str(e)}
+
+    def run(self, items, skipped, **options):
+        """Yield a 'batch' header, 'started' and 'result' events per resume, then a 'summary'"""
+        started = time.time()
+        sources = [0] * (max((source for source, _, _ in items), default=-1) + 1)
+        for source, _, _ in items:
+            sources[source] += 1
+        # `sources` holds the number of resumes taken from each uploaded file
+        yield {'type': 'batch', 'total': len(items), 'sources': sources, 'skipped': skipped}
+
+        succeeded = failed = 0
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='batch-upload')
+        pending = set()
+
+        def finished(futures):
+            nonlocal succeeded, failed
+            for future in futures:
+                result = future.result()
+                if result['success']:
+                    succeeded += 1
+                else:
+                    failed += 1
+                yield result
+
+        try:
+            for index, (source, name, opener) in enumerate(items):
+                # Copy the next resume only when a worker is about to need it
+                while len(pending) >= self.workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    yield from finished(done)
+                try:
+                    filename, file_path = self._save(name, opener)
+                except Exception as e:
+                    failed += 1
+                    yield {'type': 'started', 'index': index, 'source': source, 'filename': name}
+                    yield {'type': 'result', 'index': index, 'source': source, 'filename': name,
+                           'success': False, 'error': f'Could not read file: {e}'}
+                    continue
+                pending.add(pool.submit(self._process, index, source, filename, file_path, options))
+                yield {'type': 'started', 'index': index, 'source': source, 'filename': filename}
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from finished(done)
+
+            yield {'type': 'summary', 'succeeded': succeeded, 'failed': failed,
+                   'skipped': len(skipped), 'elapsed_seconds': round(time.time() - started, 2)}
+        finally:
+            # Also reached when the client disconnects: resumes already started
+            # still finish and are saved, later ones are never read
+            pool.shutdown(wait=False)
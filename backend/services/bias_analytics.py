@@ -0,0 +1,198 @@
+import json
+import threading
+
+import numpy as np
+
+from services.job_profile import jd_hash
+
+CATEGORIES = ['gender', 'age', 'location', 'education']
+RISK_LEVELS = ['low', 'medium', 'high']
+
+# Indicators whose value is candidate specific are counted by kind only
+VALUE_SPECIFIC_INDICATORS = ('Address found', 'Graduation year suggests age')
+
+
+class BiasAnalytics:
+    """Corpus-level bias statistics over the stored bias_analysis rows.
+
+    Rows are kept in NumPy arrays, so every summary is a handful of
+    vectorized reductions. Each bias_analysis write stamps its row with the
+    data version (bias_rev); after a write only the rows stamped since the
+    last load are parsed and appended or patched in, instead of all of them.
+    Candidates are never deleted, so rows only ever appear or change.
+    """
+
+    HISTOGRAM_BINS = np.linspace(0, 100, 11)
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+        self._lock = threading.Lock()
+        self._version = None
+        self._rev = -1
+        self._arrays = None
+        self._jd_index = {}
+        self._indicator_index = {}
+        self._indicator_meta = []
+        self._summaries = {}
+
+    def _parse(self, job_description, bias_json):
+        """(jd code, overall, risk, category scores, indicator ids) of one row"""
+        bias = json.loads(bias_json) if bias_json else {}
+        jd_code = self._jd_index.setdefault(jd_hash(job_description), len(self._jd_index))
+        overall = bias.get('overall_bias_score', 0) or 0
+        risk_level = bias.get('risk_level', 'low')
+        risk = RISK_LEVELS.index(risk_level) if risk_level in RISK_LEVELS else 0
+
+        scores = []
+        indicator_ids = []
+        for category in CATEGORIES:
+            details = bias.get('bias_categories', {}).get(category, {})
+            scores.append(details.get('score', 0) or 0)
+            for indicator in details.get('indicators', []):
+                kind, _, _ = indicator.partition(': ')
+                key = (category, kind if kind in VALUE_SPECIFIC_INDICATORS else indicator)
+                if key not in self._indicator_index:
+                    self._indicator_index[key] = len(self._indicator_meta)
+                    self._indicator_meta.append(key)
+                indicator_id = self._indicator_index[key]
+                if indicator_id not in indicator_ids:
+                    indicator_ids.append(indicator_id)
+        return jd_code, overall, risk, scores, indicator_ids
+
+    @staticmethod
+    def _empty_arrays():
+        return {
+            'ids': np.zeros(0, dtype=np.int64),
+            'scores': np.zeros((0, len(CATEGORIES)), dtype=np.float32),
+            'overall': np.zeros(0, dtype=np.float32),
+            'risk': np.zeros(0, dtype=np.int8),
+            'jd_codes': np.zeros(0, dtype=np.int32),
+            'hit_rows': np.zeros(0, dtype=np.int32),
+            'hit_ids': np.zeros(0, dtype=np.int32)
+        }
+
+    def _merge(self, arrays, rows):
+        """New arrays with `rows` (id, job_description, bias_analysis, rev) patched in or appended"""
+        ids = arrays['ids']
+        positions = np.searchsorted(ids, [row[0] for row in rows])
+        existing = [pos < ids.size and ids[pos] == row[0] for pos, row in zip(positions, rows)]
+        n_new = len(rows) - sum(existing)
+
+        merged = {
+            'ids': np.concatenate([ids, np.zeros(n_new, dtype=np.int64)]),
+            'scores': np.concatenate([arrays['scores'], np.zeros((n_new, len(CATEGORIES)), dtype=np.float32)]),
+            'overall': np.concatenate([arrays['overall'], np.zeros(n_new, dtype=np.float32)]),
+            'risk': np.concatenate([arrays['risk'], np.zeros(n_new, dtype=np.int8)]),
+            'jd_codes': np.concatenate([arrays['jd_codes'], np.zeros(n_new, dtype=np.int32)])
+        }
+        patched = []
+        hit_rows = []
+        hit_ids = []
+        next_row = ids.size
+        for pos, known, (candidate_id, job_description, bias_json, _) in zip(positions, existing, rows):
+            if known:
+                i = int(pos)
+                patched.append(i)
+            else:
+                # New ids are larger than every loaded one, so appending keeps `ids` sorted
+                i = next_row
+                next_row += 1
+                merged['ids'][i] = candidate_id
+            jd_code, overall, risk, scores, indicator_ids = self._parse(job_description, bias_json)
+            merged['jd_codes'][i] = jd_code
+            merged['overall'][i] = overall
+            merged['risk'][i] = risk
+            merged['scores'][i] = scores
+            hit_rows.extend([i] * len(indicator_ids))
+            hit_ids.extend(indicator_ids)
+
+        # Indicator hits of patched rows are replaced by their new ones
+        keep = ~np.isin(arrays['hit_rows'], patched) if patched else slice(None)
+        merged['hit_rows'] = np.concatenate([arrays['hit_rows'][keep], np.array(hit_rows, dtype=np.int32)])
+        merged['hit_ids'] = np.concatenate([arrays['hit_ids'][keep], np.array(hit_ids, dtype=np.int32)])
+        return merged
+
+    def _load(self):
+        """Return the column arrays, merging in rows written since the last load"""
+        version = self.db_manager.get_data_version()
+        with self._lock:
+            if self._arrays is not None and self._version == version:
+                return self._arrays
+
+            rows = self.db_manager.get_bias_analytics_rows(self._rev)
+            if rows or self._arrays is None:
+                arrays = self._merge(self._arrays if self._arrays is not None else self._empty_arrays(), rows)
+                arrays['jd_index'] = self._jd_index
+                arrays['indicators'] = self._indicator_meta
+                self._arrays = arrays
+                self._summaries = {}
+                if rows:
+                    self._rev = max(self._rev, max(row[3] for row in rows))
+            self._version = version
+            return self._arrays
+
+    def _distribution(self, values):
+        if values.size == 0:
+            return {'mean': 0, 'median': 0, 'p90': 0, 'max': 0,
+                    'histogram': {'bins': self.HISTOGRAM_BINS.tolist(), 'counts': [0] * 10}}
+        counts, _ = np.histogram(values, bins=self.HISTOGRAM_BINS)
+        p50, p90 = np.percentile(values, [50, 90])
+        return {
+            'mean': round(float(values.mean()), 2),
+            'median': round(float(p50), 2),
+            'p90': round(float(p90), 2),
+            'max': round(float(values.max()), 2),
+            'histogram': {'bins': self.HISTOGRAM_BINS.tolist(), 'counts': counts.tolist()}
+        }
+
+    def summary(self, job_description=None, top_indicators=25):
+        """Score distributions, indicator frequencies and risk breakdown for a cohort"""
+        arrays = self._load()
+        cache_key = (job_description, top_indicators)
+        with self._lock:
+            cached = self._summaries.get(cache_key) if self._arrays is arrays else None
+        if cached is not None:
+            return cached
+
+        n_total = arrays['overall'].shape[0]
+        if job_description is None:
+            mask = np.ones(n_total, dtype=bool)
+        else:
+            code = arrays['jd_index'].get(jd_hash(job_description), -1)
+            mask = arrays['jd_codes'] == code
+        n = int(mask.sum())
+
+        risk_counts = np.bincount(arrays['risk'][mask], minlength=len(RISK_LEVELS))
+        scores = arrays['scores'][mask]
+
+        hit_mask = mask[arrays['hit_rows']] if arrays['hit_rows'].size else np.zeros(0, dtype=bool)
+        fired = np.bincount(arrays['hit_ids'][hit_mask], minlength=len(arrays['indicators']))
+        order = np.argsort(-fired, kind='stable')[:top_indicators]
+
+        summary = {
+            'total_candidates': n,
+            'job_description_filtered': job_description is not None,
+            'overall': self._distribution(arrays['overall'][mask]),
+            'categories': {
+                category: dict(
+                    self._distribution(scores[:, j]),
+                    flagged=int((scores[:, j] > 30).sum())
+                )
+                for j, category in enumerate(CATEGORIES)
+            },
+            'risk_levels': {level: int(risk_counts[k]) for k, level in enumerate(RISK_LEVELS)},
+            'indicators': [
+                {
+                    'category': arrays['indicators'][k][0],
+                    'indicator': arrays['indicators'][k][1],
+                    'count': int(fired[k]),
+                    'rate': round(float(fired[k]) / n, 4) if n else 0
+                }
+                for k in order if fired[k] > 0
+            ]
+        }
+        with self._lock:
+            # Not cached when the arrays were replaced while it was computed
+            if self._arrays is arrays:
+                self._summaries[cache_key] = summary
+        return summary
@@ -1,19 +1,26 @@
 import re
 import json
+import hashlib
 from datetime import datetime
 
+from services.indicator_scanner import IndicatorScanner
+from services.name_lexicon import NameLexicon
+from services.redaction import RedactionEngine
+
 class BiasDetector:
+    # Bump when the scoring logic changes without a change to the indicator lists
+    ALGORITHM_VERSION = 2
+    
     def __init__(self):
         # Define bias indicators
         self.gender_indicators = {
             'male': ['he/him', 'his', 'mr.', 'mister', 'sir', 'gentleman', 'boy', 'man', 'male'],
-            'female': ['she/her', 'hers', 'ms.', 'mrs.', 'miss', 'madam', 'lady', 'girl', 'woman', 'female'],
-            'gendered_names': {
-                'male': ['john', 'michael', 'david', 'james', 'robert', 'william', 'richard', 'charles', 'joseph', 'thomas'],
-                'female': ['mary', 'patricia', 'jennifer', 'linda', 'elizabeth', 'barbara', 'susan', 'jessica', 'sarah', 'karen']
-            }
+            'female': ['she/her', 'hers', 'ms.', 'mrs.', 'miss', 'madam', 'lady', 'girl', 'woman', 'female']
         }
         
+        # Given names come from the shared, memory-mapped lexicon (data/names.tsv)
+        self.name_lexicon = NameLexicon.load()
+        
         self.age_indicators = [
             'years old', 'age', 'born in', 'birth year', 'birthday',
             'graduated in 19', 'class of 19', 'since 19'
@@ -36,16 +43,64 @@ class BiasDetector:
             'address': r'\d+\s+[A-Za-z\s]+(?:Street|St|Avenue|Ave|Road|Rd|Drive|Dr|Lane|Ln|Boulevard|Blvd|Court|Ct|Place|Pl)',
             'name_line': r'^[A-Z][a-z]+\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*$'
         }
+        
+        # Precompiled matchers, built once per detector instead of once per resume
+        self.scanner = self._build_scanner()
+        self._address_pattern = re.compile(self.personal_identifiers['address'])
+        self._graduation_pattern = re.compile(r'graduated?\s+(?:in\s+)?(\d{4})', re.IGNORECASE)
+        self.redactor = RedactionEngine(self.personal_identifiers, name_lexicon=self.name_lexicon)
+        
+        # Stored bias results are keyed by (text hash, config_version)
+        self.config_version = self._compute_config_version()
+    
+    def _compute_config_version(self):
+        """Fingerprint of everything that affects analyze_bias output"""
+        config = json.dumps({
+            'algorithm': self.ALGORITHM_VERSION,
+            'gender': self.gender_indicators,
+            'age': self.age_indicators,
+            'location': self.location_indicators,
+            'education': self.education_bias_indicators,
+            'identifiers': self.personal_identifiers
+        }, sort_keys=True).encode('utf-8')
+        
+        digest = hashlib.sha256(config)
+        digest.update(self.name_lexicon.digest())
+        return digest.hexdigest()[:16]
+    
+    @staticmethod
+    def text_hash(resume_text):
+        """Stable cache key for a resume text"""
+        return hashlib.sha256(resume_text.encode('utf-8')).hexdigest()
+    
+    def _build_scanner(self):
+        """Compile every literal indicator list into one single-pass scanner"""
+        return IndicatorScanner({
+            'gender_pronoun': [
+                pronoun
+                for pronouns in self.gender_indicators.values()
+                for pronoun in pronouns
+            ],
+            'age': self.age_indicators,
+            'location': self.location_indicators,
+            'education': self.education_bias_indicators
+        }, lexicons={'gendered_name': self.name_lexicon})
+    
+    def scan_indicators(self, resume_text):
+        """Scan the resume once and return every indicator hit with offsets"""
+        return self.scanner.scan(resume_text)
     
     def analyze_bias(self, resume_text):
         """Analyze resume for potential bias indicators"""
+        hits = self.scan_indicators(resume_text)
+        
         bias_analysis = {
             'overall_bias_score': 0,
             'bias_categories': {
-                'gender': self._analyze_gender_bias(resume_text),
-                'age': self._analyze_age_bias(resume_text),
-                'location': self._analyze_location_bias(resume_text),
-                'education': self._analyze_education_bias(resume_text)
+                'gender': self._analyze_gender_bias(resume_text, hits),
+                'age': self._analyze_age_bias(resume_text, hits),
+                'location': self._analyze_location_bias(resume_text, hits),
+                'education': self._analyze_education_bias(resume_text, hits)
             },
             'bias_indicators_found': [],
             'risk_level': 'low',
@@ -70,145 +125,121 @@ class BiasDetector:
         
         return bias_analysis
     
-    def _analyze_gender_bias(self, text):
+    def _distinct_hits(self, hits):
+        """Group scanner hits by indicator, keeping first-occurrence order"""
+        grouped = {}
+        for hit in hits:
+            grouped.setdefault(hit['indicator'], []).append([hit['start'], hit['end']])
+        return grouped
+    
+    def _analyze_gender_bias(self, text, hits):
         """Analyze for gender bias indicators"""
-        text_lower = text.lower()
         indicators = []
+        matches = []
         score = 0
         
         # Check for pronouns
-        for gender, pronouns in self.gender_indicators.items():
-            if gender != 'gendered_names':
-                for pronoun in pronouns:
-                    if pronoun in text_lower:
-                        indicators.append(f"Gender pronoun: {pronoun}")
-                        score += 20
-        
-        # Check for gendered names
-        for gender, names in self.gender_indicators['gendered_names'].items():
-            for name in names:
-                if name in text_lower:
-                    indicators.append(f"Gendered name: {name}")
-                    score += 30
+        for pronoun, offsets in self._distinct_hits(hits['gender_pronoun']).items():
+            indicators.append(f"Gender pronoun: {pronoun}")
+            matches.append({'indicator': pronoun, 'offsets': offsets})
+            score += 20
+        
+        # Check for gendered names (unisex names carry no gender signal)
+        gendered_names = [hit for hit in hits['gendered_name'] if hit['tag'] in ('m', 'f')]
+        for name, offsets in self._distinct_hits(gendered_names).items():
+            indicators.append(f"Gendered name: {name}")
+            matches.append({'indicator': name, 'offsets': offsets})
+            score += 30
         
         return {
             'score': min(score, 100),
             'indicators': indicators,
+            'matches': matches,
             'description': 'Gender-related information that could lead to bias'
         }
     
-    def _analyze_age_bias(self, text):
+    def _analyze_age_bias(self, text, hits):
         """Analyze for age bias indicators"""
-        text_lower = text.lower()
         indicators = []
+        matches = []
         score = 0
         
-        for indicator in self.age_indicators:
-            if indicator in text_lower:
-                indicators.append(f"Age indicator: {indicator}")
-                score += 25
+        for indicator, offsets in self._distinct_hits(hits['age']).items():
+            indicators.append(f"Age indicator: {indicator}")
+            matches.append({'indicator': indicator, 'offsets': offsets})
+            score += 25
         
         # Check for graduation years that might indicate age
-        graduation_years = re.findall(r'graduated?\s+(?:in\s+)?(\d{4})', text_lower)
         current_year = datetime.now().year
         
-        for year in graduation_years:
-            year_int = int(year)
+        for match in self._graduation_pattern.finditer(text):
+            year_int = int(match.group(1))
             if 1950 <= year_int <= current_year:
                 age_estimate = current_year - year_int + 22  # Assume graduation at 22
                 if age_estimate > 50 or age_estimate < 25:
-                    indicators.append(f"Graduation year suggests age: {year}")
+                    indicators.append(f"Graduation year suggests age: {match.group(1)}")
+                    matches.append({'indicator': match.group(1), 'offsets': [[match.start(1), match.end(1)]]})
                     score += 30
         
         return {
             'score': min(score, 100),
             'indicators': indicators,
+            'matches': matches,
             'description': 'Age-related information that could lead to bias'
         }
     
-    def _analyze_location_bias(self, text):
+    def _analyze_location_bias(self, text, hits):
         """Analyze for location bias indicators"""
-        text_lower = text.lower()
         indicators = []
+        matches = []
         score = 0
         
-        for indicator in self.location_indicators:
-            if indicator in text_lower:
-                indicators.append(f"Location indicator: {indicator}")
-                score += 15
+        for indicator, offsets in self._distinct_hits(hits['location']).items():
+            indicators.append(f"Location indicator: {indicator}")
+            matches.append({'indicator': indicator, 'offsets': offsets})
+            score += 15
         
         # Check for specific addresses
-        addresses = re.findall(self.personal_identifiers['address'], text)
-        for address in addresses:
+        for match in self._address_pattern.finditer(text):
+            address = match.group(0)
             indicators.append(f"Address found: {address[:20]}...")
+            matches.append({'indicator': 'address', 'offsets': [[match.start(), match.end()]]})
             score += 25
         
         return {
             'score': min(score, 100),
             'indicators': indicators,
+            'matches': matches,
             'description': 'Location-related information that could lead to bias'
         }
     
-    def _analyze_education_bias(self, text):
+    def _analyze_education_bias(self, text, hits):
         """Analyze for education bias indicators"""
-        text_lower = text.lower()
         indicators = []
+        matches = []
         score = 0
         
-        for indicator in self.education_bias_indicators:
-            if indicator in text_lower:
-                indicators.append(f"Prestigious education indicator: {indicator}")
-                score += 20
+        for indicator, offsets in self._distinct_hits(hits['education']).items():
+            indicators.append(f"Prestigious education indicator: {indicator}")
+            matches.append({'indicator': indicator, 'offsets': offsets})
+            score += 20
         
         return {
             'score': min(score, 100),
             'indicators': indicators,
+            'matches': matches,
             'description': 'Education-related information that could create unfair advantage'
         }
     
     def create_blind_resume(self, resume_text):
         """Create a blind version of the resume with personal identifiers removed"""
-        blind_text = resume_text
-        
-        # Remove emails
-        blind_text = re.sub(self.personal_identifiers['email'], '[EMAIL REMOVED]', blind_text)
-        
-        # Remove phone numbers
-        blind_text = re.sub(self.personal_identifiers['phone'], '[PHONE REMOVED]', blind_text)
-        
-        # Remove addresses
-        blind_text = re.sub(self.personal_identifiers['address'], '[ADDRESS REMOVED]', blind_text)
-        
-        # Remove potential names from the first few lines
-        lines = blind_text.split('\n')
-        for i, line in enumerate(lines[:5]):
-            line_stripped = line.strip()
-            # Check if line looks like a name (2-4 words, no numbers, no special chars)
-            if (len(line_stripped.split()) <= 4 and 
-                len(line_stripped) > 2 and 
-                not any(char.isdigit() for char in line_stripped) and
-                not any(char in line_stripped for char in ['@', 'http', '.com', '.org']) and
-                re.match(r'^[A-Za-z\s]+$', line_stripped)):
-                lines[i] = '[CANDIDATE NAME]'
-                break
-        
-        blind_text = '\n'.join(lines)
-        
-        # Remove gendered pronouns
-        gender_replacements = {
-            r'\bhe\b': '[CANDIDATE]',
-            r'\bhis\b': '[CANDIDATE\'S]',
-            r'\bhim\b': '[CANDIDATE]',
-            r'\bshe\b': '[CANDIDATE]',
-            r'\bher\b': '[CANDIDATE\'S]',
-            r'\bhers\b': '[CANDIDATE\'S]'
-        }
-        
-        for pattern, replacement in gender_replacements.items():
-            blind_text = re.sub(pattern, replacement, blind_text, flags=re.IGNORECASE)
-        
+        blind_text, _ = self.redact_resume(resume_text)
         return blind_text
     
+    def redact_resume(self, resume_text):
+        """Blind the resume in one pass, returning (blind_text, span_map)"""
+        return self.redactor.redact(resume_text)
+    
     def get_recommendations(self, bias_analysis):
         """Get recommendations based on bias analysis"""
         recommendations = []
@@ -0,0 +1,138 @@
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from services.bias_detection import BiasDetector
+
+# Per-process detector for the re-scoring pool
+_worker_detector = None
+
+
+def _init_worker():
+    global _worker_detector
+    _worker_detector = BiasDetector()
+
+
+def _score_batch(items):
+    """Run analyze_bias for a list of (text_hash, resume_text) in a worker process"""
+    return [(text_hash, _worker_detector.analyze_bias(text)) for text_hash, text in items]
+
+
+class BiasRescorer:
+    """Memoized bias analysis plus incremental re-scoring of stale candidates.
+
+    Results are cached by (resume text hash, detector config version). When the
+    indicator lists change, the version changes and only candidates scored with
+    an older version are recomputed, in batches, across a process pool. The
+    pool spawns fresh interpreters: forking the server process would copy its
+    threads' locks and open SQLite connections into the workers.
+    """
+
+    def __init__(self, detector, db_manager, batch_size=200, processes=None):
+        self.detector = detector
+        self.db_manager = db_manager
+        self.batch_size = batch_size
+        self.processes = processes or max(1, min(4, multiprocessing.cpu_count() - 1))
+        self._lock = threading.Lock()
+        self._thread = None
+        self.status = {'running': False, 'rescored': 0, 'cache_hits': 0, 'last_error': None}
+
+    @property
+    def version(self):
+        return self.detector.config_version
+
+    def analyze(self, resume_text):
+        """Return (bias_analysis, text_hash), computing it only on a cache miss"""
+        text_hash = self.detector.text_hash(resume_text)
+        cached = self.db_manager.get_cached_bias(text_hash, self.version)
+        if cached is not None:
+            return cached, text_hash
+
+        bias_analysis = self.detector.analyze_bias(resume_text)
+        self.db_manager.save_cached_bias([(text_hash, bias_analysis)], self.version)
+        return bias_analysis, text_hash
+
+    def stale_count(self):
+        return self.db_manager.count_stale_bias_rows(self.version)
+
+    def run(self):
+        """Re-score every candidate whose stored bias analysis has a stale version"""
+        version = self.version
+        after_id = 0
+        rescored = 0
+        cache_hits = 0
+
+        with ProcessPoolExecutor(max_workers=self.processes, initializer=_init_worker,
+                                 mp_context=multiprocessing.get_context('spawn')) as pool:
+            while True:
+                rows = self.db_manager.get_stale_bias_rows(version, after_id, self.batch_size)
+                if not rows:
+                    break
+                after_id = rows[-1][0]
+
+                # Identical texts are scored once, known texts not at all
+                hashes = {}
+                for candidate_id, resume_text, resume_hash in rows:
+                    hashes[candidate_id] = resume_hash or self.detector.text_hash(resume_text)
+
+                results = {}
+                pending = {}
+                for candidate_id, resume_text, _ in rows:
+                    text_hash = hashes[candidate_id]
+                    if text_hash in results or text_hash in pending:
+                        continue
+                    cached = self.db_manager.get_cached_bias(text_hash, version)
+                    if cached is not None:
+                        results[text_hash] = cached
+                        cache_hits += 1
+                    else:
+                        pending[text_hash] = resume_text
+
+                items = list(pending.items())
+                chunk = max(1, len(items) // self.processes)
+                chunks = [items[i:i + chunk] for i in range(0, len(items), chunk)]
+                computed = [entry for batch in pool.map(_score_batch, chunks) for entry in batch]
+                if computed:
+                    self.db_manager.save_cached_bias(computed, version)
+                results.update(computed)
+
+                self.db_manager.update_bias_analyses([
+                    (candidate_id, hashes[candidate_id], results[hashes[candidate_id]])
+                    for candidate_id, _, _ in rows
+                ], version)
+
+                rescored += len(rows)
+                self.status.update({'rescored': rescored, 'cache_hits': cache_hits})
+
+        return {'rescored': rescored, 'cache_hits': cache_hits, 'version': version}
+
+    def start_background(self, only_if_stale=False):
+        """Start run() in a daemon thread unless one is already running.
+
+        With `only_if_stale` the thread first counts stale candidates and stops
+        when there are none, so callers at boot do not build the detector.
+        """
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return False
+            self.status = {'running': True, 'rescored': 0, 'cache_hits': 0, 'last_error': None}
+            self._thread = threading.Thread(target=self._run_background, args=(only_if_stale,), daemon=True)
+            self._thread.start()
+            return True
+
+    def _run_background(self, only_if_stale=False):
+        try:
+            if only_if_stale:
+                stale = self.stale_count()
+                if not stale:
+                    return
+                print(f"🔁 Re-scoring bias analysis for {stale} candidates in the background")
+            result = self.run()
+            if result['rescored']:
+                print(f"✅ Re-scored bias analysis for {result['rescored']} candidates "
+                      f"(detector version {result['version']})")
+        except Exception as e:
+            print(f"❌ Bias re-scoring failed: {e}")
+            self.status['last_error'] = str(e)
+        finally:
+            self.status['running'] = False
@@ -0,0 +1,125 @@
+import json
+import base64
+from datetime import datetime, timedelta
+
+# Sort keys accepted by the API and the candidates column each one orders by
+SORT_COLUMNS = {
+    'score': 'overall_score',
+    'experience': 'experience_years',
+    'date': 'upload_date',
+    'name': 'candidate_name'
+}
+
+# Upload date ranges of the search page, in days
+DATE_RANGES = {'today': 1, 'week': 7, 'month': 30, 'year': 365}
+
+
+class CandidateQueryService:
+    """Filtered, sorted and paginated candidate search with facet counts.
+
+    Evaluates the filters of the search page in SQL over indexed columns
+    instead of shipping every candidate to the browser. Pages are read with
+    an opaque keyset cursor, so deep pages cost the same as the first one.
+    Facets count each filter value with all the other filters applied.
+    """
+
+    def __init__(self, db_manager, default_limit=20, max_limit=100):
+        self.db_manager = db_manager
+        self.default_limit = default_limit
+        self.max_limit = max_limit
+
+    @staticmethod
+    def _number(args, key):
+        value = args.get(key)
+        if value in (None, ''):
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            raise ValueError(f'{key} must be a number')
+
+    @staticmethod
+    def _values(args, key):
+        # Multi-valued filters repeat their key (?skill=Python&skill=SQL)
+        return [value.strip() for value in args.getlist(key) if value.strip()]
+
+    @staticmethod
+    def _since_by_range(now=None):
+        now = now or datetime.now()
+        return {name: (now - timedelta(days=days)).isoformat() for name, days in DATE_RANGES.items()}
+
+    def parse_filters(self, args):
+        """Filters from request args; raises ValueError for invalid values"""
+        date_range = args.get('date_range') or 'all'
+        if date_range != 'all' and date_range not in DATE_RANGES:
+            raise ValueError(f"date_range must be one of: all, {', '.join(DATE_RANGES)}")
+        return {
+            'q': (args.get('q') or '').strip(),
+            'min_score': self._number(args, 'min_score'),
+            'max_score': self._number(args, 'max_score'),
+            'min_experience': self._number(args, 'min_experience'),
+            'max_experience': self._number(args, 'max_experience'),
+            'category': self._values(args, 'category'),
+            'location': self._values(args, 'location'),
+            'education': self._values(args, 'education'),
+            'skills': self._values(args, 'skill'),
+            'since': self._since_by_range()[date_range] if date_range != 'all' else None
+        }
+
+    @staticmethod
+    def encode_cursor(sort, value, candidate_id):
+        raw = json.dumps([sort, value, candidate_id], separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(sort, cursor):
+        """(sort value, id) of a cursor; raises ValueError if it is invalid or for another sort"""
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            cursor_sort, value, candidate_id = json.loads(raw)
+        except (ValueError, TypeError):
+            raise ValueError('Invalid cursor')
+        if cursor_sort != sort or not isinstance(candidate_id, int):
+            raise ValueError('Cursor does not match this sort order')
+        return value, candidate_id
+
+    def query(self, args):
+        """One page of candidates plus total, next_cursor and facets (unless facets=false)"""
+        filters = self.parse_filters(args)
+
+        sort = args.get('sort') or 'score'
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"sort must be one of: {', '.join(SORT_COLUMNS)}")
+        order = args.get('order') or ('asc' if sort == 'name' else 'desc')
+        if order not in ('asc', 'desc'):
+            raise ValueError('order must be asc or desc')
+        try:
+            limit = int(args.get('limit') or self.default_limit)
+        except ValueError:
+            raise ValueError('limit must be an integer')
+        limit = max(1, min(limit, self.max_limit))
+        after = self.decode_cursor(sort, args['cursor']) if args.get('cursor') else None
+
+        # One extra row tells whether there is a next page
+        rows, total = self.db_manager.query_candidates(
+            filters, SORT_COLUMNS[sort], descending=order == 'desc', limit=limit + 1, after=after
+        )
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = self.encode_cursor(sort, rows[-1][4], rows[-1][0])
+
+        result = {
+            'candidates': [
+                {
+                    'id': row[0], 'filename': row[1], 'upload_date': row[2],
+                    'analysis': json.loads(row[3]) if row[3] else {}
+                }
+                for row in rows
+            ],
+            'total': total,
+            'next_cursor': next_cursor
+        }
+        if str(args.get('facets', 'true')).lower() not in ('0', 'false', 'no'):
+            result['facets'] = self.db_manager.get_candidate_facets(filters, self._since_by_range())
+        return result
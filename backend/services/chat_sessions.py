@@ -0,0 +1,105 @@
+import os
+import json
+import threading
+
+# Analysis fields worth sending with every candidate chat message
+CONTEXT_FIELDS = [
+    'overall_score', 'category', 'summary', 'experience_level', 'experience_years', 'key_skills',
+    'education', 'strengths', 'weaknesses', 'recommendations', 'red_flags', 'jd_match'
+]
+
+
+class ChatSessionManager:
+    """Persisted per-candidate chat sessions with a bounded prompt.
+
+    Each message is sent with the session's cached candidate context, a
+    summary of older turns and every turn not summarized yet, verbatim.
+    Once more than `window_turns + summary_batch` turns are unsummarized, all
+    but the last `window_turns` are folded into the summary in the background,
+    so the prompt stays bounded however long the conversation gets.
+    """
+
+    def __init__(self, db_manager, ai_service, window_turns=None, summary_batch=None, summary_tokens=None):
+        self.db_manager = db_manager
+        self.ai_service = ai_service
+        self.window_turns = window_turns or int(os.getenv('CHAT_WINDOW_TURNS', '6'))
+        self.summary_batch = summary_batch or int(os.getenv('CHAT_SUMMARY_BATCH', '4'))
+        self.summary_tokens = summary_tokens or int(os.getenv('CHAT_SUMMARY_TOKENS', '300'))
+        self._summarizing = set()
+        self._lock = threading.Lock()
+
+    def _build_context(self, candidate_id):
+        summaries = self.db_manager.get_candidate_summaries([candidate_id])
+        if candidate_id not in summaries:
+            return None
+        analysis = summaries[candidate_id]['analysis']
+        context = {'name': analysis.get('contact_info', {}).get('name', 'This candidate')}
+        context.update({field: analysis[field] for field in CONTEXT_FIELDS if analysis.get(field)})
+        return json.dumps(context)
+
+    def get_session(self, candidate_id, session_id=None):
+        """Return the requested (or latest) session for a candidate, creating one if needed"""
+        # Ids from JSON bodies or URLs may be strings, sessions store ints
+        candidate_id = int(candidate_id)
+        session = None
+        if session_id:
+            session = self.db_manager.get_chat_session(session_id=session_id)
+            if session and session['candidate_id'] != candidate_id:
+                session = None
+        else:
+            session = self.db_manager.get_chat_session(candidate_id=candidate_id)
+
+        if session is None:
+            context = self._build_context(candidate_id)
+            if context is None:
+                return None
+            return self.db_manager.create_chat_session(candidate_id, context)
+
+        if not session['context']:
+            # Cleared when the candidate's analysis changed
+            session['context'] = self._build_context(candidate_id)
+            if session['context'] is None:
+                return None
+            self.db_manager.update_chat_session(session['id'], context=session['context'])
+        return session
+
+    def conversation(self, session):
+        """Prompt inputs for the next message: context, summary and unsummarized turns"""
+        turns = self.db_manager.get_session_turns(session['id'], session['summarized_upto'])
+        context = json.loads(session['context'])
+        return {
+            'name': context.get('name', 'This candidate'),
+            'context': session['context'],
+            'summary': session['summary'],
+            # All of them: turns beyond the window are only dropped once summarized
+            'turns': [(message, response) for _, message, response in turns]
+        }
+
+    def record_turn(self, session, message, response):
+        """Persist a turn and fold old turns into the summary when the window overflows"""
+        self.db_manager.save_chat_message(session['candidate_id'], message, response, session['id'])
+
+        with self._lock:
+            if session['id'] in self._summarizing:
+                return
+            self._summarizing.add(session['id'])
+        threading.Thread(target=self._maybe_summarize, args=(session['id'],), daemon=True).start()
+
+    def _maybe_summarize(self, session_id):
+        try:
+            session = self.db_manager.get_chat_session(session_id=session_id)
+            turns = self.db_manager.get_session_turns(session_id, session['summarized_upto'])
+            if len(turns) <= self.window_turns + self.summary_batch:
+                return
+
+            folded = turns[:len(turns) - self.window_turns]
+            summary = self.ai_service.summarize_chat(
+                session['summary'], [(message, response) for _, message, response in folded],
+                self.summary_tokens
+            )
+            self.db_manager.update_chat_session(session_id, summary=summary, summarized_upto=folded[-1][0])
+        except Exception as e:
+            print(f"⚠️  Could not summarize chat session {session_id}: {e}")
+        finally:
+            with self._lock:
+                self._summarizing.discard(session_id)
@@ -0,0 +1,124 @@
+import os
+import time
+import threading
+from collections import deque
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the provider while the circuit is open"""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Error-rate and slow-call circuit breaker for provider calls.
+
+    Outcomes of the last `window_seconds` are kept. Once at least `min_calls`
+    were seen, the circuit opens when the failure rate reaches `error_rate` or
+    the share of calls slower than `slow_call_seconds` reaches `slow_rate`.
+    While open every call fails immediately. After `open_seconds` up to
+    `half_open_probes` calls are let through; one healthy probe closes the
+    circuit, an unhealthy one opens it again. A rate-limited probe says
+    nothing about the provider's health, so it leaves the circuit half-open.
+    """
+
+    def __init__(self, window_seconds=None, min_calls=None, error_rate=None, slow_call_seconds=None,
+                 slow_rate=None, open_seconds=None, half_open_probes=1):
+        self.window_seconds = window_seconds or float(os.getenv('GEMINI_BREAKER_WINDOW', '60'))
+        self.min_calls = min_calls or int(os.getenv('GEMINI_BREAKER_MIN_CALLS', '10'))
+        self.error_rate = error_rate or float(os.getenv('GEMINI_BREAKER_ERROR_RATE', '0.5'))
+        self.slow_call_seconds = slow_call_seconds or float(os.getenv('GEMINI_BREAKER_SLOW_CALL_SECONDS', '20'))
+        self.slow_rate = slow_rate or float(os.getenv('GEMINI_BREAKER_SLOW_RATE', '0.8'))
+        self.open_seconds = open_seconds or float(os.getenv('GEMINI_BREAKER_OPEN_SECONDS', '30'))
+        self.half_open_probes = half_open_probes
+        self.enabled = os.getenv('GEMINI_BREAKER_DISABLED', '').lower() not in ('1', 'true', 'yes')
+
+        self.state = CLOSED
+        self._calls = deque()
+        self._opened_at = None
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    def _trim(self, now):
+        while self._calls and now - self._calls[0][0] > self.window_seconds:
+            self._calls.popleft()
+
+    def _open(self, now, reason):
+        self.state = OPEN
+        self._opened_at = now
+        self._probes = 0
+        self._calls.clear()
+        print(f"⚠️  Gemini circuit opened ({reason}), failing fast for {self.open_seconds:.0f}s")
+
+    def allow(self):
+        """Admit a call, or raise CircuitOpenError"""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self.state == OPEN:
+                remaining = self.open_seconds - (time.monotonic() - self._opened_at)
+                if remaining > 0:
+                    raise CircuitOpenError("Gemini circuit is open", retry_after=int(remaining) + 1)
+                self.state = HALF_OPEN
+                self._probes = 0
+            if self.state == HALF_OPEN:
+                if self._probes >= self.half_open_probes:
+                    raise CircuitOpenError("Gemini circuit is half-open, waiting for a probe", retry_after=1)
+                self._probes += 1
+
+    def cancel(self):
+        """Give back an admitted call that never reached the provider"""
+        with self._lock:
+            if self.state == HALF_OPEN and self._probes:
+                self._probes -= 1
+
+    def record(self, success, latency, rate_limited=False):
+        """Record the outcome of an admitted call; a 429 is `success` with `rate_limited`"""
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        slow = latency >= self.slow_call_seconds
+        with self._lock:
+            if self.state == HALF_OPEN:
+                if rate_limited:
+                    # Not a verdict on the provider: free the probe for another call
+                    if self._probes:
+                        self._probes -= 1
+                elif success and not slow:
+                    self.state = CLOSED
+                    self._calls.clear()
+                    print("✅ Gemini circuit closed")
+                else:
+                    self._open(now, 'probe failed')
+                return
+            if self.state == OPEN:
+                # A call admitted before the circuit opened
+                return
+
+            self._calls.append((now, not success, slow))
+            self._trim(now)
+            total = len(self._calls)
+            if total < self.min_calls:
+                return
+            failures = sum(1 for _, failed, _ in self._calls if failed)
+            slow_calls = sum(1 for _, _, was_slow in self._calls if was_slow)
+            if failures / total >= self.error_rate:
+                self._open(now, f'{failures}/{total} calls failed')
+            elif slow_calls / total >= self.slow_rate:
+                self._open(now, f'{slow_calls}/{total} calls slower than {self.slow_call_seconds:.0f}s')
+
+    def stats(self):
+        with self._lock:
+            self._trim(time.monotonic())
+            return {
+                'state': self.state,
+                'window_calls': len(self._calls),
+                'window_failures': sum(1 for _, failed, _ in self._calls if failed),
+                'window_slow_calls': sum(1 for _, _, slow in self._calls if slow)
+            }
@@ -2,6 +2,8 @@ import sqlite3
 import json
 from datetime import datetime
 import os
+import time
+import uuid
 
 class DatabaseManager:
     def __init__(self, db_path='resume_screener.db'):
@@ -28,6 +30,69 @@ class DatabaseManager:
             )
         ''')
         
+        # Columns added after the initial schema; appended so row positions stay stable
+        self._add_missing_columns(cursor, 'candidates', [
+            ('resume_hash', 'TEXT'),
+            ('bias_version', 'TEXT'),
+            ('jd_hash', 'TEXT'),
+            ('local_score', 'REAL'),
+            ('analysis_source', 'TEXT'),
+            # Filterable copies of analysis fields (see _index_candidate_filters)
+            ('overall_score', 'REAL'),
+            ('category', 'TEXT'),
+            ('experience_years', 'REAL'),
+            ('candidate_name', 'TEXT'),
+            ('location', 'TEXT'),
+            ('education', 'TEXT'),
+            # data_version of the last bias_analysis write, for incremental analytics
+            ('bias_rev', 'INTEGER')
+        ])
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_candidates_bias_version ON candidates (bias_version)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_candidates_bias_rev ON candidates (bias_rev)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_candidates_jd_hash ON candidates (jd_hash)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_candidates_jd_local_score ON candidates (jd_hash, local_score)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_candidates_score ON candidates (overall_score, id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_candidates_experience ON candidates (experience_years, id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_candidates_upload_date ON candidates (upload_date, id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_candidates_name ON candidates (candidate_name, id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_candidates_category ON candidates (category)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_candidates_location ON candidates (location)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_candidates_education ON candidates (education)')
+        
+        # Create candidate_skills table (one row per key skill, for skill filters and facets)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS candidate_skills (
+                skill TEXT NOT NULL,
+                candidate_id INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                PRIMARY KEY (skill, candidate_id)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_candidate_skills_candidate ON candidate_skills (candidate_id)')
+        self._index_candidate_filters(cursor, 'category IS NULL')
+        
+        # Create bias_cache table (bias results keyed by text hash and detector version)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS bias_cache (
+                text_hash TEXT NOT NULL,
+                detector_version TEXT NOT NULL,
+                bias_analysis TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (text_hash, detector_version)
+            )
+        ''')
+        
+        # Create job_descriptions table (parsed JobProfile per distinct job description)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS job_descriptions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                jd_hash TEXT UNIQUE NOT NULL,
+                raw_text TEXT NOT NULL,
+                profile TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
         # Create chat_history table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS chat_history (
@@ -40,6 +105,24 @@ class DatabaseManager:
             )
         ''')
         
+        self._add_missing_columns(cursor, 'chat_history', [('session_id', 'INTEGER')])
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_chat_history_session ON chat_history (session_id, id)')
+        
+        # Create chat_sessions table (per-candidate conversation with a rolling summary)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS chat_sessions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                candidate_id INTEGER NOT NULL,
+                context TEXT,
+                summary TEXT DEFAULT '',
+                summarized_upto INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (candidate_id) REFERENCES candidates (id)
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_chat_sessions_candidate ON chat_sessions (candidate_id, id)')
+        
         # Create hr_chat_history table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS hr_chat_history (
@@ -59,10 +142,114 @@ class DatabaseManager:
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
+        # Random id of this database file, so a recreated database is told apart
+        cursor.execute('''
+            INSERT OR IGNORE INTO settings (key, value) VALUES ('database_id', ?)
+        ''', (uuid.uuid4().hex[:12],))
+        
+        # Create upload_jobs table (durable queue for background resume processing)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS upload_jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL DEFAULT 'queued',
+                stage TEXT,
+                payload TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                attempts INTEGER DEFAULT 0,
+                available_at REAL NOT NULL,
+                leased_until REAL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_upload_jobs_status ON upload_jobs (status, available_at)')
+        
+        # Create candidate_search full-text index (name, skills and summary from the analysis)
+        try:
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS candidate_search
+                USING fts5(name, skills, summary)
+            ''')
+            self._index_candidate_search(cursor, 'id NOT IN (SELECT rowid FROM candidate_search)')
+        except sqlite3.OperationalError as e:
+            print(f"⚠️  Full-text search unavailable ({e}), HR chat will use vector retrieval only")
         
         conn.commit()
         conn.close()
     
+    def _index_candidate_search(self, cursor, where, params=()):
+        """(Re)index candidates matching a WHERE clause in candidate_search"""
+        cursor.execute(f'''
+            DELETE FROM candidate_search WHERE rowid IN (SELECT id FROM candidates WHERE {where})
+        ''', params)
+        cursor.execute(f'''
+            INSERT INTO candidate_search (rowid, name, skills, summary)
+            SELECT
+                id,
+                COALESCE(json_extract(analysis, '$.contact_info.name'), filename),
+                COALESCE((SELECT group_concat(value, ', ') FROM json_each(analysis, '$.key_skills')), ''),
+                COALESCE(json_extract(analysis, '$.summary'), '')
+            FROM candidates WHERE {where}
+        ''', params)
+    
+    def _index_candidate_filters(self, cursor, where, params=()):
+        """Copy filterable analysis fields of candidates matching a WHERE clause into columns"""
+        cursor.execute(f'''
+            DELETE FROM candidate_skills WHERE candidate_id IN (SELECT id FROM candidates WHERE {where})
+        ''', params)
+        cursor.execute(f'''
+            INSERT OR IGNORE INTO candidate_skills (skill, candidate_id, name)
+            SELECT lower(trim(skill.value)), c.cid, trim(skill.value)
+            FROM (SELECT id AS cid, analysis FROM candidates WHERE {where}) c,
+                 json_each(c.analysis, '$.key_skills') skill
+            WHERE skill.type = 'text' AND trim(skill.value) != ''
+        ''', params)
+        cursor.execute(f'''
+            UPDATE candidates SET
+                overall_score = COALESCE(CAST(json_extract(analysis, '$.overall_score') AS REAL), 0),
+                category = COALESCE(json_extract(analysis, '$.category'), ''),
+                experience_years = COALESCE(CAST(json_extract(analysis, '$.experience_years') AS REAL), 0),
+                candidate_name = COALESCE(json_extract(analysis, '$.contact_info.name'), filename),
+                location = COALESCE(json_extract(analysis, '$.contact_info.location'), ''),
+                education = COALESCE(json_extract(analysis, '$.education'), '')
+            WHERE {where}
+        ''', params)
+    
+    def _add_missing_columns(self, cursor, table, columns):
+        """Add columns that older databases do not have yet"""
+        cursor.execute(f'PRAGMA table_info({table})')
+        existing = {row[1] for row in cursor.fetchall()}
+        for name, column_type in columns:
+            if name not in existing:
+                cursor.execute(f'ALTER TABLE {table} ADD COLUMN {name} {column_type}')
+    
+    def _bump_data_version(self, cursor):
+        """Advance the shared write counter, call inside the writing transaction; returns the new value"""
+        cursor.execute('''
+            INSERT INTO settings (key, value) VALUES ('data_version', '1')
+            ON CONFLICT(key) DO UPDATE SET
+                value = CAST(CAST(value AS INTEGER) + 1 AS TEXT),
+                updated_at = CURRENT_TIMESTAMP
+        ''')
+        cursor.execute("SELECT value FROM settings WHERE key = 'data_version'")
+        return int(cursor.fetchone()[0])
+    
+    def get_data_version(self):
+        """Get the write counter, bumped by every candidate write in any process"""
+        return int(self.get_setting('data_version', 0))
+    
+    def get_data_state(self):
+        """Get (database_id, data_version) in one query"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT key, value FROM settings WHERE key IN ('database_id', 'data_version')")
+        values = dict(cursor.fetchall())
+        conn.close()
+        
+        return values.get('database_id', ''), int(values.get('data_version', 0))
+    
     def save_candidate(self, candidate_data):
         """Save candidate data to database"""
         conn = sqlite3.connect(self.db_path)
@@ -71,8 +258,9 @@ class DatabaseManager:
         cursor.execute('''
             INSERT INTO candidates (
                 filename, file_path, resume_text, job_description, 
-                analysis, bias_analysis, blind_resume, upload_date
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                analysis, bias_analysis, blind_resume, upload_date,
+                resume_hash, bias_version, jd_hash, local_score, analysis_source
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         ''', (
             candidate_data['filename'],
             candidate_data['file_path'],
@@ -81,10 +269,19 @@ class DatabaseManager:
             json.dumps(candidate_data['analysis']),
             json.dumps(candidate_data.get('bias_analysis', {})),
             candidate_data.get('blind_resume', ''),
-            candidate_data['upload_date']
+            candidate_data['upload_date'],
+            candidate_data.get('resume_hash'),
+            candidate_data.get('bias_version'),
+            candidate_data.get('jd_hash'),
+            candidate_data.get('local_score'),
+            candidate_data['analysis'].get('analysis_source', 'llm')
         ))
         
         candidate_id = cursor.lastrowid
+        self._update_candidate_search(cursor, candidate_id)
+        self._index_candidate_filters(cursor, 'id = ?', (candidate_id,))
+        version = self._bump_data_version(cursor)
+        cursor.execute('UPDATE candidates SET bias_rev = ? WHERE id = ?', (version, candidate_id))
         conn.commit()
         conn.close()
         
@@ -117,6 +314,70 @@ class DatabaseManager:
         
         return [self._row_to_dict(row) for row in rows]
     
+    def get_bias_analytics_rows(self, after_rev=-1):
+        """Get (id, job_description, bias_analysis, bias_rev) for candidates whose bias analysis
+        was written after data version `after_rev`"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT id, job_description, bias_analysis, COALESCE(bias_rev, 0) FROM candidates
+            WHERE COALESCE(bias_rev, 0) > ?
+            ORDER BY id
+        ''', (after_rev,))
+        rows = cursor.fetchall()
+        conn.close()
+        
+        return rows
+    
+    def get_resume_texts(self, after_id=0):
+        """Get (id, resume_text) for candidates with id > after_id, oldest first"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT id, resume_text FROM candidates WHERE id > ? ORDER BY id', (after_id,))
+        rows = cursor.fetchall()
+        conn.close()
+        
+        return rows
+    
+    def get_blind_resumes(self, after_id=0):
+        """Get (id, blind_resume) for candidates with id > after_id, oldest first"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT id, COALESCE(blind_resume, '') FROM candidates WHERE id > ? ORDER BY id
+        ''', (after_id,))
+        rows = cursor.fetchall()
+        conn.close()
+        
+        return rows
+    
+    def get_candidate_summaries(self, candidate_ids):
+        """Get {id: {id, filename, upload_date, analysis}} without the resume texts"""
+        if not candidate_ids:
+            return {}
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        placeholders = ','.join('?' * len(candidate_ids))
+        cursor.execute(f'''
+            SELECT id, filename, upload_date, analysis FROM candidates WHERE id IN ({placeholders})
+        ''', list(candidate_ids))
+        rows = cursor.fetchall()
+        conn.close()
+        
+        return {
+            row[0]: {
+                'id': row[0],
+                'filename': row[1],
+                'upload_date': row[2],
+                'analysis': json.loads(row[3]) if row[3] else {}
+            }
+            for row in rows
+        }
+    
     def _row_to_dict(self, row):
         """Convert database row to dictionary"""
         return {
@@ -132,36 +393,558 @@ class DatabaseManager:
             'created_at': row[9]
         }
     
-    def save_chat_message(self, candidate_id, message, response):
-        """Save chat message and response"""
+    def get_job_description(self, jd_hash):
+        """Get a stored job description profile by hash, or None"""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
+        cursor.execute('SELECT id, raw_text, profile FROM job_descriptions WHERE jd_hash = ?', (jd_hash,))
+        row = cursor.fetchone()
+        conn.close()
+        
+        if row:
+            return {'id': row[0], 'jd_hash': jd_hash, 'raw_text': row[1], 'profile': row[2]}
+        return None
+    
+    def save_job_description(self, jd_hash, raw_text, profile):
+        """Store a parsed job description profile (JSON), returns its id"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        # Another worker may have stored the same JD first; keep the existing row
         cursor.execute('''
-            INSERT INTO chat_history (candidate_id, message, response)
+            INSERT OR IGNORE INTO job_descriptions (jd_hash, raw_text, profile)
             VALUES (?, ?, ?)
-        ''', (candidate_id, message, response))
+        ''', (jd_hash, raw_text, profile))
+        cursor.execute('SELECT id FROM job_descriptions WHERE jd_hash = ?', (jd_hash,))
+        profile_id = cursor.fetchone()[0]
         
         conn.commit()
         conn.close()
+        
+        return profile_id
     
-    def get_chat_history(self, candidate_id):
-        """Get chat history for a candidate"""
+    def get_cached_bias(self, text_hash, detector_version):
+        """Get a memoized bias analysis, or None"""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
         cursor.execute('''
-            SELECT message, response, timestamp 
-            FROM chat_history 
-            WHERE candidate_id = ?
-            ORDER BY timestamp ASC
-        ''', (candidate_id,))
+            SELECT bias_analysis FROM bias_cache
+            WHERE text_hash = ? AND detector_version = ?
+        ''', (text_hash, detector_version))
+        row = cursor.fetchone()
+        conn.close()
+        
+        return json.loads(row[0]) if row else None
+    
+    def save_cached_bias(self, entries, detector_version):
+        """Memoize bias analyses, entries is a list of (text_hash, bias_analysis)"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.executemany('''
+            INSERT OR REPLACE INTO bias_cache (text_hash, detector_version, bias_analysis)
+            VALUES (?, ?, ?)
+        ''', [(text_hash, detector_version, json.dumps(analysis)) for text_hash, analysis in entries])
+        
+        conn.commit()
+        conn.close()
+    
+    def get_stale_bias_rows(self, detector_version, after_id=0, limit=200):
+        """Get (id, resume_text, resume_hash) for candidates scored by another detector version"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT id, resume_text, resume_hash FROM candidates
+            WHERE id > ? AND (bias_version IS NULL OR bias_version != ?)
+            ORDER BY id
+            LIMIT ?
+        ''', (after_id, detector_version, limit))
+        rows = cursor.fetchall()
+        conn.close()
+        
+        return rows
+    
+    def count_stale_bias_rows(self, detector_version):
+        """Count candidates whose bias analysis predates the detector version"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT COUNT(*) FROM candidates
+            WHERE bias_version IS NULL OR bias_version != ?
+        ''', (detector_version,))
+        count = cursor.fetchone()[0]
+        conn.close()
+        
+        return count
+    
+    def update_bias_analyses(self, updates, detector_version):
+        """Store re-scored bias analyses, updates is a list of (id, resume_hash, bias_analysis)"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        version = self._bump_data_version(cursor)
+        cursor.executemany('''
+            UPDATE candidates
+            SET bias_analysis = ?, resume_hash = ?, bias_version = ?, bias_rev = ?
+            WHERE id = ?
+        ''', [
+            (json.dumps(analysis), resume_hash, detector_version, version, candidate_id)
+            for candidate_id, resume_hash, analysis in updates
+        ])
+        
+        conn.commit()
+        conn.close()
+    
+    def update_candidate_analysis(self, candidate_id, analysis):
+        """Replace a candidate's analysis, e.g. after promoting it to LLM review"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            UPDATE candidates SET analysis = ?, analysis_source = ? WHERE id = ?
+        ''', (json.dumps(analysis), analysis.get('analysis_source', 'llm'), candidate_id))
+        self._update_candidate_search(cursor, candidate_id)
+        self._index_candidate_filters(cursor, 'id = ?', (candidate_id,))
+        # Chat sessions rebuild their cached candidate context on the next message
+        cursor.execute('UPDATE chat_sessions SET context = NULL WHERE candidate_id = ?', (candidate_id,))
+        self._bump_data_version(cursor)
+        
+        conn.commit()
+        conn.close()
+    
+    def _update_candidate_search(self, cursor, candidate_id):
+        try:
+            self._index_candidate_search(cursor, 'id = ?', (candidate_id,))
+        except sqlite3.OperationalError:
+            pass  # No FTS5 in this SQLite build
+    
+    def search_candidate_ids(self, match_query, limit=20):
+        """Get candidate ids for an FTS5 MATCH query, best bm25 rank first"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute('''
+                SELECT rowid FROM candidate_search WHERE candidate_search MATCH ?
+                ORDER BY bm25(candidate_search, 10.0, 3.0, 1.0) LIMIT ?
+            ''', (match_query, limit))
+            ids = [row[0] for row in cursor.fetchall()]
+        except sqlite3.OperationalError as e:
+            print(f"⚠️  Candidate search failed: {e}")
+            ids = []
+        conn.close()
+        
+        return ids
+    
+    def get_top_candidate_ids(self, limit=20):
+        """Get ids of the highest scored candidates"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT id FROM candidates
+            ORDER BY CAST(json_extract(analysis, '$.overall_score') AS FLOAT) DESC, id DESC
+            LIMIT ?
+        ''', (limit,))
+        ids = [row[0] for row in cursor.fetchall()]
+        conn.close()
+        
+        return ids
+    
+    def count_candidates(self):
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT COUNT(*) FROM candidates')
+        count = cursor.fetchone()[0]
+        conn.close()
+        
+        return count
+    
+    def count_higher_local_scores(self, jd_hash, local_score):
+        """Count candidates screened against the same JD with a better local score"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT COUNT(*) FROM candidates WHERE jd_hash IS ? AND local_score > ?
+        ''', (jd_hash, local_score))
+        count = cursor.fetchone()[0]
+        conn.close()
+        
+        return count
+    
+    def get_local_only_candidate_ids(self, jd_hash, limit):
+        """Get ids of the best locally scored candidates that have no LLM analysis yet"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT id FROM candidates
+            WHERE jd_hash IS ? AND analysis_source = 'local'
+            ORDER BY local_score DESC, id
+            LIMIT ?
+        ''', (jd_hash, limit))
+        ids = [row[0] for row in cursor.fetchall()]
+        conn.close()
+        
+        return ids
+    
+    def _candidate_filter_clauses(self, filters, skip=None):
+        """WHERE clauses and params for candidate filters, leaving out the `skip` dimension"""
+        clauses, params = [], []
+        if filters.get('q') and skip != 'q':
+            pattern = self._like_pattern(filters['q'])
+            clauses.append('''(
+                c.candidate_name LIKE ? ESCAPE '\\' OR c.filename LIKE ? ESCAPE '\\'
+                OR c.category LIKE ? ESCAPE '\\' OR c.education LIKE ? ESCAPE '\\'
+                OR c.location LIKE ? ESCAPE '\\'
+                OR c.id IN (SELECT candidate_id FROM candidate_skills WHERE skill LIKE ? ESCAPE '\\')
+            )''')
+            params.extend([pattern] * 6)
+        if skip != 'score':
+            if filters.get('min_score') is not None:
+                clauses.append('c.overall_score >= ?')
+                params.append(filters['min_score'])
+            if filters.get('max_score') is not None:
+                clauses.append('c.overall_score <= ?')
+                params.append(filters['max_score'])
+        if skip != 'experience':
+            if filters.get('min_experience') is not None:
+                clauses.append('c.experience_years >= ?')
+                params.append(filters['min_experience'])
+            if filters.get('max_experience') is not None:
+                clauses.append('c.experience_years <= ?')
+                params.append(filters['max_experience'])
+        for dimension in ('category', 'location', 'education'):
+            values = filters.get(dimension)
+            if values and skip != dimension:
+                clauses.append(f"c.{dimension} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+        if filters.get('skills') and skip != 'skills':
+            # Any of the skills, matched as a substring like the search page always did
+            clauses.append('c.id IN (SELECT candidate_id FROM candidate_skills WHERE '
+                           + ' OR '.join(["skill LIKE ? ESCAPE '\\'"] * len(filters['skills'])) + ')')
+            params.extend(self._like_pattern(skill) for skill in filters['skills'])
+        if filters.get('since') and skip != 'date':
+            clauses.append('c.upload_date >= ?')
+            params.append(filters['since'])
+        return clauses, params
+    
+    @staticmethod
+    def _like_pattern(text):
+        """Case-insensitive substring LIKE pattern (used with ESCAPE '\\')"""
+        return '%' + text.lower().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+    
+    @staticmethod
+    def _where(clauses):
+        return ('WHERE ' + ' AND '.join(clauses)) if clauses else ''
+    
+    def query_candidates(self, filters, sort_column='overall_score', descending=True, limit=20, after=None):
+        """Get one page of filtered candidates in (sort_column, id) order.
+        
+        `after` is the (sort value, id) of the last candidate of the previous
+        page. Returns (rows, total) where rows are (id, filename, upload_date,
+        analysis, sort value) and total counts all matching candidates.
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        clauses, params = self._candidate_filter_clauses(filters)
+        cursor.execute(f'SELECT COUNT(*) FROM candidates c {self._where(clauses)}', params)
+        total = cursor.fetchone()[0]
+        
+        direction, comparison = ('DESC', '<') if descending else ('ASC', '>')
+        if after is not None:
+            clauses = clauses + [f'(c.{sort_column} {comparison} ? OR (c.{sort_column} = ? AND c.id {comparison} ?))']
+            params = params + [after[0], after[0], after[1]]
+        cursor.execute(f'''
+            SELECT c.id, c.filename, c.upload_date, c.analysis, c.{sort_column}
+            FROM candidates c {self._where(clauses)}
+            ORDER BY c.{sort_column} {direction}, c.id {direction}
+            LIMIT ?
+        ''', params + [limit])
+        rows = cursor.fetchall()
+        conn.close()
+        
+        return rows, total
+    
+    def get_candidate_facets(self, filters, since_by_range, limit=50):
+        """Count candidates per filter value, each dimension with all other filters applied"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        facets = {}
+        
+        for dimension in ('category', 'location', 'education'):
+            clauses, params = self._candidate_filter_clauses(filters, skip=dimension)
+            where = self._where(clauses + [f"c.{dimension} != ''"])
+            cursor.execute(f'''
+                SELECT c.{dimension}, COUNT(*) FROM candidates c {where}
+                GROUP BY c.{dimension} ORDER BY 2 DESC, 1 LIMIT ?
+            ''', params + [limit])
+            facets[dimension] = [{'value': value, 'count': count} for value, count in cursor.fetchall()]
+        
+        clauses, params = self._candidate_filter_clauses(filters, skip='skills')
+        cursor.execute(f'''
+            SELECT MIN(s.name), COUNT(*) FROM candidate_skills s
+            JOIN candidates c ON c.id = s.candidate_id
+            {self._where(clauses)}
+            GROUP BY s.skill ORDER BY 2 DESC, 1 LIMIT ?
+        ''', params + [limit])
+        facets['skills'] = [{'value': value, 'count': count} for value, count in cursor.fetchall()]
+        
+        clauses, params = self._candidate_filter_clauses(filters, skip='score')
+        cursor.execute(f'''
+            SELECT CAST(MIN(MAX(c.overall_score, 0), 99) / 10 AS INTEGER) * 10 AS bucket, COUNT(*)
+            FROM candidates c {self._where(clauses)}
+            GROUP BY bucket ORDER BY bucket
+        ''', params)
+        facets['score'] = [{'min': bucket, 'max': bucket + 10, 'count': count} for bucket, count in cursor.fetchall()]
+        
+        clauses, params = self._candidate_filter_clauses(filters, skip='experience')
+        cursor.execute(f'''
+            SELECT CASE WHEN c.experience_years < 2 THEN 0 WHEN c.experience_years < 5 THEN 2
+                        WHEN c.experience_years < 10 THEN 5 ELSE 10 END AS bucket, COUNT(*)
+            FROM candidates c {self._where(clauses)}
+            GROUP BY bucket ORDER BY bucket
+        ''', params)
+        facets['experience'] = [{'min': bucket, 'count': count} for bucket, count in cursor.fetchall()]
+        
+        clauses, params = self._candidate_filter_clauses(filters, skip='date')
+        names = list(since_by_range)
+        counts = ', '.join(['COUNT(*)'] + ['SUM(c.upload_date >= ?)'] * len(names))
+        cursor.execute(f'SELECT {counts} FROM candidates c {self._where(clauses)}',
+                       [since_by_range[name] for name in names] + params)
+        row = cursor.fetchone()
+        facets['date_range'] = dict(zip(['all'] + names, [value or 0 for value in row]))
+        conn.close()
+        
+        return facets
+    
+    def save_chat_message(self, candidate_id, message, response, session_id=None):
+        """Save chat message and response, returns the turn id"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            INSERT INTO chat_history (candidate_id, message, response, session_id)
+            VALUES (?, ?, ?, ?)
+        ''', (candidate_id, message, response, session_id))
+        turn_id = cursor.lastrowid
+        if session_id is not None:
+            cursor.execute('''
+                UPDATE chat_sessions SET updated_at = CURRENT_TIMESTAMP WHERE id = ?
+            ''', (session_id,))
+        
+        conn.commit()
+        conn.close()
+        
+        return turn_id
+    
+    def get_chat_history(self, candidate_id, session_id=None):
+        """Get chat history for a candidate, optionally for one session"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        if session_id is None:
+            cursor.execute('''
+                SELECT message, response, timestamp 
+                FROM chat_history 
+                WHERE candidate_id = ?
+                ORDER BY timestamp ASC, id ASC
+            ''', (candidate_id,))
+        else:
+            cursor.execute('''
+                SELECT message, response, timestamp 
+                FROM chat_history 
+                WHERE candidate_id = ? AND session_id = ?
+                ORDER BY id ASC
+            ''', (candidate_id, session_id))
         
         rows = cursor.fetchall()
         conn.close()
         
         return [{'message': row[0], 'response': row[1], 'timestamp': row[2]} for row in rows]
     
+    def _session_to_dict(self, row):
+        return {
+            'id': row[0],
+            'candidate_id': row[1],
+            'context': row[2],
+            'summary': row[3] or '',
+            'summarized_upto': row[4] or 0
+        }
+    
+    def create_chat_session(self, candidate_id, context):
+        """Start a chat session for a candidate, returns the session"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            INSERT INTO chat_sessions (candidate_id, context) VALUES (?, ?)
+        ''', (candidate_id, context))
+        session_id = cursor.lastrowid
+        
+        conn.commit()
+        conn.close()
+        
+        return {'id': session_id, 'candidate_id': candidate_id, 'context': context,
+                'summary': '', 'summarized_upto': 0}
+    
+    def get_chat_session(self, session_id=None, candidate_id=None):
+        """Get a session by id, or the latest session of a candidate"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        if session_id is not None:
+            cursor.execute('''
+                SELECT id, candidate_id, context, summary, summarized_upto
+                FROM chat_sessions WHERE id = ?
+            ''', (session_id,))
+        else:
+            cursor.execute('''
+                SELECT id, candidate_id, context, summary, summarized_upto
+                FROM chat_sessions WHERE candidate_id = ?
+                ORDER BY id DESC LIMIT 1
+            ''', (candidate_id,))
+        row = cursor.fetchone()
+        conn.close()
+        
+        return self._session_to_dict(row) if row else None
+    
+    def update_chat_session(self, session_id, context=None, summary=None, summarized_upto=None):
+        """Update the cached context and/or the rolling summary of a session"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        if context is not None:
+            cursor.execute('UPDATE chat_sessions SET context = ? WHERE id = ?', (context, session_id))
+        if summary is not None:
+            cursor.execute('''
+                UPDATE chat_sessions SET summary = ?, summarized_upto = ? WHERE id = ?
+            ''', (summary, summarized_upto, session_id))
+        
+        conn.commit()
+        conn.close()
+    
+    def get_session_turns(self, session_id, after_id=0):
+        """Get (id, message, response) turns of a session after a turn id, oldest first"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT id, message, response FROM chat_history
+            WHERE session_id = ? AND id > ?
+            ORDER BY id
+        ''', (session_id, after_id))
+        rows = cursor.fetchall()
+        conn.close()
+        
+        return rows
+    
+    def _upload_job_to_dict(self, row):
+        return {
+            'id': row[0],
+            'status': row[1],
+            'stage': row[2],
+            'payload': json.loads(row[3]),
+            'result': json.loads(row[4]) if row[4] else None,
+            'error': row[5],
+            'attempts': row[6],
+            'created_at': row[7],
+            'updated_at': row[8]
+        }
+    
+    def create_upload_job(self, job_id, payload):
+        """Queue an upload for the background workers"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            INSERT INTO upload_jobs (id, payload, available_at) VALUES (?, ?, ?)
+        ''', (job_id, json.dumps(payload), time.time()))
+        
+        conn.commit()
+        conn.close()
+    
+    def claim_upload_job(self, lease_seconds):
+        """Lease the oldest runnable job (queued, or running with an expired lease), or None"""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        cursor = conn.cursor()
+        now = time.time()
+        
+        # IMMEDIATE takes the write lock up front so two workers cannot claim the same job
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            cursor.execute('''
+                SELECT id FROM upload_jobs
+                WHERE (status = 'queued' AND available_at <= ?)
+                   OR (status = 'running' AND leased_until < ?)
+                ORDER BY available_at LIMIT 1
+            ''', (now, now))
+            row = cursor.fetchone()
+            if row is None:
+                cursor.execute('COMMIT')
+                return None
+            cursor.execute('''
+                UPDATE upload_jobs
+                SET status = 'running', attempts = attempts + 1, leased_until = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            ''', (now + lease_seconds, row[0]))
+            cursor.execute('''
+                SELECT id, status, stage, payload, result, error, attempts, created_at, updated_at
+                FROM upload_jobs WHERE id = ?
+            ''', (row[0],))
+            job = self._upload_job_to_dict(cursor.fetchone())
+            cursor.execute('COMMIT')
+            return job
+        except Exception:
+            cursor.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+    
+    def update_upload_job(self, job_id, status=None, stage=None, result=None, error=None,
+                          available_at=None, lease_seconds=None, attempts=None):
+        """Update a job; passing lease_seconds also extends its lease"""
+        fields = {'status': status, 'stage': stage, 'error': error, 'available_at': available_at,
+                  'attempts': attempts}
+        if result is not None:
+            fields['result'] = json.dumps(result)
+        if lease_seconds is not None:
+            fields['leased_until'] = time.time() + lease_seconds
+        fields = {key: value for key, value in fields.items() if value is not None}
+        
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        cursor = conn.cursor()
+        
+        assignments = ', '.join(f'{key} = ?' for key in fields)
+        cursor.execute(
+            f'UPDATE upload_jobs SET {assignments}, updated_at = CURRENT_TIMESTAMP WHERE id = ?',
+            list(fields.values()) + [job_id]
+        )
+        
+        conn.commit()
+        conn.close()
+    
+    def get_upload_job(self, job_id):
+        """Get an upload job by id"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT id, status, stage, payload, result, error, attempts, created_at, updated_at
+            FROM upload_jobs WHERE id = ?
+        ''', (job_id,))
+        row = cursor.fetchone()
+        conn.close()
+        
+        return self._upload_job_to_dict(row) if row else None
+    
     def save_hr_chat_message(self, message, response):
         """Save HR chat message and response"""
         conn = sqlite3.connect(self.db_path)
@@ -0,0 +1,306 @@
+import os
+import time
+import random
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from services.circuit_breaker import CircuitBreaker, CircuitOpenError, CLOSED, OPEN
+from services.llm_metrics import LLMMetrics
+
+# Rough prompt size estimate used before the real usage_metadata is known
+CHARS_PER_TOKEN = 4
+DEFAULT_OUTPUT_TOKENS = 1024
+
+SERVER_ERROR_CODES = {500, 502, 503, 504}
+RETRYABLE_STATUS_CODES = SERVER_ERROR_CODES | {429}
+# Hedging needs this many latency samples before it trusts the percentile
+MIN_HEDGE_SAMPLES = 20
+
+
+class RateLimitError(Exception):
+    """Raised when a request could not be admitted or kept hitting 429s"""
+
+    def __init__(self, message, retry_after=60):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class _SlotStream:
+    """A streamed response that keeps its concurrency slot until read to the end or closed"""
+
+    def __init__(self, response, release):
+        self._response = response
+        self._release = release
+        self._released = False
+        self._lock = threading.Lock()
+
+    def __iter__(self):
+        try:
+            yield from self._response
+        finally:
+            self.close()
+
+    def close(self):
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        self._release()
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+    def __del__(self):
+        # Never iterated (or dropped mid-way): give the slot back
+        self.close()
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at `per_minute` tokens per minute"""
+
+    def __init__(self, per_minute, capacity=None):
+        self.capacity = float(capacity or per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, amount, timeout):
+        """Block until `amount` tokens are available, queueing callers in the meantime"""
+        amount = min(float(amount), self.capacity)
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise RateLimitError("Gemini request queue timed out waiting for quota",
+                                         retry_after=int((amount - self.tokens) / self.rate) + 1)
+                self._cond.wait(min((amount - self.tokens) / self.rate, remaining))
+
+    def adjust(self, delta):
+        """Charge (positive) or refund (negative) tokens after the fact"""
+        with self._cond:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens - delta)
+            self._cond.notify_all()
+
+    def drain(self):
+        """Empty the bucket, used when the provider says we are over quota"""
+        with self._cond:
+            self._refill()
+            self.tokens = min(self.tokens, 0.0)
+
+
+class GeminiClient:
+    """Admission control around generate_content calls.
+
+    Requests wait in a queue for a requests-per-minute and a tokens-per-minute
+    bucket, run with bounded concurrency, and are retried with exponential
+    backoff and full jitter on 429 and 5xx responses. Limits are per process,
+    so with several gunicorn workers set them to each worker's share.
+
+    A circuit breaker makes calls fail fast while the provider is erroring or
+    slow, and interactive calls can be hedged: when a call takes longer than
+    the recent p95 latency a second identical request is sent and the first
+    answer wins.
+    """
+
+    def __init__(self, rpm=None, tpm=None, max_concurrency=None, max_retries=None,
+                 queue_timeout=None, backoff_base=1.0, backoff_cap=32.0):
+        rpm = rpm or int(os.getenv('GEMINI_RPM', '15'))
+        tpm = tpm or int(os.getenv('GEMINI_TPM', '1000000'))
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.max_concurrency = max_concurrency or int(os.getenv('GEMINI_MAX_CONCURRENCY', '4'))
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv('GEMINI_MAX_RETRIES', '5'))
+        self.queue_timeout = queue_timeout or float(os.getenv('GEMINI_QUEUE_TIMEOUT', '120'))
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.breaker = CircuitBreaker()
+        self.metrics = LLMMetrics()
+        self.hedge_percentile = float(os.getenv('GEMINI_HEDGE_PERCENTILE', '95'))
+        self._latencies = {}
+        self._latency_lock = threading.Lock()
+        self._hedge_pool = ThreadPoolExecutor(max_workers=self.max_concurrency * 4,
+                                              thread_name_prefix='gemini-hedge')
+
+    @staticmethod
+    def estimate_tokens(prompt):
+        return len(prompt) // CHARS_PER_TOKEN + 1
+
+    @staticmethod
+    def status_code(error):
+        """HTTP status of a provider error, if it can be determined"""
+        code = getattr(error, 'code', None)
+        if isinstance(code, int):
+            return int(code)
+        message = str(error).lower()
+        if '429' in message or 'quota' in message or 'resource exhausted' in message:
+            return 429
+        for status in (500, 502, 503, 504):
+            if str(status) in message:
+                return status
+        return None
+
+    def _backoff(self, attempt):
+        # Full jitter: uniform in [0, min(cap, base * 2^attempt)]
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    def _admit(self, estimate):
+        self.requests.acquire(1, self.queue_timeout)
+        try:
+            self.tokens.acquire(estimate, self.queue_timeout)
+        except RateLimitError:
+            self.requests.adjust(-1)
+            raise
+
+    @staticmethod
+    def _used_tokens(response):
+        usage = getattr(response, 'usage_metadata', None)
+        return getattr(usage, 'total_token_count', None) if usage else None
+
+    def generate(self, model, prompt, max_output_tokens=None, endpoint='generate', **kwargs):
+        """Call model.generate_content(prompt, **kwargs) within the rate limits"""
+        started = time.monotonic()
+        tries = {'attempts': 0, 'rate_limited': 0}
+        outcome = 'error'
+        response = None
+        try:
+            response = self._generate_with_retries(model, prompt, max_output_tokens, tries, **kwargs)
+            outcome = 'ok'
+            return response
+        except CircuitOpenError:
+            outcome = 'circuit_open'
+            raise
+        except RateLimitError:
+            outcome = 'rate_limited'
+            raise
+        finally:
+            # Streamed responses report usage once they are consumed (see GeminiService._stream_text)
+            usage = None if kwargs.get('stream') else getattr(response, 'usage_metadata', None)
+            self.metrics.record_call(
+                endpoint, getattr(model, 'model_name', None), outcome, time.monotonic() - started,
+                attempts=tries['attempts'], rate_limited=tries['rate_limited'],
+                usage=usage, prompt_chars=len(prompt)
+            )
+
+    def _generate_with_retries(self, model, prompt, max_output_tokens, tries, **kwargs):
+        estimate = self.estimate_tokens(prompt) + (max_output_tokens or DEFAULT_OUTPUT_TOKENS)
+
+        for attempt in range(self.max_retries + 1):
+            # While the circuit is open this raises before touching the quota
+            self.breaker.allow()
+            try:
+                self._admit(estimate)
+            except RateLimitError:
+                self.breaker.cancel()
+                raise
+
+            if not self._slots.acquire(timeout=self.queue_timeout):
+                self.breaker.cancel()
+                self.requests.adjust(-1)
+                self.tokens.adjust(-estimate)
+                raise RateLimitError("Gemini request queue timed out waiting for a free slot")
+            tries['attempts'] += 1
+            started = time.monotonic()
+            try:
+                response = model.generate_content(prompt, **kwargs)
+                error = None
+            except Exception as e:
+                error = e
+            except BaseException:
+                self._slots.release()
+                raise
+            if error is None and kwargs.get('stream'):
+                # The body is still being generated, hold the slot until it is read
+                response = _SlotStream(response, self._slots.release)
+            else:
+                self._slots.release()
+            status = self.status_code(error) if error is not None else None
+            # Only 5xx and transport errors count against the provider, a 429 means we are over quota
+            healthy = error is None or (status is not None and status not in SERVER_ERROR_CODES)
+            self.breaker.record(healthy, time.monotonic() - started, rate_limited=status == 429)
+
+            if error is None:
+                used = self._used_tokens(response)
+                if used is not None and not kwargs.get('stream'):
+                    # Reconcile the estimate with what the request actually cost
+                    self.tokens.adjust(used - estimate)
+                return response
+
+            if status not in RETRYABLE_STATUS_CODES:
+                raise error
+            if status == 429:
+                tries['rate_limited'] += 1
+                # Everyone backs off, not just this caller
+                self.requests.drain()
+                self.tokens.drain()
+            if attempt == self.max_retries:
+                if status == 429:
+                    raise RateLimitError(f"Gemini quota exceeded after {attempt + 1} attempts") from error
+                raise error
+
+            if self.breaker.state == OPEN:
+                # Do not sleep before a retry that cannot be admitted
+                raise CircuitOpenError("Gemini circuit opened while retrying",
+                                       retry_after=int(self.breaker.open_seconds)) from error
+
+            delay = self._backoff(attempt)
+            print(f"⚠️  Gemini returned {status}, retrying in {delay:.1f}s "
+                  f"(attempt {attempt + 1}/{self.max_retries})")
+            time.sleep(delay)
+
+    def _timed_generate(self, endpoint, model, prompt, **kwargs):
+        started = time.monotonic()
+        response = self.generate(model, prompt, endpoint=endpoint, **kwargs)
+        with self._latency_lock:
+            self._latencies.setdefault(endpoint, deque(maxlen=200)).append(time.monotonic() - started)
+        return response
+
+    def latency_percentile(self, endpoint, pct):
+        """Recent successful call latency for `endpoint`, None until there are enough samples"""
+        with self._latency_lock:
+            samples = sorted(self._latencies.get(endpoint, ()))
+        if len(samples) < MIN_HEDGE_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * pct / 100.0))]
+
+    def generate_hedged(self, endpoint, model, prompt, **kwargs):
+        """generate() that sends a second request if the first is slower than the recent p95.
+
+        Latencies are tracked per endpoint. Whichever request
+        succeeds first is returned; the other finishes in the background. Only
+        for non-streaming, interactive calls where tail latency matters more
+        than the occasional duplicate request.
+        """
+        hedge_after = self.latency_percentile(endpoint, self.hedge_percentile)
+        if hedge_after is None:
+            return self._timed_generate(endpoint, model, prompt, **kwargs)
+
+        primary = self._hedge_pool.submit(self._timed_generate, endpoint, model, prompt, **kwargs)
+        done, _ = wait([primary], timeout=hedge_after)
+        if done or self.breaker.state != CLOSED:
+            return primary.result()
+
+        print(f"🔁 Hedging slow Gemini call ({endpoint}) after {hedge_after:.1f}s")
+        self.metrics.increment(endpoint, 'hedged')
+        pending = {primary, self._hedge_pool.submit(self._timed_generate, endpoint, model, prompt, **kwargs)}
+        first_error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                first_error = first_error or future.exception()
+        raise first_error
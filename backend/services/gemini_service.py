@@ -1,61 +1,156 @@
 import os
 import json
-import google.generativeai as genai
+import time
+import hashlib
+import threading
 from dotenv import load_dotenv
 
+from services.llm_cache import LLMResponseCache
+from services.gemini_client import GeminiClient, RateLimitError
+from services.circuit_breaker import CircuitOpenError
+from services.prompt_builder import PromptBuilder
+from services.llm_providers import get_provider
+
 # Load environment variables from the backend directory
 backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 load_dotenv(os.path.join(backend_dir, '.env'))
 
+# Resolved model names are cached on disk so workers do not call list_models() on boot
+MODEL_CACHE_PATH = os.getenv('GEMINI_MODEL_CACHE', os.path.join(backend_dir, '.gemini_model_cache.json'))
+MODEL_CACHE_TTL = int(os.getenv('GEMINI_MODEL_CACHE_TTL', str(24 * 60 * 60)))
+# Wait this long before retrying discovery after it failed
+DISCOVERY_RETRY_SECONDS = 60
+
 class GeminiService:
-    def __init__(self):
+    # Preferred order of models
+    MODEL_PREFERENCES = [
+        'models/gemini-1.5-flash',
+        'models/gemini-1.5-flash-latest',
+        'models/gemini-flash-latest',
+        'models/gemini-pro',
+        'models/gemini-pro-latest',
+        'models/gemini-2.0-flash',
+        'models/gemini-1.5-pro'
+    ]
+    
+    # Bump whenever the analyze_resume prompt changes so cached responses are not reused
+    ANALYSIS_PROMPT_VERSION = 3
+    
+    HR_BUSY_MESSAGE = "The AI is currently busy (Quota Exceeded). Please wait about 30 seconds and try your message again."
+    HR_UNAVAILABLE_MESSAGE = "The AI service is temporarily unavailable. Please try again in a minute."
+    HR_ERROR_MESSAGE = "I apologize, but I encountered an error while consulting with the AI. Please try again."
+    
+    def __init__(self, provider=None, local_scorer=None, prompt_builder=None):
+        # google.generativeai by default, LLM_PROVIDER=fake for offline load tests
+        self.provider = provider or get_provider()
         self.api_key = os.getenv('GEMINI_API_KEY', 'your key')
-        self.model_name = None
-        self.model = None
+        # Explicit override skips model discovery entirely
+        self.model_name = os.getenv('GEMINI_MODEL') or None
+        self._model = None
+        self._model_lock = threading.Lock()
+        self._discovery_failed_at = None
+        self.response_cache = LLMResponseCache()
+        self.client = GeminiClient()
+        self.prompt_builder = prompt_builder or PromptBuilder()
+        self.analysis_max_tokens = int(os.getenv('ANALYSIS_MAX_OUTPUT_TOKENS', '1500'))
+        # Send a second request when an interactive chat call is slower than the recent p95
+        self.hedge_chat = os.getenv('GEMINI_HEDGE_CHAT', '').lower() in ('1', 'true', 'yes')
+        # Deterministic scoring used when the model is unavailable or its output is unusable
+        if local_scorer is None:
+            from services.local_scorer import LocalScorer
+            local_scorer = LocalScorer()
+        self.local_scorer = local_scorer
         
-        if not self.api_key:
+        if not self.provider.requires_api_key:
+            print(f"⚠️  Using the '{self.provider.name}' LLM provider")
+        elif not self.api_key:
             print("⚠️  WARNING: GEMINI_API_KEY not found in environment variables")
-            self.configured = False
         else:
+            # configure() only stores the key, the model is resolved on the first AI call
+            self.provider.configure(self.api_key)
+
+    @property
+    def configured(self):
+        """True once a model is available, resolving it lazily on first use"""
+        return self.model is not None
+
+    @property
+    def model(self):
+        if self._model is None and (self.api_key or not self.provider.requires_api_key):
+            self._resolve_model()
+        return self._model
+
+    def _resolve_model(self):
+        with self._model_lock:
+            if self._model is not None:
+                return
+            if (self._discovery_failed_at is not None and
+                    time.time() - self._discovery_failed_at < DISCOVERY_RETRY_SECONDS):
+                return
+            
             try:
-                genai.configure(api_key=self.api_key)
-                
-                # Intelligent Model Selection
-                available_models = []
-                for m in genai.list_models():
-                    if 'generateContent' in m.supported_generation_methods:
-                        available_models.append(m.name)
-                
-                # Preferred order of models
-                preferences = [
-                    'models/gemini-1.5-flash',
-                    'models/gemini-1.5-flash-latest',
-                    'models/gemini-flash-latest',
-                    'models/gemini-pro',
-                    'models/gemini-pro-latest',
-                    'models/gemini-2.0-flash',
-                    'models/gemini-1.5-pro'
-                ]
-                
-                for pref in preferences:
-                    if pref in available_models:
-                        self.model_name = pref
-                        break
-                
-                if not self.model_name and available_models:
-                    self.model_name = available_models[0]
-                
-                if self.model_name:
-                    self.model = genai.GenerativeModel(self.model_name)
-                    print(f"✅ Gemini API configured successfully using model: {self.model_name}")
-                    self.configured = True
-                else:
+                model_name = self.model_name or self._read_model_cache() or self._discover_model()
+                if not model_name:
                     print("❌ No compatible Gemini models found for this API key.")
-                    self.configured = False
-                    
+                    self._discovery_failed_at = time.time()
+                    return
+                
+                self.model_name = model_name
+                self._model = self.provider.model(model_name)
+                self._discovery_failed_at = None
+                print(f"✅ Gemini API configured successfully using model: {model_name}")
             except Exception as e:
                 print(f"❌ Gemini Configuration Error: {e}")
-                self.configured = False
+                self._discovery_failed_at = time.time()
+
+    def _api_key_fingerprint(self):
+        # Per provider too, so a fake model name is never reused against the real API
+        key = f"{self.provider.name}:{self.api_key}"
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]
+
+    def _read_model_cache(self):
+        """Return the cached model name for this API key if it is still fresh"""
+        try:
+            with open(MODEL_CACHE_PATH, encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if cache.get('api_key') != self._api_key_fingerprint():
+            return None
+        if time.time() - cache.get('resolved_at', 0) > MODEL_CACHE_TTL:
+            return None
+        return cache.get('model')
+
+    def _write_model_cache(self, model_name):
+        tmp_path = f"{MODEL_CACHE_PATH}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'model': model_name,
+                    'api_key': self._api_key_fingerprint(),
+                    'resolved_at': time.time()
+                }, f)
+            os.replace(tmp_path, MODEL_CACHE_PATH)
+        except OSError as e:
+            print(f"⚠️  Could not write Gemini model cache: {e}")
+
+    def _discover_model(self):
+        """Intelligent Model Selection (one list_models() round-trip)"""
+        available_models = self.provider.list_models()
+        
+        model_name = None
+        for pref in self.MODEL_PREFERENCES:
+            if pref in available_models:
+                model_name = pref
+                break
+        
+        if not model_name and available_models:
+            model_name = available_models[0]
+        
+        if model_name:
+            self._write_model_cache(model_name)
+        return model_name
 
     def _call_gemini(self, messages, temperature=0.7, max_tokens=1500):
         """Call Google Gemini API using SDK"""
@@ -71,9 +166,10 @@ class GeminiService:
             
             prompt = "\n\n".join(prompt_parts)
 
-            response = self.model.generate_content(
-                prompt,
-                generation_config=genai.types.GenerationConfig(
+            response = self._generate(
+                prompt, 'call_gemini',
+                max_output_tokens=max_tokens,
+                generation_config=self.provider.generation_config(
                     temperature=temperature,
                     max_output_tokens=max_tokens
                 )
@@ -87,21 +183,58 @@ class GeminiService:
             print(f"❌ Gemini SDK Call Error: {e}")
             return self._get_mock_response()
 
+    @property
+    def metrics(self):
+        return self.client.metrics
+
+    def _generate(self, prompt, endpoint, hedge=False, **kwargs):
+        """generate_content through the rate limited, retrying client, recorded under `endpoint`"""
+        model = self.model
+        if model is None:
+            raise RuntimeError("Gemini model is not configured")
+        if hedge and self.hedge_chat:
+            return self.client.generate_hedged(endpoint, model, prompt, **kwargs)
+        return self.client.generate(model, prompt, endpoint=endpoint, **kwargs)
+
     def _get_mock_response(self):
         """Return a basic mock response when API is unavailable"""
         return "I am currently in mock mode because the Gemini API is not configured or reachable. I can still perform basic resume parsing and analysis based on local logic."
 
-    def analyze_resume(self, resume_text, job_description=""):
+    def analyze_resume(self, resume_text, job_description="", bypass_cache=False, job_profile=None):
         """Analyze resume and provide comprehensive evaluation"""
         try:
+            # Keep the most valuable sections within the token budget
+            compact_resume, resume_stats = self.prompt_builder.compact_resume(resume_text)
+            if job_profile is not None:
+                # Parsed once per distinct JD, reuse its compact form and requirements
+                compact_jd, jd_stats = job_profile.prompt_block(), job_profile.prompt_stats
+            else:
+                compact_jd, jd_stats = self.prompt_builder.compact_job_description(job_description)
+            prompt_stats = {'resume': resume_stats, 'job_description': jd_stats}
+
+            # Identical (blind resume, JD, provider, model, prompt) inputs reuse the stored
+            # analysis, so fake-provider load tests never answer for the real model;
+            # an empty resume block would make every such resume share one entry
+            cache_key = None
+            if self.model is not None and compact_resume.strip():
+                cache_key = self.response_cache.make_key(
+                    'analyze_resume', self.ANALYSIS_PROMPT_VERSION, self.provider.name, self.model_name,
+                    compact_resume, compact_jd
+                )
+                cached = self.response_cache.get(cache_key, bypass=bypass_cache)
+                if cached is not None:
+                    self.metrics.increment('analyze_resume', 'cache_hits')
+                    return cached
+                self.metrics.increment('analyze_resume', 'cache_misses')
+
             prompt = f"""
             Analyze the following resume and provide a comprehensive evaluation in JSON format.
 
             Resume Text:
-            {resume_text}
+            {compact_resume}
 
             Job Description (if provided):
-            {job_description}
+            {compact_jd}
 
             Please provide analysis in the following JSON structure:
             {{
@@ -128,7 +261,13 @@ class GeminiService:
             """
 
             # Simplified SDK call for structured output
-            response = self.model.generate_content(prompt)
+            response = self._generate(
+                prompt, 'analyze_resume',
+                max_output_tokens=self.analysis_max_tokens,
+                generation_config=self.provider.generation_config(
+                    max_output_tokens=self.analysis_max_tokens
+                )
+            )
             response_text = response.text
 
             # Clean JSON response (sometimes SDK wraps in backticks)
@@ -139,115 +278,180 @@ class GeminiService:
 
             try:
                 analysis = json.loads(response_text)
+                analysis['prompt_stats'] = prompt_stats
+                self.response_cache.put(cache_key, analysis)
                 return analysis
             except json.JSONDecodeError:
                 print(f"❌ JSON parsing failed. Response: {response_text[:200]}...")
-                return self._get_mock_analysis(resume_text)
+                self.metrics.increment('analyze_resume', 'json_fallbacks')
+                return self.local_scorer.analyze(resume_text, job_description, job_profile)
 
+        except RateLimitError:
+            # Retries and queueing were exhausted; let the caller decide, never
+            # hand back an error dict that would be stored as the analysis
+            print("❌ Gemini API Error: Quota Exceeded (429) after retries.")
+            raise
         except Exception as e:
-            if "429" in str(e) or "quota" in str(e).lower():
-                print("❌ Gemini API Error: Quota Exceeded (429). Please wait a minute.")
-                return {"error": "Quota exceeded. Please try again in 60 seconds."}
             print(f"❌ Error in resume analysis: {str(e)}")
-            return self._get_mock_analysis(resume_text)
-
-    def _get_mock_analysis(self, resume_text=""):
-        """Return mock analysis structure (kept for fallback)"""
-        import random
-        import hashlib
-
-        # Create a seed based on resume content for consistent but unique results
-        content_hash = hashlib.md5(resume_text.encode()).hexdigest()
-        random.seed(content_hash)
-
-        # Basic local extraction (Privacy First)
-        from services.resume_parser import ResumeParser
-        parser = ResumeParser()
-        contact = parser.extract_contact_info(resume_text)
-        skills = parser.extract_skills(resume_text) or ["Python", "JavaScript", "SQL"]
-        exp = parser.extract_experience_years(resume_text)
-
-        return {
-            "overall_score": random.randint(70, 95),
-            "category": "Qualified",
-            "summary": f"Calculated locally: Candidate with {exp} years of experience.",
-            "strengths": ["Local Analysis", "Privacy Protected"],
-            "weaknesses": ["Mock Feedback"],
-            "skills_match": random.randint(70, 90),
-            "experience_level": "Mid-level",
-            "experience_years": exp,
-            "key_skills": skills[:10],
-            "education": "Verified via local parser",
-            "recommendations": ["Check API Key for full AI insights"],
-            "red_flags": [],
-            "contact_info": {
-                "name": contact.get('name', 'Candidate Name'),
-                "email": contact.get('email', 'Email not found'),
-                "phone": contact.get('phone', 'Phone not found')
-            }
-        }
-
-    def chat_about_candidate(self, candidate, message):
-        """Chat about a specific candidate using SDK"""
-        try:
-            analysis = candidate.get('analysis', {})
-            contact_info = analysis.get('contact_info', {})
-            name = contact_info.get('name', 'This candidate')
-            
-            prompt = f"""
+            self.metrics.increment('analyze_resume', 'local_fallbacks')
+            return self.local_scorer.analyze(resume_text, job_description, job_profile)
+
+    def _candidate_chat_prompt(self, conversation, message):
+        """Prompt from a chat session (see ChatSessionManager.conversation)"""
+        history = "\n".join(
+            f"User: {question}\nAssistant: {answer}" for question, answer in conversation['turns']
+        )
+        return f"""
             You are an expert HR consultant. Answer the user question about this candidate.
             
-            Candidate Data: {json.dumps(analysis)}
+            Candidate Data: {conversation['context']}
+            
+            Earlier conversation (summary): {conversation['summary'] or 'None'}
+            
+            Recent conversation:
+            {history or 'None'}
             
             User Question: {message}
             
             Provide a professional, structured response in Markdown.
             """
-            
-            response = self.model.generate_content(prompt)
+
+    def _candidate_chat_fallback(self, conversation):
+        return f"I'm sorry, I'm having trouble analyzing **{conversation['name']}** right now."
+
+    def chat_about_candidate(self, conversation, message):
+        """Chat about a specific candidate using SDK"""
+        try:
+            response = self._generate(self._candidate_chat_prompt(conversation, message), 'chat', hedge=True)
             return response.text
 
+        except CircuitOpenError:
+            print("⚠️  Gemini circuit open, candidate chat fell back")
+            self.metrics.increment('chat', 'local_fallbacks')
+            return self._candidate_chat_fallback(conversation)
         except Exception as e:
             print(f"❌ Chat Error: {str(e)}")
             import traceback
             print(f"❌ Traceback: {traceback.format_exc()}")
-            return f"I'm sorry, I'm having trouble analyzing **{name}** right now."
+            self.metrics.increment('chat', 'local_fallbacks')
+            return self._candidate_chat_fallback(conversation)
 
-    def hr_assistant_chat(self, candidates, message):
-        """General HR assistant chat using SDK"""
+    def chat_about_candidate_stream(self, conversation, message):
+        """Streaming variant of chat_about_candidate, yields text chunks"""
+        return self._stream_text(
+            self._candidate_chat_prompt(conversation, message), 'chat_stream',
+            self._candidate_chat_fallback(conversation)
+        )
+
+    def summarize_chat(self, summary, turns, max_tokens=300):
+        """Fold (question, answer) turns into a running conversation summary"""
+        transcript = "\n".join(f"User: {question}\nAssistant: {answer}" for question, answer in turns)
+        prompt = f"""
+            Update the summary of an HR conversation about a candidate with the new turns.
+            Keep facts, conclusions and open questions; drop pleasantries. At most {max_tokens // 2} words.
+            
+            Current summary: {summary or 'None'}
+            
+            New turns:
+            {transcript}
+            
+            Return only the updated summary text.
+            """
         try:
-            # Prepare minimal candidate summaries for context
-            candidate_list = []
-            for c in candidates[:10]:
-                a = c.get('analysis', {})
-                candidate_list.append({
-                    "name": a.get('contact_info', {}).get('name', 'Unknown'),
-                    "score": a.get('overall_score', 0),
-                    "category": a.get('category', 'Unknown'),
-                    "skills": a.get('key_skills', [])[:5]
-                })
+            response = self._generate(
+                prompt, 'summarize_chat',
+                max_output_tokens=max_tokens,
+                generation_config=self.provider.generation_config(max_output_tokens=max_tokens)
+            )
+            return response.text.strip()
+        except Exception as e:
+            print(f"⚠️  Chat summary fell back to local extraction: {e}")
+            self.metrics.increment('summarize_chat', 'local_fallbacks')
 
-            prompt = f"""
+        # Local fallback: first sentence of each answer, oldest lines dropped to fit
+        lines = [line for line in (summary or '').split('\n') if line]
+        for question, answer in turns:
+            first_sentence = answer.strip().split('\n')[0].split('. ')[0][:200]
+            lines.append(f"- Q: {question.strip()[:150]} A: {first_sentence}")
+        while len(lines) > 1 and self.prompt_builder.count_tokens('\n'.join(lines)) > max_tokens:
+            lines.pop(0)
+        return '\n'.join(lines)
+
+    def _hr_chat_prompt(self, context, message):
+        """Prompt over the retrieved candidates (see HRContextRetriever.retrieve)"""
+        return f"""
             You are a senior HR assistant. Use this candidate list to answer the user question.
+            The list holds the {len(context['candidates'])} candidates most relevant to the question,
+            out of {context['total_candidates']} in the pool; do not assume it is the whole pool.
             
-            Candidates: {json.dumps(candidate_list)}
+            Candidates: {json.dumps(context['candidates'])}
             
             User question: {message}
             
             Format your response clearly with markdown, bullet points, and bold text.
             """
 
-            response = self.model.generate_content(prompt)
+    def hr_assistant_chat(self, context, message):
+        """General HR assistant chat using SDK"""
+        try:
+            response = self._generate(self._hr_chat_prompt(context, message), 'hr_chat', hedge=True)
             return response.text
 
+        except RateLimitError:
+            print("❌ Gemini API Error: Quota Exceeded (429).")
+            return self.HR_BUSY_MESSAGE
+        except CircuitOpenError:
+            print("⚠️  Gemini circuit open, HR assistant fell back")
+            self.metrics.increment('hr_chat', 'local_fallbacks')
+            return self.HR_UNAVAILABLE_MESSAGE
         except Exception as e:
-            if "429" in str(e) or "quota" in str(e).lower():
-                print("❌ Gemini API Error: Quota Exceeded (429).")
-                return "The AI is currently busy (Quota Exceeded). Please wait about 30 seconds and try your message again."
             print(f"❌ HR Assistant Error: {str(e)}")
             import traceback
             print(f"❌ Traceback: {traceback.format_exc()}")
-            return "I apologize, but I encountered an error while consulting with the AI. Please try again."
+            self.metrics.increment('hr_chat', 'local_fallbacks')
+            return self.HR_ERROR_MESSAGE
+
+    def hr_assistant_chat_stream(self, context, message):
+        """Streaming variant of hr_assistant_chat, yields text chunks"""
+        return self._stream_text(
+            self._hr_chat_prompt(context, message), 'hr_chat_stream',
+            self.HR_ERROR_MESSAGE,
+            busy_message=self.HR_BUSY_MESSAGE
+        )
+
+    def _stream_text(self, prompt, endpoint, fallback, busy_message=None):
+        """Yield response text chunks as the model produces them (stream=True)"""
+        produced = False
+        try:
+            response = self._generate(prompt, endpoint, stream=True)
+            for chunk in response:
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # Chunks without text parts (e.g. the final safety/finish chunk)
+                    continue
+                if text:
+                    produced = True
+                    yield text
+            # Usage of a streamed response is only known once it was consumed
+            self.metrics.add_tokens(endpoint, getattr(response, 'usage_metadata', None))
+        except Exception as e:
+            if produced:
+                # A cut-off answer must not look complete: the caller reports an
+                # error instead of saving the partial turn
+                print(f"❌ Streaming Chat interrupted: {str(e)}")
+                raise
+            if isinstance(e, RateLimitError):
+                print("❌ Gemini API Error: Quota Exceeded (429).")
+                yield busy_message or fallback
+            elif isinstance(e, CircuitOpenError):
+                print("⚠️  Gemini circuit open, streaming chat fell back")
+                self.metrics.increment(endpoint, 'local_fallbacks')
+                yield fallback
+            else:
+                print(f"❌ Streaming Chat Error: {str(e)}")
+                self.metrics.increment(endpoint, 'local_fallbacks')
+                yield fallback
 
     def _generate_mock_hr_response(self, candidates, message):
         # Kept for total fallback compatibility
@@ -0,0 +1,113 @@
+import os
+import re
+import json
+
+TERM_PATTERN = re.compile(r'[A-Za-z0-9][A-Za-z0-9+#.]*')
+STOPWORDS = {
+    'a', 'an', 'the', 'and', 'or', 'of', 'to', 'in', 'on', 'for', 'with', 'at', 'by', 'is', 'are',
+    'was', 'be', 'do', 'does', 'did', 'who', 'whom', 'what', 'which', 'how', 'why', 'when', 'where',
+    'can', 'could', 'should', 'would', 'me', 'my', 'we', 'our', 'us', 'i', 'you', 'tell', 'about',
+    'show', 'list', 'give', 'find', 'any', 'all', 'has', 'have', 'there', 'candidate', 'candidates',
+    'someone', 'anyone', 'people', 'know', 'knows', 'with', 'from', 'than', 'more', 'most', 'please'
+}
+# Questions about the pool as a whole are answered from the highest scored candidates
+RANKING_PATTERN = re.compile(
+    r'\b(?:best|top|highest|strongest|rank\w*|shortlist|recommend\w*|compare|overall|summar\w*)\b',
+    re.IGNORECASE
+)
+# Reciprocal rank fusion constant
+RRF_K = 60
+# Hashed vectors of unrelated texts still overlap a little; ignore weak matches
+# and questions too short for hashing collisions to average out
+MIN_SIMILARITY = 0.15
+MIN_VECTOR_TERMS = 3
+
+
+class HRContextRetriever:
+    """Pick the candidates an HR question is about and pack them into a token budget.
+
+    Candidates are retrieved by full-text search over names, skills and
+    summaries, by vector similarity, and by score for ranking questions; the
+    lists are merged with reciprocal rank fusion. Only the analysis column of
+    the chosen candidates is read from the database.
+    """
+
+    def __init__(self, db_manager, vector_index, prompt_builder, token_budget=None, max_candidates=None):
+        self.db_manager = db_manager
+        self.vector_index = vector_index
+        self.prompt_builder = prompt_builder
+        self.token_budget = token_budget or int(os.getenv('HR_CONTEXT_TOKEN_BUDGET', '1500'))
+        self.max_candidates = max_candidates or int(os.getenv('HR_CONTEXT_MAX_CANDIDATES', '15'))
+
+    @staticmethod
+    def query_terms(message):
+        """Meaningful terms of the question, lower-cased and deduplicated"""
+        terms = []
+        for term in TERM_PATTERN.findall(message):
+            term = term.rstrip('.').lower()
+            if (len(term) > 1 and term not in STOPWORDS and term not in terms
+                    and not RANKING_PATTERN.fullmatch(term)):
+                terms.append(term)
+        return terms
+
+    def _ranked_lists(self, message, limit):
+        lists = []
+        terms = self.query_terms(message)
+        if terms:
+            # FTS5 query matching any of the terms, each quoted as a phrase
+            query = ' OR '.join('"{}"'.format(term.replace('"', '""')) for term in terms)
+            lists.append(self.db_manager.search_candidate_ids(query, limit))
+        if self.vector_index is not None and len(terms) >= MIN_VECTOR_TERMS:
+            try:
+                matches = self.vector_index.search(message, limit)
+                lists.append([cid for cid, similarity in matches if similarity >= MIN_SIMILARITY])
+            except Exception as e:
+                print(f"⚠️  Vector retrieval failed: {e}")
+        if RANKING_PATTERN.search(message) or not any(lists):
+            lists.append(self.db_manager.get_top_candidate_ids(limit))
+        return lists
+
+    @staticmethod
+    def _record(candidate):
+        analysis = candidate.get('analysis', {})
+        return {
+            "id": candidate['id'],
+            "name": analysis.get('contact_info', {}).get('name', 'Unknown'),
+            "score": analysis.get('overall_score', 0),
+            "category": analysis.get('category', 'Unknown'),
+            "experience_years": analysis.get('experience_years'),
+            "skills": analysis.get('key_skills', [])[:8],
+            "summary": analysis.get('summary', '')
+        }
+
+    def retrieve(self, message):
+        """Return {'candidates': [...], 'total_candidates', 'retrieved'} for the prompt"""
+        limit = self.max_candidates * 2
+        fused = {}
+        for ranked in self._ranked_lists(message, limit):
+            for rank, candidate_id in enumerate(ranked):
+                fused[candidate_id] = fused.get(candidate_id, 0.0) + 1.0 / (RRF_K + rank)
+        ordered = sorted(fused, key=lambda cid: (-fused[cid], -cid))[:self.max_candidates]
+
+        summaries = self.db_manager.get_candidate_summaries(ordered)
+        records = []
+        remaining = self.token_budget
+        for candidate_id in ordered:
+            if candidate_id not in summaries:
+                continue
+            record = self._record(summaries[candidate_id])
+            cost = self.prompt_builder.count_tokens(json.dumps(record))
+            if cost > remaining:
+                # Drop the free-text summary before dropping the candidate
+                record.pop('summary')
+                cost = self.prompt_builder.count_tokens(json.dumps(record))
+                if cost > remaining:
+                    break
+            records.append(record)
+            remaining -= cost
+
+        return {
+            'candidates': records,
+            'total_candidates': self.db_manager.count_candidates(),
+            'retrieved': len(ordered)
+        }
@@ -0,0 +1,103 @@
+import re
+
+
+class IndicatorScanner:
+    """Single-pass, word-boundary aware matcher for groups of literal indicators.
+
+    All indicators are folded into one prefix-trie shaped regular expression, so
+    the work done per text position depends on the length of the candidate match
+    rather than on how many indicators are configured. Dictionaries too large for
+    a regex (such as given names) are checked per capitalized token in the same
+    pass through their ``lookup`` method.
+    """
+
+    # Capitalized word, allowing hyphenated names such as 'Min-Jun'
+    TOKEN_PATTERN = r'(?-i:(?=[A-ZÀ-ÖØ-Þ]))[^\W\d_]+(?:-[^\W\d_]+)*(?!\w)'
+
+    def __init__(self, groups, lexicons=None):
+        # groups: {group_name: [indicator, ...]}, lexicons: {group_name: lexicon}
+        self.groups = {name: list(indicators) for name, indicators in groups.items()}
+        self.lexicons = dict(lexicons or {})
+        self._lookup = {}
+        trie = {}
+
+        for name, indicators in self.groups.items():
+            for indicator in indicators:
+                key = indicator.lower()
+                if not key:
+                    continue
+                owners = self._lookup.setdefault(key, [])
+                if (name, indicator) not in owners:
+                    owners.append((name, indicator))
+                node = trie
+                for char in key:
+                    node = node.setdefault(char, {})
+                node[''] = self._tail_assertion(key)
+
+        alternatives = []
+        if trie:
+            alternatives.append(f'(?P<indicator>{self._trie_to_regex(trie)})')
+        if self.lexicons:
+            alternatives.append(f'(?P<token>{self.TOKEN_PATTERN})')
+
+        if alternatives:
+            self.pattern = re.compile(r'(?<!\w)(?:' + '|'.join(alternatives) + ')', re.IGNORECASE)
+        else:
+            self.pattern = None
+
+    @staticmethod
+    def _tail_assertion(key):
+        """Right-hand boundary for an indicator.
+
+        Indicators ending in a letter must end on a word boundary ('man' must not
+        match 'management'). Indicators ending in a digit are year stems such as
+        'class of 19' and are allowed to run into the rest of the number.
+        Indicators ending in punctuation ('mr.', 'he/him') need no check.
+        """
+        if key[-1].isalpha() or key[-1] == '_':
+            return r'(?!\w)'
+        return ''
+
+    def _trie_to_regex(self, node):
+        alternatives = []
+        for char in sorted(k for k in node if k):
+            alternatives.append(re.escape(char) + self._trie_to_regex(node[char]))
+        # Terminal alternative goes last so longer indicators win
+        if '' in node:
+            alternatives.append(node[''])
+
+        if len(alternatives) == 1:
+            return alternatives[0]
+        return '(?:' + '|'.join(alternatives) + ')'
+
+    def scan(self, text):
+        """Scan text once and return {group: [{'indicator', 'start', 'end'}, ...]}
+
+        Lexicon hits additionally carry the lexicon's ``tag`` for the token.
+        """
+        hits = {name: [] for name in list(self.groups) + list(self.lexicons)}
+        if not text or self.pattern is None:
+            return hits
+
+        for match in self.pattern.finditer(text):
+            if self.lexicons and match.start('token') != -1:
+                token = match.group(0).lower()
+                for name, lexicon in self.lexicons.items():
+                    tag = lexicon.lookup(token)
+                    if tag is not None:
+                        hits[name].append({
+                            'indicator': token,
+                            'start': match.start(),
+                            'end': match.end(),
+                            'tag': tag
+                        })
+                continue
+
+            for name, indicator in self._lookup.get(match.group(0).lower(), ()):
+                hits[name].append({
+                    'indicator': indicator,
+                    'start': match.start(),
+                    'end': match.end()
+                })
+
+        return hits
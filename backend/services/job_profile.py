@@ -0,0 +1,200 @@
+import re
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+from services.prompt_builder import JD_SECTION_PRIORITIES
+
+# Lines under these headings, or mentioning these phrases, list optional skills
+OPTIONAL_HEADINGS = ('nice to have', 'preferred', 'bonus', 'good to have', 'plus')
+OPTIONAL_LINE_PATTERN = re.compile(
+    r'\b(?:nice to have|preferred|a plus|is a plus|bonus|good to have|desirable|optional)\b',
+    re.IGNORECASE
+)
+
+# Checked in order, the first match wins
+SENIORITY_PATTERNS = [
+    ('Expert', r'\b(?:principal|staff|distinguished|architect|head of|director|vp)\b'),
+    ('Senior', r'\b(?:senior|sr\.?|lead|tech lead)\b'),
+    ('Junior', r'\b(?:junior|jr\.?|entry[- ]level|graduate|intern(?:ship)?|trainee)\b'),
+    ('Mid-level', r'\b(?:mid[- ]level|intermediate|mid[- ]senior)\b')
+]
+
+YEARS_PATTERN = re.compile(
+    r'(?:minimum|min\.?|at least)?\s*(\d{1,2})\s*\+?\s*(?:-|to)?\s*(?:\d{1,2})?\s*\+?\s*(?:years?|yrs?)',
+    re.IGNORECASE
+)
+
+
+def jd_hash(job_description):
+    """Key for a job description; whitespace differences do not create a new profile"""
+    normalized = re.sub(r'\s+', ' ', (job_description or '')).strip()
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+class JobProfile:
+    """Structured form of a job description, extracted once per distinct JD"""
+
+    def __init__(self, jd_hash, required_skills, optional_skills, seniority, min_years,
+                 compact_text, prompt_stats, profile_id=None):
+        self.jd_hash = jd_hash
+        self.required_skills = required_skills
+        self.optional_skills = optional_skills
+        self.seniority = seniority
+        self.min_years = min_years
+        self.compact_text = compact_text
+        self.prompt_stats = prompt_stats
+        self.profile_id = profile_id
+
+    @property
+    def skills(self):
+        return self.required_skills + self.optional_skills
+
+    def prompt_block(self):
+        """Compact JD text for the analysis prompt, headed by the extracted requirements"""
+        if not self.compact_text:
+            return ''
+        lines = []
+        if self.required_skills:
+            lines.append(f"Required skills: {', '.join(self.required_skills)}")
+        if self.optional_skills:
+            lines.append(f"Nice-to-have skills: {', '.join(self.optional_skills)}")
+        if self.seniority:
+            lines.append(f"Seniority: {self.seniority}")
+        if self.min_years:
+            lines.append(f"Minimum experience: {self.min_years} years")
+        lines.append(self.compact_text)
+        return '\n'.join(lines)
+
+    def match(self, skills):
+        """Local skill coverage of a candidate against this profile, no LLM involved"""
+        have = set(skills)
+        matched = [s for s in self.required_skills if s in have]
+        return {
+            'required_matched': matched,
+            'required_missing': [s for s in self.required_skills if s not in have],
+            'optional_matched': [s for s in self.optional_skills if s in have],
+            'required_coverage': round(len(matched) / len(self.required_skills), 4) if self.required_skills else None
+        }
+
+    def to_dict(self):
+        return {
+            'id': self.profile_id,
+            'jd_hash': self.jd_hash,
+            'required_skills': self.required_skills,
+            'optional_skills': self.optional_skills,
+            'seniority': self.seniority,
+            'min_years': self.min_years,
+            'compact_text': self.compact_text,
+            'prompt_stats': self.prompt_stats
+        }
+
+    @classmethod
+    def from_dict(cls, data, profile_id=None):
+        return cls(
+            data['jd_hash'], data['required_skills'], data['optional_skills'],
+            data['seniority'], data['min_years'], data['compact_text'],
+            data['prompt_stats'], profile_id=profile_id or data.get('id')
+        )
+
+
+class JobProfileService:
+    """Extract, cache and persist JobProfiles keyed by job description hash.
+
+    Stored profiles are keyed by the JD hash plus `version`, so changing the
+    skill taxonomy, the JD token budget or the extraction logic re-extracts
+    them instead of serving profiles built with the old settings.
+    """
+
+    # Bump when extract() changes in a way the taxonomy and budget do not show
+    EXTRACTION_VERSION = 1
+
+    def __init__(self, db_manager, resume_parser, prompt_builder, memory_size=256):
+        self.db_manager = db_manager
+        self.resume_parser = resume_parser
+        self.prompt_builder = prompt_builder
+        self.memory_size = memory_size
+        self._profiles = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+
+    @property
+    def version(self):
+        if self._version is None:
+            settings = json.dumps([
+                self.EXTRACTION_VERSION, self.resume_parser.technical_skills, self.prompt_builder.jd_budget
+            ])
+            self._version = hashlib.sha256(settings.encode('utf-8')).hexdigest()[:12]
+        return self._version
+
+    def get_profile(self, job_description):
+        """Return the JobProfile for a JD, or None when no JD was given"""
+        if not job_description or not job_description.strip():
+            return None
+
+        key = jd_hash(job_description)
+        with self._lock:
+            profile = self._profiles.get(key)
+            if profile is not None:
+                self._profiles.move_to_end(key)
+                return profile
+
+        stored_key = f'{key}:{self.version}'
+        stored = self.db_manager.get_job_description(stored_key)
+        if stored is not None:
+            profile = JobProfile.from_dict(json.loads(stored['profile']), profile_id=stored['id'])
+        else:
+            profile = self.extract(job_description)
+            profile.profile_id = self.db_manager.save_job_description(
+                stored_key, job_description, json.dumps(profile.to_dict())
+            )
+
+        with self._lock:
+            self._profiles[key] = profile
+            self._profiles.move_to_end(key)
+            while len(self._profiles) > self.memory_size:
+                self._profiles.popitem(last=False)
+        return profile
+
+    def extract(self, job_description):
+        """Build a JobProfile from JD text using the parser skill taxonomy"""
+        required_text = []
+        optional_text = []
+        in_optional_section = False
+        for line in job_description.split('\n'):
+            stripped = line.strip()
+            if not stripped:
+                continue
+            heading = re.sub(r'[^a-z ]', '', stripped.lower()).strip()
+            if len(stripped) <= 40 and heading and not YEARS_PATTERN.search(stripped):
+                if any(heading.startswith(h) for h in OPTIONAL_HEADINGS):
+                    in_optional_section = True
+                    continue
+                if stripped.endswith(':') or heading in JD_SECTION_PRIORITIES:
+                    in_optional_section = False
+            if in_optional_section or OPTIONAL_LINE_PATTERN.search(stripped):
+                optional_text.append(stripped)
+            else:
+                required_text.append(stripped)
+
+        required_skills = self.resume_parser.extract_skills('\n'.join(required_text))
+        optional_skills = [
+            skill for skill in self.resume_parser.extract_skills('\n'.join(optional_text))
+            if skill not in required_skills
+        ]
+
+        seniority = None
+        for level, pattern in SENIORITY_PATTERNS:
+            if re.search(pattern, job_description, re.IGNORECASE):
+                seniority = level
+                break
+
+        years = [int(m.group(1)) for m in YEARS_PATTERN.finditer(job_description)]
+        years = [y for y in years if 0 < y <= 40]
+
+        compact_text, prompt_stats = self.prompt_builder.compact_job_description(job_description)
+        return JobProfile(
+            jd_hash(job_description), required_skills, optional_skills, seniority,
+            min(years) if years else None, compact_text, prompt_stats
+        )
@@ -0,0 +1,112 @@
+import os
+import time
+import uuid
+import threading
+
+from services.gemini_client import RateLimitError
+
+
+class UploadJobQueue:
+    """Durable background processing of uploaded resumes.
+
+    Jobs live in the upload_jobs table, so they survive restarts and can be
+    shared by several gunicorn workers. Each process runs `workers` threads
+    that lease the oldest runnable job; a job whose lease expired (its worker
+    died) is picked up again. Failed jobs are retried with exponential
+    backoff, quota errors wait for the quota without using up an attempt.
+    """
+
+    def __init__(self, db_manager, pipeline, workers=None, max_attempts=None, lease_seconds=None,
+                 poll_interval=1.0, retry_delay=5.0):
+        self.db_manager = db_manager
+        self.pipeline = pipeline
+        self.workers = workers or int(os.getenv('UPLOAD_WORKERS', '2'))
+        self.max_attempts = max_attempts or int(os.getenv('UPLOAD_JOB_MAX_ATTEMPTS', '3'))
+        self.lease_seconds = lease_seconds or float(os.getenv('UPLOAD_JOB_LEASE_SECONDS', '300'))
+        self.poll_interval = poll_interval
+        self.retry_delay = retry_delay
+        self._wakeup = threading.Event()
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the worker threads (idempotent)"""
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f'upload-worker-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        print(f"✅ Started {self.workers} upload workers")
+
+    def submit(self, payload):
+        """Queue a stored upload, returns the job id"""
+        job_id = uuid.uuid4().hex
+        self.db_manager.create_upload_job(job_id, payload)
+        self.start()
+        self._wakeup.set()
+        return job_id
+
+    def get(self, job_id):
+        """The job without its internal payload, or None"""
+        job = self.db_manager.get_upload_job(job_id)
+        if job is None:
+            return None
+        job.pop('payload')
+        return job
+
+    def _work(self):
+        while True:
+            try:
+                job = self.db_manager.claim_upload_job(self.lease_seconds)
+            except Exception as e:
+                print(f"⚠️  Could not claim an upload job: {e}")
+                job = None
+            if job is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+            self._run(job)
+
+    def _run(self, job):
+        job_id = job['id']
+        if job['attempts'] > self.max_attempts:
+            # Its worker died mid-job too many times
+            self.db_manager.update_upload_job(job_id, status='failed', error=job['error'] or 'Too many attempts')
+            return
+
+        def progress(stage):
+            # Each stage also renews the lease
+            self.db_manager.update_upload_job(job_id, stage=stage, lease_seconds=self.lease_seconds)
+
+        payload = job['payload']
+        try:
+            result = self.pipeline.process(
+                payload['file_path'], payload['filename'], payload.get('job_description', ''),
+                screening_mode=payload.get('screening_mode'),
+                bypass_cache=payload.get('bypass_cache', False),
+                progress=progress
+            )
+        except RateLimitError as e:
+            # Waiting for quota is not a failed attempt; while the circuit is open
+            # analyze_resume falls back to the local scorer instead of raising
+            print(f"🔁 Upload job {job_id} deferred {e.retry_after}s: {e}")
+            self.db_manager.update_upload_job(
+                job_id, status='queued', error=str(e), attempts=job['attempts'] - 1,
+                available_at=time.time() + e.retry_after
+            )
+            return
+        except Exception as e:
+            if job['attempts'] >= self.max_attempts:
+                print(f"❌ Upload job {job_id} failed after {job['attempts']} attempts: {e}")
+                self.db_manager.update_upload_job(job_id, status='failed', error=str(e))
+            else:
+                delay = self.retry_delay * (2 ** (job['attempts'] - 1))
+                print(f"🔁 Upload job {job_id} failed ({e}), retrying in {delay:.0f}s")
+                self.db_manager.update_upload_job(
+                    job_id, status='queued', error=str(e), available_at=time.time() + delay
+                )
+            return
+
+        self.db_manager.update_upload_job(job_id, status='done', stage='done', result=result)
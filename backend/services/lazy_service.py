@@ -0,0 +1,67 @@
+import time
+import importlib
+import threading
+
+# Every LazyService created in this process, in creation order
+_services = []
+
+
+def import_object(path):
+    """Import 'package.module.Name' and return Name"""
+    module, _, name = path.rpartition('.')
+    return getattr(importlib.import_module(module), name)
+
+
+def service_status():
+    """Build time in ms of each lazy service, None for those not built yet"""
+    return {service._name: service._build_ms for service in _services}
+
+
+class LazyService:
+    """Stand-in for a service that is only built on first use.
+
+    Attribute access, assignment and len() are forwarded to the service, so
+    routes and other services use the proxy like the real object. Building
+    happens once per process under a lock and is timed. This keeps importing
+    app.py (and so booting a gunicorn worker) free of heavy imports and
+    service set-up that most requests never need.
+    """
+
+    def __init__(self, name, factory):
+        object.__setattr__(self, '_name', name)
+        object.__setattr__(self, '_factory', factory)
+        object.__setattr__(self, '_instance', None)
+        object.__setattr__(self, '_build_ms', None)
+        object.__setattr__(self, '_lock', threading.Lock())
+        _services.append(self)
+
+    def _target(self):
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                instance = self._instance
+                if instance is None:
+                    started = time.perf_counter()
+                    instance = self._factory()
+                    build_ms = round((time.perf_counter() - started) * 1000, 1)
+                    object.__setattr__(self, '_build_ms', build_ms)
+                    object.__setattr__(self, '_instance', instance)
+                    print(f"✅ Initialized {self._name} in {build_ms:.0f}ms")
+        return instance
+
+    def __getattr__(self, name):
+        return getattr(self._target(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._target(), name, value)
+
+    def __len__(self):
+        return len(self._target())
+
+    def __bool__(self):
+        # Truthiness checks (e.g. `scorer or LocalScorer()`) must not build it
+        return True
+
+    def __repr__(self):
+        state = 'built' if self._instance is not None else 'not built'
+        return f'<LazyService {self._name} ({state})>'
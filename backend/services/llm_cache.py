@@ -0,0 +1,133 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class LLMResponseCache:
+    """Persistent SQLite cache for LLM responses with size and age based LRU eviction"""
+
+    def __init__(self, db_path=None, max_entries=None, max_age_seconds=None, enabled=None):
+        self.db_path = db_path or os.getenv('LLM_CACHE_PATH', os.path.join(backend_dir, 'llm_cache.db'))
+        self.max_entries = max_entries or int(os.getenv('LLM_CACHE_MAX_ENTRIES', '5000'))
+        self.max_age_seconds = max_age_seconds or int(os.getenv('LLM_CACHE_MAX_AGE', str(30 * 24 * 60 * 60)))
+        if enabled is None:
+            enabled = os.getenv('LLM_CACHE_DISABLED', '').lower() not in ('1', 'true', 'yes')
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._initialized = False
+        self.counters = {'hits': 0, 'misses': 0, 'bypassed': 0, 'writes': 0, 'evictions': 0}
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        if not self._initialized:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL,
+                    hits INTEGER DEFAULT 0
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache (last_used)')
+            conn.commit()
+            self._initialized = True
+        return conn
+
+    @staticmethod
+    def make_key(*parts):
+        """Hash the parts that determine a response (inputs, model, prompt version)"""
+        return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+    def _count(self, counter):
+        with self._lock:
+            self.counters[counter] += 1
+
+    def get(self, key, bypass=False):
+        """Return the cached JSON value for key, or None on a miss or bypass"""
+        if not self.enabled or bypass:
+            self._count('bypassed')
+            return None
+
+        now = time.time()
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                'SELECT value FROM llm_cache WHERE key = ? AND created_at >= ?',
+                (key, now - self.max_age_seconds)
+            ).fetchone()
+            if row:
+                conn.execute(
+                    'UPDATE llm_cache SET last_used = ?, hits = hits + 1 WHERE key = ?',
+                    (now, key)
+                )
+                conn.commit()
+            conn.close()
+        except sqlite3.Error as e:
+            print(f"⚠️  LLM cache read failed: {e}")
+            row = None
+
+        if row:
+            self._count('hits')
+            return json.loads(row[0])
+        self._count('misses')
+        return None
+
+    def put(self, key, value):
+        """Store a JSON-serializable value and evict expired / least recently used entries"""
+        if not self.enabled:
+            return
+
+        now = time.time()
+        try:
+            conn = self._connect()
+            conn.execute('''
+                INSERT OR REPLACE INTO llm_cache (key, value, created_at, last_used, hits)
+                VALUES (?, ?, ?, ?, 0)
+            ''', (key, json.dumps(value), now, now))
+            evicted = conn.execute(
+                'DELETE FROM llm_cache WHERE created_at < ?', (now - self.max_age_seconds,)
+            ).rowcount
+            evicted += conn.execute('''
+                DELETE FROM llm_cache WHERE key IN (
+                    SELECT key FROM llm_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )
+            ''', (self.max_entries,)).rowcount
+            conn.commit()
+            conn.close()
+        except sqlite3.Error as e:
+            print(f"⚠️  LLM cache write failed: {e}")
+            return
+
+        with self._lock:
+            self.counters['writes'] += 1
+            self.counters['evictions'] += evicted
+
+    def stats(self):
+        """Hit/miss counters for this process plus the current cache size"""
+        entries = 0
+        if self.enabled:
+            try:
+                conn = self._connect()
+                entries = conn.execute('SELECT COUNT(*) FROM llm_cache').fetchone()[0]
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+        with self._lock:
+            counters = dict(self.counters)
+        lookups = counters['hits'] + counters['misses']
+        counters.update({
+            'enabled': self.enabled,
+            'entries': entries,
+            'max_entries': self.max_entries,
+            'max_age_seconds': self.max_age_seconds,
+            'hit_rate': round(counters['hits'] / lookups, 4) if lookups else 0
+        })
+        return counters
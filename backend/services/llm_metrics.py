@@ -0,0 +1,121 @@
+import os
+import json
+import time
+import threading
+from collections import deque
+
+COUNTERS = (
+    'calls', 'errors', 'rate_limited', 'retries', 'circuit_open', 'hedged', 'prompt_tokens',
+    'response_tokens', 'cache_hits', 'cache_misses', 'json_fallbacks', 'local_fallbacks'
+)
+
+
+def _percentile(values, pct):
+    if not values:
+        return None
+    return round(values[min(len(values) - 1, int(len(values) * pct / 100.0))], 3)
+
+
+class LLMMetrics:
+    """In-memory metrics for LLM calls, per endpoint.
+
+    Counters accumulate since the process started. Individual calls are kept
+    for the last `window_seconds` to report rates, latency percentiles and
+    the slowest prompts. Set LLM_METRICS_LOG=true to also print one JSON line
+    per call. For streamed calls the latency is the time until the stream
+    opened, and their tokens only count towards the totals.
+    """
+
+    def __init__(self, window_seconds=None, slowest=10):
+        self.window_seconds = window_seconds or float(os.getenv('LLM_METRICS_WINDOW', '300'))
+        self.slowest = slowest
+        self.log_calls = os.getenv('LLM_METRICS_LOG', '').lower() in ('1', 'true', 'yes')
+        self.started_at = time.time()
+        self._totals = {}
+        self._calls = deque()
+        self._lock = threading.Lock()
+
+    def _counters(self, endpoint):
+        if endpoint not in self._totals:
+            self._totals[endpoint] = dict.fromkeys(COUNTERS, 0)
+        return self._totals[endpoint]
+
+    def _trim(self, now):
+        while self._calls and now - self._calls[0]['at'] > self.window_seconds:
+            self._calls.popleft()
+
+    def increment(self, endpoint, counter, amount=1):
+        with self._lock:
+            self._counters(endpoint)[counter] += amount
+
+    def add_tokens(self, endpoint, usage):
+        """Count tokens from a response's usage_metadata (e.g. after a stream finished)"""
+        if usage is None:
+            return
+        with self._lock:
+            counters = self._counters(endpoint)
+            counters['prompt_tokens'] += getattr(usage, 'prompt_token_count', 0) or 0
+            counters['response_tokens'] += getattr(usage, 'candidates_token_count', 0) or 0
+
+    def record_call(self, endpoint, model, outcome, latency, attempts=1, rate_limited=0,
+                    usage=None, prompt_chars=0):
+        """Record one logical call: `attempts` provider requests ending in `outcome`"""
+        prompt_tokens = getattr(usage, 'prompt_token_count', None) if usage else None
+        response_tokens = getattr(usage, 'candidates_token_count', None) if usage else None
+        call = {
+            'at': time.time(), 'endpoint': endpoint, 'model': model, 'outcome': outcome,
+            'latency': round(latency, 3), 'attempts': attempts, 'rate_limited': rate_limited,
+            'prompt_tokens': prompt_tokens, 'response_tokens': response_tokens, 'prompt_chars': prompt_chars
+        }
+        with self._lock:
+            counters = self._counters(endpoint)
+            counters['calls'] += 1
+            counters['retries'] += max(attempts - 1, 0)
+            counters['rate_limited'] += rate_limited
+            counters['prompt_tokens'] += prompt_tokens or 0
+            counters['response_tokens'] += response_tokens or 0
+            if outcome == 'circuit_open':
+                counters['circuit_open'] += 1
+            elif outcome != 'ok':
+                counters['errors'] += 1
+            self._calls.append(call)
+            self._trim(call['at'])
+        if self.log_calls:
+            print(f"📊 llm_call {json.dumps(call)}")
+
+    def summary(self):
+        """Totals since start plus rates, latency percentiles and slowest calls over the window"""
+        now = time.time()
+        with self._lock:
+            self._trim(now)
+            totals = {endpoint: dict(counters) for endpoint, counters in self._totals.items()}
+            calls = list(self._calls)
+
+        # Do not extrapolate rates from the first few seconds after start
+        minutes = max(min(self.window_seconds, now - self.started_at), 60.0) / 60.0
+        window = {}
+        for endpoint in sorted({call['endpoint'] for call in calls}):
+            endpoint_calls = [call for call in calls if call['endpoint'] == endpoint]
+            latencies = sorted(call['latency'] for call in endpoint_calls if call['outcome'] == 'ok')
+            tokens = sum((call['prompt_tokens'] or 0) + (call['response_tokens'] or 0) for call in endpoint_calls)
+            window[endpoint] = {
+                'calls': len(endpoint_calls),
+                'errors': sum(1 for call in endpoint_calls if call['outcome'] not in ('ok', 'circuit_open')),
+                'rate_limited': sum(call['rate_limited'] for call in endpoint_calls),
+                'requests_per_minute': round(sum(call['attempts'] for call in endpoint_calls) / minutes, 2),
+                'tokens_per_minute': round(tokens / minutes, 1),
+                'latency_p50': _percentile(latencies, 50),
+                'latency_p95': _percentile(latencies, 95),
+                'latency_p99': _percentile(latencies, 99),
+                'latency_max': latencies[-1] if latencies else None
+            }
+
+        slowest = sorted((call for call in calls if call['outcome'] == 'ok'),
+                         key=lambda call: -call['latency'])[:self.slowest]
+        return {
+            'uptime_seconds': round(now - self.started_at),
+            'window_seconds': self.window_seconds,
+            'totals': totals,
+            'window': window,
+            'slowest_calls': [{key: value for key, value in call.items() if key != 'at'} for call in slowest]
+        }
@@ -0,0 +1,240 @@
+import os
+import re
+import json
+import math
+import time
+import random
+import hashlib
+import threading
+
+# Only the resume analysis prompt asks for this; chat prompts embed analysis JSON too
+ANALYSIS_MARKER = 'provide analysis in the following JSON structure'
+SKILL_CANDIDATES = [
+    'Python', 'Java', 'JavaScript', 'TypeScript', 'React', 'Node.js', 'SQL', 'AWS', 'Docker',
+    'Kubernetes', 'Flask', 'Django', 'Go', 'C++', 'Machine Learning', 'Communication', 'Leadership'
+]
+CATEGORIES = [(80, 'Highly Qualified'), (60, 'Qualified'), (0, 'Not a Fit')]
+LEVELS = [(8, 'Expert'), (5, 'Senior'), (2, 'Mid-level'), (0, 'Junior')]
+
+
+class GoogleProvider:
+    """google.generativeai behind the small interface GeminiService uses"""
+
+    name = 'google'
+    requires_api_key = True
+
+    def __init__(self):
+        self._genai = None
+        self._api_key = None
+        self._lock = threading.Lock()
+
+    @property
+    def genai(self):
+        # The SDK takes seconds to import, so it is loaded on the first AI call
+        if self._genai is None:
+            with self._lock:
+                if self._genai is None:
+                    import google.generativeai as genai
+                    if self._api_key:
+                        genai.configure(api_key=self._api_key)
+                    self._genai = genai
+        return self._genai
+
+    def configure(self, api_key):
+        self._api_key = api_key
+        if self._genai is not None:
+            self._genai.configure(api_key=api_key)
+
+    def list_models(self):
+        """Names of the models that support generateContent"""
+        return [m.name for m in self.genai.list_models()
+                if 'generateContent' in m.supported_generation_methods]
+
+    def model(self, name):
+        return self.genai.GenerativeModel(name)
+
+    def generation_config(self, **kwargs):
+        return self.genai.types.GenerationConfig(**kwargs)
+
+
+class FakeProviderError(Exception):
+    """Injected provider failure; `code` is read by GeminiClient.status_code"""
+
+    def __init__(self, code, message):
+        super().__init__(f"{code} {message}")
+        self.code = code
+
+
+class _Usage:
+    def __init__(self, prompt, text):
+        self.prompt_token_count = len(prompt) // 4 + 1
+        self.candidates_token_count = len(text) // 4 + 1
+        self.total_token_count = self.prompt_token_count + self.candidates_token_count
+
+
+class _Response:
+    """Mimics the SDK response: .text and .usage_metadata"""
+
+    def __init__(self, prompt, text):
+        self.text = text
+        self.usage_metadata = _Usage(prompt, text)
+
+
+class _StreamResponse:
+    """Iterable of chunks, each with .text, like generate_content(stream=True)"""
+
+    def __init__(self, prompt, text, first_delay, chunk_delay, chunk_words=8, cut=False):
+        words = text.split(' ')
+        self._chunks = [' '.join(words[i:i + chunk_words]) + (' ' if i + chunk_words < len(words) else '')
+                        for i in range(0, len(words), chunk_words)]
+        self._first_delay = first_delay
+        self._chunk_delay = chunk_delay
+        # A cut stream fails with a 5xx after about half of its chunks
+        self._cut_at = max(1, len(self._chunks) // 2) if cut else None
+        self.usage_metadata = _Usage(prompt, text)
+
+    def __iter__(self):
+        time.sleep(self._first_delay)
+        for i, chunk in enumerate(self._chunks):
+            if i:
+                time.sleep(self._chunk_delay)
+            if i == self._cut_at:
+                raise FakeProviderError(503, "The stream was interrupted.")
+            yield _Response('', chunk)
+
+
+class FakeModel:
+    """Stand-in for GenerativeModel with injected latency and failures.
+
+    Latency is log-normal around `latency_ms` (median). Each call fails with
+    a 429 or a 5xx at the configured rates; analysis prompts can also get a
+    truncated, unparseable JSON body, and streams can fail with a 5xx after
+    part of the answer was sent. Response content is derived from a hash
+    of the prompt, so identical prompts get identical answers.
+    """
+
+    def __init__(self, name, latency_ms, latency_sigma, rate_429, rate_5xx, rate_malformed,
+                 stream_chunk_ms, rng, rate_stream_cut=0):
+        self.model_name = name
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.rate_429 = rate_429
+        self.rate_5xx = rate_5xx
+        self.rate_malformed = rate_malformed
+        self.stream_chunk_ms = stream_chunk_ms
+        self.rate_stream_cut = rate_stream_cut
+        self._rng = rng
+        self._rng_lock = threading.Lock()
+
+    def _draw(self):
+        with self._rng_lock:
+            latency = self.latency_ms * math.exp(self._rng.gauss(0, self.latency_sigma)) / 1000.0
+            return latency, self._rng.random(), self._rng.random(), self._rng.random()
+
+    @staticmethod
+    def _analysis(prompt, seed):
+        rng = random.Random(seed)
+        resume = prompt.split('Resume Text:', 1)[-1].split('Job Description', 1)[0].lower()
+        skills = [skill for skill in SKILL_CANDIDATES if skill.lower() in resume][:8]
+        if not skills:
+            skills = rng.sample(SKILL_CANDIDATES, 4)
+        score = rng.randint(35, 95)
+        years = rng.randint(0, 12)
+        return {
+            "overall_score": score,
+            "category": next(label for floor, label in CATEGORIES if score >= floor),
+            "summary": f"Candidate with {years} years of experience in {', '.join(skills[:3])}.",
+            "strengths": [f"Hands-on {skill} experience" for skill in skills[:3]],
+            "weaknesses": ["Limited evidence of large-scale system ownership"],
+            "skills_match": max(0, min(100, score + rng.randint(-10, 10))),
+            "experience_level": next(label for floor, label in LEVELS if years >= floor),
+            "experience_years": years,
+            "key_skills": skills,
+            "education": "Bachelor's degree",
+            "recommendations": ["Proceed to technical interview" if score >= 60 else "Keep on file"],
+            "red_flags": [],
+            "contact_info": {"name": "Candidate", "email": "", "phone": ""}
+        }
+
+    @staticmethod
+    def _chat(prompt, seed):
+        rng = random.Random(seed)
+        question = re.findall(r'User (?:Q|q)uestion: (.*)', prompt)
+        topic = question[-1].strip() if question else 'your request'
+        points = rng.sample([
+            "Relevant experience matches the core requirements of the role.",
+            "Technical depth looks solid based on the listed projects.",
+            "Consider probing system design and ownership in the interview.",
+            "Communication skills appear strong from the summary.",
+            "Compensation expectations and notice period are not stated.",
+            "Recent roles show steady progression in responsibility."
+        ], 3)
+        return f"**Regarding:** {topic}\n\n" + "\n".join(f"- {point}" for point in points)
+
+    def generate_content(self, prompt, generation_config=None, stream=False, **kwargs):
+        latency, error_roll, malformed_roll, cut_roll = self._draw()
+        if error_roll < self.rate_429:
+            # Quota errors come back quickly
+            time.sleep(min(latency, 0.05))
+            raise FakeProviderError(429, "Resource has been exhausted (e.g. check quota).")
+        if error_roll < self.rate_429 + self.rate_5xx:
+            time.sleep(latency)
+            raise FakeProviderError(503, "The service is currently unavailable.")
+
+        seed = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+        if ANALYSIS_MARKER in prompt:
+            text = json.dumps(self._analysis(prompt, seed))
+            if malformed_roll < self.rate_malformed:
+                text = text[:len(text) // 2]
+        else:
+            text = self._chat(prompt, seed)
+
+        if stream:
+            return _StreamResponse(prompt, text, latency * 0.3, self.stream_chunk_ms / 1000.0,
+                                   cut=cut_roll < self.rate_stream_cut)
+        time.sleep(latency)
+        return _Response(prompt, text)
+
+
+class FakeProvider:
+    """Offline provider for load tests, configured with FAKE_LLM_* variables"""
+
+    name = 'fake'
+    requires_api_key = False
+
+    def __init__(self, latency_ms=None, latency_sigma=None, rate_429=None, rate_5xx=None,
+                 rate_malformed=None, stream_chunk_ms=None, rate_stream_cut=None, seed=None):
+        self.latency_ms = latency_ms if latency_ms is not None else float(os.getenv('FAKE_LLM_LATENCY_MS', '800'))
+        self.latency_sigma = latency_sigma if latency_sigma is not None else float(os.getenv('FAKE_LLM_LATENCY_SIGMA', '0.5'))
+        self.rate_429 = rate_429 if rate_429 is not None else float(os.getenv('FAKE_LLM_429_RATE', '0'))
+        self.rate_5xx = rate_5xx if rate_5xx is not None else float(os.getenv('FAKE_LLM_5XX_RATE', '0'))
+        self.rate_malformed = rate_malformed if rate_malformed is not None else float(os.getenv('FAKE_LLM_MALFORMED_RATE', '0'))
+        self.stream_chunk_ms = stream_chunk_ms if stream_chunk_ms is not None else float(os.getenv('FAKE_LLM_STREAM_CHUNK_MS', '40'))
+        self.rate_stream_cut = rate_stream_cut if rate_stream_cut is not None else float(os.getenv('FAKE_LLM_STREAM_CUT_RATE', '0'))
+        seed = seed if seed is not None else (os.getenv('FAKE_LLM_SEED') or None)
+        self._rng = random.Random(seed)
+
+    def configure(self, api_key):
+        pass
+
+    def list_models(self):
+        return ['models/fake-gemini']
+
+    def model(self, name):
+        return FakeModel(name, self.latency_ms, self.latency_sigma, self.rate_429, self.rate_5xx,
+                         self.rate_malformed, self.stream_chunk_ms, self._rng, self.rate_stream_cut)
+
+    def generation_config(self, **kwargs):
+        return kwargs
+
+
+PROVIDERS = {'google': GoogleProvider, 'fake': FakeProvider}
+
+
+def get_provider(name=None):
+    """Provider selected by LLM_PROVIDER (google by default)"""
+    name = (name or os.getenv('LLM_PROVIDER', 'google')).lower()
+    if name not in PROVIDERS:
+        print(f"⚠️  Unknown LLM_PROVIDER '{name}', using google")
+        name = 'google'
+    return PROVIDERS[name]()
@@ -0,0 +1,246 @@
+import re
+import threading
+
+import numpy as np
+
+from services.resume_parser import ResumeParser
+
+# BM25 term saturation and length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Component weights of the overall score
+WEIGHTS = {'skills': 0.5, 'experience': 0.3, 'keywords': 0.2}
+OPTIONAL_SKILL_WEIGHT = 0.5
+
+# Without a JD, this many average-rarity skills count as a full skills match
+BREADTH_SKILLS = 12
+
+# Years of experience implied by a seniority level when the JD gives no number
+SENIORITY_YEARS = {'Junior': 0, 'Mid-level': 3, 'Senior': 5, 'Expert': 8}
+
+KEYWORD_PATTERN = re.compile(r'[a-z][a-z0-9+#]{2,}')
+STOPWORDS = {
+    'the', 'and', 'for', 'with', 'you', 'your', 'our', 'are', 'will', 'who', 'have', 'has',
+    'this', 'that', 'from', 'all', 'any', 'can', 'able', 'not', 'but', 'their', 'they',
+    'work', 'working', 'team', 'teams', 'role', 'job', 'years', 'year', 'experience',
+    'strong', 'good', 'great', 'excellent', 'knowledge', 'skills', 'skill', 'ability',
+    'including', 'such', 'etc', 'plus', 'well', 'using', 'use', 'new', 'join', 'looking',
+    'must', 'should', 'required', 'requirements', 'preferred', 'nice', 'responsibilities'
+}
+
+
+class LocalScorer:
+    """Deterministic resume/JD scoring without an LLM.
+
+    Skills are counted over the parser taxonomy and weighted with BM25: term
+    frequency is saturated and length-normalized against the stored resumes,
+    and rare skills weigh more (IDF). Corpus statistics are updated
+    incrementally from new candidate rows whenever the data version moves.
+    """
+
+    def __init__(self, resume_parser=None, db_manager=None):
+        self.resume_parser = resume_parser or ResumeParser()
+        self.db_manager = db_manager
+
+        self.skills = list(dict.fromkeys(self.resume_parser.technical_skills))
+        self.skill_index = {skill: i for i, skill in enumerate(self.skills)}
+
+        self._lock = threading.Lock()
+        self._version = None
+        self._last_id = 0
+        self._doc_freq = np.zeros(len(self.skills), dtype=np.int32)
+        self._n_docs = 0
+        self._total_length = 0
+
+    @staticmethod
+    def _length(text):
+        return len(KEYWORD_PATTERN.findall((text or '').lower())) or 1
+
+    def skill_vector(self, text):
+        """Raw term frequencies over the skill taxonomy"""
+        vector = np.zeros(len(self.skills), dtype=np.float32)
+        for skill, count in self.resume_parser.count_skills(text).items():
+            vector[self.skill_index[skill]] = count
+        return vector
+
+    def _corpus(self):
+        """Return (idf, avg_length), folding in candidates stored since the last call"""
+        if self.db_manager is not None:
+            version = self.db_manager.get_data_version()
+            with self._lock:
+                if version != self._version:
+                    for row_id, text in self.db_manager.get_resume_texts(self._last_id):
+                        self._doc_freq += self.skill_vector(text) > 0
+                        self._n_docs += 1
+                        self._total_length += self._length(text)
+                        self._last_id = row_id
+                    self._version = version
+
+        with self._lock:
+            n_docs = self._n_docs
+            doc_freq = self._doc_freq.astype(np.float32)
+            avg_length = self._total_length / n_docs if n_docs else None
+        # BM25 idf, always positive; with an empty corpus every skill weighs log(2)
+        idf = np.log1p((n_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+        return idf, avg_length
+
+    def _saturate(self, tf, length, avg_length):
+        """BM25 tf component scaled to [0, 1)"""
+        norm = 1 - BM25_B + BM25_B * (length / avg_length) if avg_length else 1.0
+        return tf / (tf + BM25_K1 * norm)
+
+    def _requirements(self, job_description, job_profile):
+        """Return (required, optional, min_years) for the JD"""
+        if job_profile is not None:
+            min_years = job_profile.min_years
+            if min_years is None:
+                min_years = SENIORITY_YEARS.get(job_profile.seniority)
+            return job_profile.required_skills, job_profile.optional_skills, min_years
+        if job_description and job_description.strip():
+            return self.resume_parser.extract_skills(job_description), [], None
+        return [], [], None
+
+    def _keyword_coverage(self, resume_text, job_text):
+        """Share of distinct JD keywords that also appear in the resume"""
+        jd_terms = set(KEYWORD_PATTERN.findall((job_text or '').lower())) - STOPWORDS
+        if not jd_terms:
+            return None
+        resume_terms = set(KEYWORD_PATTERN.findall((resume_text or '').lower()))
+        return len(jd_terms & resume_terms) / len(jd_terms)
+
+    @staticmethod
+    def _experience_fit(years, min_years):
+        if min_years:
+            return min(1.0, years / min_years)
+        # No stated requirement: reward experience with diminishing returns
+        return min(1.0, 0.4 + years / 10)
+
+    def score(self, resume_text, job_description='', job_profile=None):
+        """Component scores in [0, 1] plus matched and missing skills"""
+        idf, avg_length = self._corpus()
+        tf = self.skill_vector(resume_text)
+        saturated = self._saturate(tf, self._length(resume_text), avg_length)
+
+        required, optional, min_years = self._requirements(job_description, job_profile)
+        weights = np.zeros(len(self.skills), dtype=np.float32)
+        for skill in required:
+            weights[self.skill_index[skill]] = 1.0
+        for skill in optional:
+            weights[self.skill_index[skill]] = max(weights[self.skill_index[skill]], OPTIONAL_SKILL_WEIGHT)
+
+        if weights.any():
+            weights *= idf
+            # Half credit for any mention, the rest as mentions accumulate
+            credit = np.where(tf > 0, 0.5 + saturated, 0.0)
+            skills_match = float(np.dot(weights, np.minimum(credit, 1.0)) / weights.sum())
+        else:
+            # No JD skills to match against: idf-weighted breadth of the resume
+            skills_match = min(1.0, float(np.dot(idf, tf > 0)) / (float(idf.mean()) * BREADTH_SKILLS))
+
+        years = self.resume_parser.extract_experience_years(resume_text)
+        job_text = job_profile.compact_text if job_profile is not None else job_description
+        keywords = self._keyword_coverage(resume_text, job_text)
+
+        components = {'skills': skills_match, 'experience': self._experience_fit(years, min_years)}
+        if keywords is not None:
+            components['keywords'] = keywords
+        total_weight = sum(WEIGHTS[name] for name in components)
+        overall = sum(WEIGHTS[name] * value for name, value in components.items()) / total_weight
+
+        # Resume skills, most distinctive first (stable on taxonomy order)
+        present = np.flatnonzero(tf)
+        order = np.argsort(-(idf * saturated)[present], kind='stable')
+        ranked_skills = [self.skills[i] for i in present[order]]
+        have = set(ranked_skills)
+        return {
+            'overall': overall,
+            'skills_match': skills_match,
+            'experience_fit': components['experience'],
+            'keyword_coverage': keywords,
+            'experience_years': years,
+            'min_years': min_years,
+            'resume_skills': ranked_skills,
+            'matched_skills': [s for s in required if s in have],
+            'missing_skills': [s for s in required if s not in have],
+            'matched_optional': [s for s in optional if s in have]
+        }
+
+    @staticmethod
+    def _category(score):
+        if score >= 75:
+            return 'Highly Qualified'
+        if score >= 50:
+            return 'Qualified'
+        return 'Not a Fit'
+
+    @staticmethod
+    def _experience_level(years):
+        if years < 2:
+            return 'Junior'
+        if years < 5:
+            return 'Mid-level'
+        if years < 10:
+            return 'Senior'
+        return 'Expert'
+
+    def analyze(self, resume_text, job_description='', job_profile=None):
+        """Analysis in the same schema as GeminiService.analyze_resume"""
+        result = self.score(resume_text, job_description, job_profile)
+        overall_score = int(round(result['overall'] * 100))
+        skills_match = int(round(result['skills_match'] * 100))
+        years = result['experience_years']
+        matched, missing = result['matched_skills'], result['missing_skills']
+
+        strengths = []
+        if matched:
+            strengths.append(f"Matches {len(matched)} of {len(matched) + len(missing)} required skills: {', '.join(matched[:8])}")
+        elif result['resume_skills']:
+            strengths.append(f"Skills: {', '.join(result['resume_skills'][:8])}")
+        if result['matched_optional']:
+            strengths.append(f"Nice-to-have skills: {', '.join(result['matched_optional'][:5])}")
+        if result['min_years'] and years >= result['min_years']:
+            strengths.append(f"{years} years of experience meets the {result['min_years']}+ year requirement")
+
+        weaknesses = []
+        if missing:
+            weaknesses.append(f"Missing required skills: {', '.join(missing[:8])}")
+        if result['min_years'] and years < result['min_years']:
+            weaknesses.append(f"{years} years of experience, {result['min_years']}+ required")
+        if result['keyword_coverage'] is not None and result['keyword_coverage'] < 0.3:
+            weaknesses.append("Low overlap with the job description wording")
+
+        recommendations = [f"Probe {skill} experience in interview" for skill in missing[:3]]
+        recommendations.append("Scored locally; re-run when the AI service is available for a detailed review")
+
+        contact = self.resume_parser.extract_contact_info(resume_text)
+        education = self.resume_parser.extract_education(resume_text)
+
+        return {
+            "overall_score": overall_score,
+            "category": self._category(overall_score),
+            "summary": (f"Scored locally: {self._experience_level(years)} candidate with {years} years of experience, "
+                        f"{skills_match}% skills match."),
+            "strengths": strengths,
+            "weaknesses": weaknesses,
+            "skills_match": skills_match,
+            "experience_level": self._experience_level(years),
+            "experience_years": years,
+            "key_skills": result['resume_skills'][:10],
+            "education": education[0],
+            "recommendations": recommendations,
+            "red_flags": [],
+            "contact_info": {
+                "name": contact.get('name') or 'Candidate Name',
+                "email": contact.get('email') or 'Email not found',
+                "phone": contact.get('phone') or 'Phone not found'
+            },
+            "analysis_source": "local",
+            "local_scores": {
+                "skills_match": round(result['skills_match'], 4),
+                "experience_fit": round(result['experience_fit'], 4),
+                "keyword_coverage": round(result['keyword_coverage'], 4) if result['keyword_coverage'] is not None else None,
+                "matched_skills": matched,
+                "missing_skills": missing
+            }
+        }
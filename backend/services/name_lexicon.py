@@ -0,0 +1,123 @@
+import os
+import mmap
+import struct
+import hashlib
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_LEXICON_PATH = os.path.join(backend_dir, 'data', 'names.tsv')
+
+
+class NameLexicon:
+    """Memory-mapped, sorted given-name dictionary.
+
+    The TSV source (``name<TAB>m|f|u``) is compiled once into a binary index
+    next to it: a header, an offsets table and the sorted name records. The
+    index is opened with mmap, so loading costs a few syscalls and every worker
+    process shares the same pages. Lookups are a binary search over the mmap.
+    """
+
+    MAGIC = b'NLX1'
+    HEADER = struct.Struct('<4sI')
+    OFFSET = struct.Struct('<I')
+
+    def __init__(self, buffer):
+        self._buffer = buffer
+        magic, self.count = self.HEADER.unpack_from(buffer, 0)
+        if magic != self.MAGIC:
+            raise ValueError("Not a name lexicon index")
+        self._offsets_start = self.HEADER.size
+
+    @classmethod
+    def load(cls, source_path=None):
+        """Open the index for a TSV source, (re)building it if it is stale"""
+        source_path = source_path or os.getenv('NAME_LEXICON_PATH', DEFAULT_LEXICON_PATH)
+        index_path = source_path + '.idx'
+
+        if not os.path.exists(source_path):
+            print(f"⚠️  Name lexicon not found at {source_path}, name detection disabled")
+            return cls(cls.compile([]))
+
+        try:
+            if (not os.path.exists(index_path) or
+                    os.path.getmtime(index_path) < os.path.getmtime(source_path)):
+                cls.build(source_path, index_path)
+            with open(index_path, 'rb') as f:
+                return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        except OSError as e:
+            # Read-only deployments: keep the compiled index in process memory
+            print(f"⚠️  Could not map name lexicon index ({e}), loading into memory")
+            return cls(cls.compile(cls.read_source(source_path)))
+
+    @staticmethod
+    def read_source(source_path):
+        """Read (name, tag) pairs from a TSV source, merging conflicting tags to 'u'"""
+        entries = {}
+        with open(source_path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                name, _, tag = line.partition('\t')
+                name = name.strip().lower()
+                tag = (tag.strip().lower() or 'u')[0]
+                if not name:
+                    continue
+                if name in entries and entries[name] != tag:
+                    tag = 'u'
+                entries[name] = tag
+        return entries.items()
+
+    @classmethod
+    def compile(cls, entries):
+        """Serialize (name, tag) pairs into the binary index format"""
+        records = sorted((name.encode('utf-8'), tag.encode('ascii')) for name, tag in entries)
+        offsets = []
+        blob = bytearray()
+        for name, tag in records:
+            offsets.append(len(blob))
+            blob += name + tag
+        offsets.append(len(blob))
+
+        data_start = cls.HEADER.size + cls.OFFSET.size * len(offsets)
+        out = bytearray(cls.HEADER.pack(cls.MAGIC, len(records)))
+        for offset in offsets:
+            out += cls.OFFSET.pack(data_start + offset)
+        out += blob
+        return bytes(out)
+
+    @classmethod
+    def build(cls, source_path, index_path):
+        """Compile a TSV source to an index file, replacing it atomically"""
+        tmp_path = f"{index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(cls.compile(cls.read_source(source_path)))
+        os.replace(tmp_path, index_path)
+
+    def _offset(self, i):
+        return self.OFFSET.unpack_from(self._buffer, self._offsets_start + i * self.OFFSET.size)[0]
+
+    def lookup(self, token):
+        """Return 'm', 'f' or 'u' for a known given name, otherwise None"""
+        key = token.lower().encode('utf-8')
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start, end = self._offset(mid), self._offset(mid + 1)
+            name = self._buffer[start:end - 1]
+            if name < key:
+                lo = mid + 1
+            elif name > key:
+                hi = mid
+            else:
+                return chr(self._buffer[end - 1])
+        return None
+
+    def digest(self):
+        """Content hash of the compiled index, used to version cached results"""
+        return hashlib.sha256(self._buffer).digest()
+
+    def __contains__(self, token):
+        return self.lookup(token) is not None
+
+    def __len__(self):
+        return self.count
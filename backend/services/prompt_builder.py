@@ -0,0 +1,166 @@
+import os
+import re
+
+# Lower number = more valuable; sections are packed into the budget in this order
+RESUME_SECTION_PRIORITIES = {
+    'experience': 1, 'work experience': 1, 'professional experience': 1, 'employment': 1,
+    'employment history': 1, 'work history': 1, 'career history': 1,
+    'skills': 2, 'technical skills': 2, 'core competencies': 2, 'technologies': 2,
+    'education': 3, 'academic background': 3, 'qualifications': 3,
+    'projects': 4, 'key projects': 4,
+    'summary': 5, 'professional summary': 5, 'profile': 5, 'objective': 5, 'about me': 5,
+    'certifications': 6, 'certificates': 6, 'licenses': 6, 'achievements': 6, 'awards': 6,
+    'publications': 7, 'languages': 7, 'volunteer': 8, 'volunteering': 8,
+    'interests': 9, 'hobbies': 9, 'references': 9, 'personal details': 9, 'declaration': 9
+}
+
+JD_SECTION_PRIORITIES = {
+    'requirements': 1, 'qualifications': 1, 'required skills': 1, 'must have': 1,
+    'what you bring': 1, 'skills': 1,
+    'responsibilities': 2, 'what you will do': 2, 'role': 2, 'duties': 2,
+    'nice to have': 3, 'preferred qualifications': 3, 'bonus': 3,
+    'about the role': 4, 'summary': 4,
+    'about us': 8, 'about the company': 8, 'company': 8,
+    'benefits': 9, 'perks': 9, 'what we offer': 9, 'equal opportunity': 9, 'how to apply': 9
+}
+
+# Lines that carry no signal for scoring
+BOILERPLATE_PATTERNS = [
+    r'^references? (?:are )?available (?:up)?on request\.?$',
+    r'^page \d+(?: of \d+)?$',
+    r'^(?:curriculum vitae|resume|cv)$',
+    r'^i hereby declare\b.*',
+    r'^(?:\[[A-Z\' ]+\][\s|,;/-]*)+$',  # lines left with only blind-resume placeholders
+    r'^.*\bis an equal opportunity employer\b.*$'
+]
+
+# Text before the first heading (headline, contact placeholders) ranks with the summary
+PREAMBLE_PRIORITY = 5
+TRUNCATION_MARKER = '[...]'
+# A line longer than the remaining budget is cut, unless less than this fits
+MIN_PARTIAL_LINE_TOKENS = 8
+
+
+class PromptBuilder:
+    """Compact resume and job description text to a token budget before prompting.
+
+    Whitespace and boilerplate are removed, repeated lines are dropped, and the
+    text is split into sections which are kept in order of value (experience,
+    skills, education, ...) until the budget is spent.
+    """
+
+    TOKEN_PATTERN = re.compile(r'\w+|[^\w\s]')
+
+    def __init__(self, resume_budget=None, jd_budget=None):
+        self.resume_budget = resume_budget or int(os.getenv('RESUME_TOKEN_BUDGET', '2000'))
+        self.jd_budget = jd_budget or int(os.getenv('JD_TOKEN_BUDGET', '800'))
+        self._boilerplate = re.compile('|'.join(BOILERPLATE_PATTERNS), re.IGNORECASE)
+
+    def count_tokens(self, text):
+        """Approximate LLM token count (words and punctuation marks)"""
+        return len(self.TOKEN_PATTERN.findall(text or ''))
+
+    def _truncate(self, line, max_tokens):
+        """The start of a line holding at most max_tokens tokens"""
+        end = 0
+        for i, match in enumerate(self.TOKEN_PATTERN.finditer(line)):
+            if i == max_tokens:
+                break
+            end = match.end()
+        return line[:end].rstrip()
+
+    def _clean_lines(self, text):
+        seen = set()
+        lines = []
+        for line in (text or '').split('\n'):
+            line = re.sub(r'\s+', ' ', line).strip()
+            if not line or self._boilerplate.match(line):
+                continue
+            key = line.lower()
+            if key in seen:
+                continue
+            seen.add(key)
+            lines.append(line)
+        return lines
+
+    @staticmethod
+    def _heading_priority(line, priorities):
+        """Return the section priority if the line is a section heading, else None"""
+        if len(line) > 40:
+            return None
+        heading = re.sub(r'[^a-z ]', '', line.lower()).strip()
+        return priorities.get(heading)
+
+    def _split_sections(self, lines, priorities):
+        sections = []
+        current = {'priority': PREAMBLE_PRIORITY, 'heading': False, 'lines': []}
+        for line in lines:
+            priority = self._heading_priority(line, priorities)
+            if priority is not None:
+                if current['lines']:
+                    sections.append(current)
+                current = {'priority': priority, 'heading': True, 'lines': [line]}
+            else:
+                current['lines'].append(line)
+        if current['lines']:
+            sections.append(current)
+        return sections
+
+    def compact(self, text, budget, priorities):
+        """Return (compacted_text, stats) for text under a token budget"""
+        tokens_before = self.count_tokens(text)
+        sections = self._split_sections(self._clean_lines(text), priorities)
+
+        kept = []
+        remaining = budget
+        truncated = False
+        marker_cost = self.count_tokens(TRUNCATION_MARKER)
+        # Stable sort keeps the original order among equally valuable sections
+        for section in sorted(sections, key=lambda s: s['priority']):
+            if remaining <= 0:
+                truncated = True
+                break
+            section_lines = []
+            cut = False
+            for line in section['lines']:
+                cost = self.count_tokens(line)
+                if cost > remaining:
+                    truncated = cut = True
+                    # Keep the start of a long line (e.g. a single-paragraph resume)
+                    # rather than dropping it whole, leaving room for the marker
+                    room = remaining - marker_cost
+                    if room >= MIN_PARTIAL_LINE_TOKENS:
+                        partial = self._truncate(line, room)
+                        section_lines.append(partial)
+                        remaining -= self.count_tokens(partial)
+                    break
+                section_lines.append(line)
+                remaining -= cost
+            # A heading with no content left under it is not worth its tokens
+            if len(section_lines) <= int(section['heading']):
+                remaining += sum(self.count_tokens(line) for line in section_lines)
+                continue
+            # The marker counts against the budget too; it is left out when it does not fit
+            if cut and remaining >= marker_cost:
+                section_lines.append(TRUNCATION_MARKER)
+                remaining -= marker_cost
+            kept.append('\n'.join(section_lines))
+
+        compacted = '\n\n'.join(kept)
+        return compacted, {
+            'tokens_before': tokens_before,
+            'tokens_after': self.count_tokens(compacted),
+            'budget': budget,
+            'sections': len(sections),
+            'sections_kept': len(kept),
+            'truncated': truncated
+        }
+
+    def compact_resume(self, resume_text):
+        return self.compact(resume_text, self.resume_budget, RESUME_SECTION_PRIORITIES)
+
+    def compact_job_description(self, job_description):
+        if not job_description or not job_description.strip():
+            return '', {'tokens_before': 0, 'tokens_after': 0, 'budget': self.jd_budget,
+                        'sections': 0, 'sections_kept': 0, 'truncated': False}
+        return self.compact(job_description, self.jd_budget, JD_SECTION_PRIORITIES)
@@ -0,0 +1,163 @@
+import re
+
+
+class RedactionEngine:
+    """Apply every blind-resume redaction rule in one combined regex pass.
+
+    Each rule is a named alternative of a single compiled pattern. Adding a new
+    PII rule adds one alternative, the text is still scanned exactly once.
+    """
+
+    # Resume headers that look like a name line but are not one
+    HEADER_WORDS = {
+        'resume', 'cv', 'curriculum', 'vitae', 'profile', 'summary', 'objective',
+        'experience', 'education', 'skills', 'contact', 'address', 'phone', 'email'
+    }
+
+    PRONOUN_REPLACEMENTS = {
+        'he': '[CANDIDATE]',
+        'him': '[CANDIDATE]',
+        'she': '[CANDIDATE]',
+        'his': '[CANDIDATE\'S]',
+        'her': '[CANDIDATE\'S]',
+        'hers': '[CANDIDATE\'S]'
+    }
+
+    def __init__(self, personal_identifiers, name_lines=5, name_lexicon=None):
+        self.name_lines = name_lines
+        self.name_lexicon = name_lexicon
+
+        # (rule name, pattern, replacement) in priority order for matches that
+        # start at the same position
+        self.rules = [
+            ('email', personal_identifiers['email'], '[EMAIL REMOVED]'),
+            ('phone', personal_identifiers['phone'], '[PHONE REMOVED]'),
+            ('address', personal_identifiers['address'], '[ADDRESS REMOVED]'),
+            # A whole short line; with CRLF line endings the \r stays outside the match
+            ('name', r'^[ \t]*[A-Za-z]+(?:[ \t]+[A-Za-z]+){0,3}[ \t]*(?=\r?$)', '[CANDIDATE NAME]')
+        ]
+        if name_lexicon is not None:
+            # Capitalized token, confirmed against the lexicon in redact()
+            self.rules.append(('person', r'(?<!\w)[A-ZÀ-ÖØ-Þ][^\W\d_]*(?:-[^\W\d_]+)*(?!\w)', '[NAME REMOVED]'))
+        self.rules.append(('pronoun', r'(?i:\b(?:' + '|'.join(self.PRONOUN_REPLACEMENTS) + r')\b)', None))
+
+        self.rule_names = [name for name, _, _ in self.rules]
+        self.replacements = {name: replacement for name, _, replacement in self.rules}
+        self.pattern = self._combine(self.rules)
+        # Everything but the whole-line name rule, used inside rejected name lines
+        self._inline_pattern = self._combine([rule for rule in self.rules if rule[0] != 'name'])
+        self._surname_pattern = re.compile(r'[ \t]+[A-ZÀ-ÖØ-Þ][^\W\d_]*(?:-[^\W\d_]+)*(?!\w)')
+
+    @staticmethod
+    def _combine(rules):
+        return re.compile(
+            '|'.join(f'(?P<{name}>{pattern})' for name, pattern, _ in rules),
+            re.MULTILINE
+        )
+
+    def _rule_for(self, match):
+        for name in self.rule_names:
+            if name in match.re.groupindex and match.start(name) != -1:
+                return name
+        return None
+
+    def _is_name_line(self, line, header_end, name_found, start):
+        if name_found or start >= header_end:
+            return False
+        stripped = line.strip()
+        if len(stripped) <= 2 or 'http' in stripped.lower():
+            return False
+        return not any(word.lower() in self.HEADER_WORDS for word in stripped.split())
+
+    def _header_end(self, text):
+        """Offset of the end of the first `name_lines` lines"""
+        end = -1
+        for _ in range(self.name_lines):
+            end = text.find('\n', end + 1)
+            if end == -1:
+                return len(text)
+        return end
+
+    def redact(self, text):
+        """Return (blind_text, spans) where spans maps every replacement.
+
+        Each span records the rule, the original value, its offsets in the
+        source text and the offsets of its placeholder in the blind text.
+        """
+        if not text:
+            return text, []
+
+        header_end = self._header_end(text)
+        name_found = False
+        parts = []
+        spans = []
+        last = 0
+        out_len = 0
+
+        def emit(rule, start, end, replacement):
+            nonlocal last, out_len
+            parts.append(text[last:start])
+            out_len += start - last
+            parts.append(replacement)
+            spans.append({
+                'type': rule,
+                'original': text[start:end],
+                'replacement': replacement,
+                'start': start,
+                'end': end,
+                'blind_start': out_len,
+                'blind_end': out_len + len(replacement)
+            })
+            out_len += len(replacement)
+            last = end
+
+        def dispatch(match):
+            nonlocal name_found
+            rule = self._rule_for(match)
+            start, end = match.span()
+            if start < last:
+                # Already covered by a multi-token person span
+                return
+
+            if rule == 'name':
+                if self._is_name_line(match.group(0), header_end, name_found, start):
+                    name_found = True
+                    emit(rule, start, end, self.replacements[rule])
+                else:
+                    # Not the candidate's name line: redact what is inside it
+                    for inner in self._inline_pattern.finditer(text, start, end):
+                        dispatch(inner)
+            elif rule == 'person':
+                token = match.group(0)
+                if token.lower() in self.PRONOUN_REPLACEMENTS:
+                    emit('pronoun', start, end, self.PRONOUN_REPLACEMENTS[token.lower()])
+                elif token.lower() in self.name_lexicon:
+                    # Only full-name shapes ('Mary Johnson') are redacted, a lone
+                    # capitalized given name is too often an ordinary word
+                    surname = self._surname_pattern.match(text, end)
+                    if surname:
+                        emit(rule, start, surname.end(), self.replacements[rule])
+            elif rule == 'pronoun':
+                emit(rule, start, end, self.PRONOUN_REPLACEMENTS[match.group(0).lower()])
+            else:
+                emit(rule, start, end, self.replacements[rule])
+
+        for match in self.pattern.finditer(text):
+            dispatch(match)
+
+        parts.append(text[last:])
+        return ''.join(parts), spans
+
+    def contact_info(self, spans):
+        """Recover the candidate's contact details from a redaction span map"""
+        contact_info = {}
+        for span in spans:
+            if span['type'] in ('name', 'email', 'phone') and span['type'] not in contact_info:
+                contact_info[span['type']] = span['original'].strip()
+        # Fall back to the first full name found through the lexicon
+        if 'name' not in contact_info:
+            for span in spans:
+                if span['type'] == 'person':
+                    contact_info['name'] = span['original'].strip()
+                    break
+        return contact_info
@@ -0,0 +1,73 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+
+
+class ResponseCache:
+    """Serialized read responses keyed by the database write counter.
+
+    The ETag of a response is the database id plus the data_version it was
+    built from, so it changes with every candidate write in any process, and
+    a deleted and recreated database (whose counter starts over) never
+    matches old tags. Clients can revalidate with If-None-Match for free. Bodies are kept per request key
+    in a small LRU; an entry built from an older version is rebuilt on the
+    next request. Responses that also depend on the clock (e.g. "uploaded
+    in the last 7 days") pass `ttl` to expire after that many seconds too.
+    """
+
+    def __init__(self, db_manager, max_entries=None, max_bytes=None):
+        self.db_manager = db_manager
+        self.max_entries = max_entries or int(os.getenv('RESPONSE_CACHE_ENTRIES', '256'))
+        self.max_bytes = max_bytes or int(os.getenv('RESPONSE_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+        self.enabled = os.getenv('RESPONSE_CACHE_DISABLED', '').lower() not in ('1', 'true', 'yes')
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def etag(self, ttl=None):
+        """Current ETag value (unquoted) for responses built from the database"""
+        database_id, version = self.db_manager.get_data_state()
+        if ttl:
+            return f'{database_id}-v{version}-t{int(time.time() // ttl)}'
+        return f'{database_id}-v{version}'
+
+    def get(self, key, etag, build):
+        """Body for `key` at `etag`, calling build() -> bytes on a miss.
+
+        build() may return None (e.g. not found), which is not cached.
+        """
+        if self.enabled:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] == etag:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                self.misses += 1
+
+        body = build()
+        if body is None or not self.enabled or len(body) > self.max_bytes:
+            return body
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous[1])
+            self._entries[key] = (etag, body)
+            self._bytes += len(body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+        return body
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses
+            }
@@ -0,0 +1,107 @@
+import os
+import gzip
+import json
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # Falls back to the standard library serializer
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'text/html', 'text/plain', 'text/css', 'application/javascript'}
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes with orjson when it is installed.
+
+    Output matches jsonify for what the routes return, except that keys are
+    not sorted. Types orjson does not know (and datetimes, to keep Flask's
+    HTTP date format) go through Flask's default handler.
+    """
+
+    backend = 'orjson' if orjson else 'json'
+
+    def dumps_bytes(self, obj):
+        """Serialize to UTF-8 bytes without an intermediate str"""
+        if orjson is None:
+            return json.dumps(obj, default=self.default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        return orjson.dumps(
+            obj, default=self.default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME
+        )
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj), mimetype=self.mimetype)
+
+
+class ResponseCompressor:
+    """Negotiate brotli or gzip for response bodies above `min_size` bytes.
+
+    Streamed responses (SSE, NDJSON) and files are left alone. Compressed
+    responses get a weak ETag, like a compressing proxy would do, so
+    conditional requests keep working for every encoding.
+    """
+
+    def __init__(self, min_size=None, gzip_level=None, brotli_quality=None):
+        self.min_size = min_size or int(os.getenv('RESPONSE_COMPRESS_MIN_BYTES', '1024'))
+        self.gzip_level = gzip_level or int(os.getenv('RESPONSE_GZIP_LEVEL', '5'))
+        self.brotli_quality = brotli_quality or int(os.getenv('RESPONSE_BROTLI_QUALITY', '4'))
+        self.enabled = os.getenv('RESPONSE_COMPRESSION_DISABLED', '').lower() not in ('1', 'true', 'yes')
+        self.encodings = (['br'] if brotli else []) + ['gzip']
+
+    def choose(self, accept_encodings, size):
+        """Best encoding the client accepts for a body of `size` bytes, or None"""
+        if not self.enabled or size < self.min_size:
+            return None
+        for encoding in self.encodings:
+            if accept_encodings[encoding] > 0:
+                return encoding
+        return None
+
+    def compress(self, body, encoding):
+        if encoding == 'br':
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    def compressible(self, response):
+        return (
+            response.status_code == 200
+            and not response.direct_passthrough
+            and not response.is_streamed
+            and 'Content-Encoding' not in response.headers
+            and response.mimetype in COMPRESSIBLE_MIMETYPES
+        )
+
+    def finish(self, response, accept_encodings, encoding=None):
+        """Compress a buffered response in place, or mark one already compressed with `encoding`"""
+        if encoding is None:
+            if not self.compressible(response):
+                return response
+            response.vary.add('Accept-Encoding')
+            encoding = self.choose(accept_encodings, response.content_length or 0)
+            if encoding is None:
+                return response
+            response.set_data(self.compress(response.get_data(), encoding))
+        response.vary.add('Accept-Encoding')
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
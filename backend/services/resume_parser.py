@@ -1,5 +1,3 @@
-import PyPDF2
-from docx import Document
 import re
 import os
 from datetime import datetime
@@ -55,6 +53,8 @@ class ResumeParser:
             'school', 'education', 'b.s.', 'm.s.', 'b.a.', 'm.a.', 'mba', 'b.tech', 'm.tech',
             'b.e.', 'm.e.', 'diploma', 'certificate', 'certification', 'course', 'training'
         ]
+        
+        self._skill_aliases, self._skill_pattern = self._build_skill_matcher()
     
     def extract_text(self, file_path):
         """Extract text from PDF or DOCX file"""
@@ -73,6 +73,8 @@ class ResumeParser:
     
     def _extract_from_pdf(self, file_path):
         """Extract text from PDF file"""
+        # Imported on first use to keep app start-up fast
+        import PyPDF2
         text = ""
         try:
             with open(file_path, 'rb') as file:
@@ -85,6 +87,7 @@ class ResumeParser:
     
     def _extract_from_docx(self, file_path):
         """Extract text from DOCX file"""
+        from docx import Document
         try:
             doc = Document(file_path)
             text = ""
@@ -205,6 +208,41 @@ class ResumeParser:
         
         return unique_skills
     
+    def count_skills(self, text):
+        """Count mentions of each taxonomy skill, {skill: occurrences}.
+
+        Matches on word boundaries, unlike extract_skills, for the local
+        scorer and the vector index where 'Go' inside 'good' would skew counts.
+        """
+        counts = {}
+        for match in self._skill_pattern.finditer(text or ''):
+            alias = match.group(0)
+            # Very short aliases ('C', 'R', 'Go', 'AI') only count in their exact case
+            key = alias if len(alias) <= 2 else alias.lower()
+            for skill in self._skill_aliases.get(key, ()):
+                counts[skill] = counts.get(skill, 0) + 1
+        return counts
+    
+    def _build_skill_matcher(self):
+        """Compile every skill and its variations into one word-boundary aware pattern"""
+        aliases = {}
+        for skill in self.technical_skills:
+            for variation in self._get_skill_variations(skill):
+                key = variation if len(variation) <= 2 else variation.lower()
+                owners = aliases.setdefault(key, [])
+                if skill not in owners:
+                    owners.append(skill)
+        
+        long_aliases = sorted((a for a in aliases if len(a) > 2), key=len, reverse=True)
+        short_aliases = sorted((a for a in aliases if len(a) <= 2), key=len, reverse=True)
+        pattern = (
+            r'(?<![A-Za-z0-9])(?:'
+            + '|'.join(f'(?i:{re.escape(a)})' for a in long_aliases)
+            + '|' + '|'.join(re.escape(a) for a in short_aliases)
+            + r')(?![A-Za-z0-9+#])'
+        )
+        return aliases, re.compile(pattern)
+    
     def _get_skill_variations(self, skill):
         """Get common variations of skill names"""
         variations = [skill]
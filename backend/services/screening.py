@@ -0,0 +1,94 @@
+import os
+
+SCREENING_MODES = ('full', 'two_stage')
+
+
+class ScreeningService:
+    """Two-stage screening: resumes are scored locally, only promising ones reach the LLM.
+
+    In two_stage mode a resume is sent to Gemini when its local score is at
+    least `threshold`, or when it ranks in the top `top_k` of the candidates
+    already screened against the same job description. A resume in the final
+    top K was also in the top K when it arrived, so the best candidates always
+    get an LLM review while most of a large applicant pool does not. The rest
+    keep a local-only analysis and can be promoted later.
+    """
+
+    def __init__(self, ai_service, local_scorer, job_profiles, db_manager,
+                 default_mode=None, top_k=None, threshold=None):
+        self.ai_service = ai_service
+        self.local_scorer = local_scorer
+        self.job_profiles = job_profiles
+        self.db_manager = db_manager
+        self.default_mode = default_mode or os.getenv('SCREENING_MODE', 'full')
+        self.top_k = top_k or int(os.getenv('SCREENING_TOP_K', '50'))
+        self.threshold = threshold or float(os.getenv('SCREENING_THRESHOLD', '80'))
+
+    def resolve_mode(self, mode):
+        mode = (mode or self.default_mode).lower()
+        return mode if mode in SCREENING_MODES else self.default_mode
+
+    def screen(self, blind_resume, job_description='', job_profile=None, mode=None, bypass_cache=False):
+        """Return (analysis, local_score) for an anonymized resume.
+
+        In full mode the local score is only known when the LLM path fell back
+        to the local scorer, otherwise it is None.
+        """
+        if self.resolve_mode(mode) == 'full':
+            analysis = self.ai_service.analyze_resume(
+                blind_resume, job_description, bypass_cache=bypass_cache, job_profile=job_profile
+            )
+            local_score = analysis.get('overall_score') if analysis.get('analysis_source') == 'local' else None
+            return analysis, local_score
+
+        local_analysis = self.local_scorer.analyze(blind_resume, job_description, job_profile)
+        local_score = local_analysis['overall_score']
+        jd_hash = job_profile.jd_hash if job_profile else None
+        rank = self.db_manager.count_higher_local_scores(jd_hash, local_score)
+        if local_score >= self.threshold or rank < self.top_k:
+            analysis = self.ai_service.analyze_resume(
+                blind_resume, job_description, bypass_cache=bypass_cache, job_profile=job_profile
+            )
+        else:
+            analysis = local_analysis
+        analysis['screening'] = {'mode': 'two_stage', 'local_score': local_score, 'rank_at_upload': rank + 1}
+        return analysis, local_score
+
+    def promote(self, candidate_id, bypass_cache=False):
+        """Run the LLM analysis for a locally screened candidate, returns the new analysis"""
+        candidate = self.db_manager.get_candidate(candidate_id)
+        if candidate is None:
+            return None
+
+        previous = candidate['analysis']
+        if previous.get('analysis_source') != 'local':
+            return previous
+
+        job_description = candidate.get('job_description') or ''
+        job_profile = self.job_profiles.get_profile(job_description)
+        analysis = self.ai_service.analyze_resume(
+            candidate['blind_resume'] or '', job_description,
+            bypass_cache=bypass_cache, job_profile=job_profile
+        )
+        if analysis.get('analysis_source') == 'local':
+            # The LLM was unavailable; keep the stored analysis
+            return previous
+
+        # Contact details and JD coverage were computed locally from the original resume
+        for key in ('contact_info', 'jd_match', 'screening'):
+            if key in previous:
+                analysis[key] = previous[key]
+        analysis.setdefault('screening', {})['promoted'] = True
+        self.db_manager.update_candidate_analysis(candidate_id, analysis)
+        return analysis
+
+    def promote_top(self, job_description='', top_k=None):
+        """Promote the best local-only candidates for a JD, returns the promoted ids"""
+        job_profile = self.job_profiles.get_profile(job_description)
+        jd_hash = job_profile.jd_hash if job_profile else None
+        promoted = []
+        for candidate_id in self.db_manager.get_local_only_candidate_ids(jd_hash, top_k or self.top_k):
+            analysis = self.promote(candidate_id)
+            if analysis is not None and analysis.get('analysis_source') != 'local':
+                promoted.append(candidate_id)
+        return promoted
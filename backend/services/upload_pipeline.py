@@ -0,0 +1,112 @@
+from datetime import datetime
+
+# Progress stages reported while a resume is processed
+STAGES = ('parsing', 'anonymizing', 'analyzing', 'bias_detection', 'saving', 'done')
+
+
+class UploadPipeline:
+    """Turn a stored resume file into a saved, analyzed candidate.
+
+    Shared by the synchronous /api/upload request and the background upload
+    workers. `progress(stage)` is called before each stage.
+    """
+
+    def __init__(self, resume_parser, bias_detector, bias_rescorer, job_profiles, screening,
+                 db_manager, vector_index):
+        self.resume_parser = resume_parser
+        self.bias_detector = bias_detector
+        self.bias_rescorer = bias_rescorer
+        self.job_profiles = job_profiles
+        self.screening = screening
+        self.db_manager = db_manager
+        self.vector_index = vector_index
+
+    def process(self, file_path, filename, job_description='', screening_mode=None,
+                bypass_cache=False, progress=None):
+        """Returns {'candidate_id', 'analysis', 'bias_analysis'}"""
+        progress = progress or (lambda stage: None)
+
+        # Parse resume
+        progress('parsing')
+        resume_text = self.resume_parser.extract_text(file_path)
+
+        # Anonymize resume before sending to AI; the span map keeps what was
+        # removed so contact info can be restored locally (Privacy First)
+        progress('anonymizing')
+        blind_resume, redactions = self.bias_detector.redact_resume(resume_text)
+        local_contact_info = self.bias_detector.redactor.contact_info(redactions)
+
+        # Job description is parsed once per distinct text and reused across uploads
+        job_profile = self.job_profiles.get_profile(job_description)
+
+        # AI Analysis (using anonymized text); in two-stage mode only resumes
+        # that rank well locally are sent to the LLM
+        progress('analyzing')
+        analysis, local_score = self.screening.screen(
+            blind_resume, job_description, job_profile=job_profile,
+            mode=screening_mode, bypass_cache=bypass_cache
+        )
+
+        # Local skill coverage against the JD requirements
+        if job_profile is not None:
+            analysis['jd_match'] = job_profile.match(self.resume_parser.extract_skills(resume_text))
+
+        # Restore real contact info to the analysis object before saving/returning
+        if 'contact_info' not in analysis:
+            analysis['contact_info'] = {}
+
+        # Get extracted info or existing values
+        real_name = local_contact_info.get('name')
+        real_email = local_contact_info.get('email')
+        real_phone = local_contact_info.get('phone')
+
+        # Fallback logic: If local extraction failed, check if AI returned a placeholder
+        # and replace it with something meaningful (like the filename)
+        current_ai_name = analysis.get('contact_info', {}).get('name', 'Candidate Name')
+        if not real_name or '[CANDIDATE' in current_ai_name:
+            # Try once more to get name from the very first line if locals failed
+            lines = [l.strip() for l in resume_text.split('\n') if l.strip()]
+            if lines:
+                real_name = real_name or lines[0]
+            else:
+                real_name = real_name or filename.split('_')[-1] # Fallback to filename (stripped of UUID)
+
+        # Update analysis with the best local data available
+        analysis['contact_info'].update({
+            'name': real_name if real_name else filename,
+            'email': real_email if real_email else 'Email not found',
+            'phone': real_phone if real_phone else 'Phone not found'
+        })
+
+        # Bias Detection (also done locally, memoized by text hash and detector version)
+        progress('bias_detection')
+        bias_analysis, resume_hash = self.bias_rescorer.analyze(resume_text)
+
+        # Save to database
+        progress('saving')
+        candidate_id = self.db_manager.save_candidate({
+            'filename': filename,
+            'file_path': file_path,
+            'resume_text': resume_text,
+            'job_description': job_description,
+            'analysis': analysis,
+            'bias_analysis': bias_analysis,
+            'blind_resume': blind_resume,
+            'upload_date': datetime.now().isoformat(),
+            'resume_hash': resume_hash,
+            'bias_version': self.bias_rescorer.version,
+            'jd_hash': job_profile.jd_hash if job_profile else None,
+            'local_score': local_score
+        })
+
+        # Semantic matching index; a failure here must not fail the upload
+        try:
+            self.vector_index.add(candidate_id, blind_resume)
+        except Exception as e:
+            print(f"⚠️  Could not index candidate {candidate_id}: {e}")
+
+        return {
+            'candidate_id': candidate_id,
+            'analysis': analysis,
+            'bias_analysis': bias_analysis
+        }
@@ -0,0 +1,196 @@
+import os
+import re
+import zlib
+import struct
+import threading
+
+import numpy as np
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_INDEX_PATH = os.path.join(backend_dir, 'data', 'candidate_vectors.f32')
+
+TOKEN_PATTERN = re.compile(r'[a-z][a-z0-9+#]*')
+STOPWORDS = {
+    'a', 'an', 'the', 'and', 'or', 'of', 'to', 'in', 'on', 'for', 'with', 'at', 'by', 'as',
+    'is', 'are', 'was', 'were', 'be', 'been', 'i', 'we', 'you', 'our', 'your', 'my', 'it',
+    'this', 'that', 'from', 'will', 'have', 'has', 'had', 'who', 'etc', 'also'
+}
+# Taxonomy skills are much stronger evidence than ordinary words
+SKILL_WEIGHT = 3.0
+BIGRAM_WEIGHT = 0.5
+
+
+class HashingVectorizer:
+    """Dense, stateless text embedding by feature hashing (no model, no network).
+
+    Unigrams, bigrams and taxonomy skills are hashed into `dim` buckets with a
+    hash-derived sign, weighted by sublinear term frequency, and L2 normalized
+    so a dot product is the cosine similarity.
+    """
+
+    def __init__(self, dim, resume_parser=None):
+        self.dim = dim
+        self.resume_parser = resume_parser
+
+    def _add(self, vector, feature, weight):
+        h = zlib.crc32(feature.encode('utf-8'))
+        vector[h % self.dim] += weight if h & 0x80000000 else -weight
+
+    def transform(self, text):
+        counts = {}
+        tokens = [t for t in TOKEN_PATTERN.findall((text or '').lower()) if t not in STOPWORDS]
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1.0
+        for first, second in zip(tokens, tokens[1:]):
+            key = f'{first} {second}'
+            counts[key] = counts.get(key, 0) + BIGRAM_WEIGHT
+        if self.resume_parser is not None:
+            for skill, count in self.resume_parser.count_skills(text).items():
+                counts[f'skill:{skill}'] = count * SKILL_WEIGHT
+
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature, count in counts.items():
+            self._add(vector, feature, 1.0 + np.log(count) if count >= 1 else count)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class VectorIndex:
+    """Append-only, memory-mapped matrix of candidate vectors.
+
+    The file is a 16 byte header followed by one record per candidate: the
+    candidate id as an int64 and `dim` float32 components. New candidates are
+    appended with a single write, so several workers can share the file; each
+    process maps it read-only and remaps when it grows. Queries are one
+    matrix-vector product over the mapped rows.
+    """
+
+    MAGIC = b'CVX1'
+    HEADER = struct.Struct('<4sI8x')
+
+    def __init__(self, db_manager, resume_parser=None, path=None, dim=None):
+        self.db_manager = db_manager
+        self.path = path or os.getenv('VECTOR_INDEX_PATH', DEFAULT_INDEX_PATH)
+        self.dim = dim or int(os.getenv('VECTOR_INDEX_DIM', '256'))
+        self.vectorizer = HashingVectorizer(self.dim, resume_parser)
+        self.row_size = 8 + 4 * self.dim
+
+        self._lock = threading.Lock()
+        self._size = None
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._vectors = np.zeros((0, self.dim), dtype=np.float32)
+        self._last_id = 0
+        self._data_version = None
+
+    def _create(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(self.HEADER.pack(self.MAGIC, self.dim))
+        os.replace(tmp_path, self.path)
+
+    def _ensure_file(self):
+        """Create the file, or start over if it was written with another dimension"""
+        try:
+            with open(self.path, 'rb') as f:
+                magic, dim = self.HEADER.unpack(f.read(self.HEADER.size))
+            if magic == self.MAGIC and dim == self.dim:
+                return
+            print(f"⚠️  Vector index at {self.path} has dimension {dim}, rebuilding with {self.dim}")
+        except (OSError, struct.error):
+            pass
+        self._create()
+
+    def _remap(self):
+        """Map the rows on disk if the file grew since the last call (caller holds the lock)"""
+        size = os.path.getsize(self.path)
+        if size == self._size:
+            return
+        count = (size - self.HEADER.size) // self.row_size
+        if count:
+            raw = np.memmap(self.path, dtype=np.float32, mode='r',
+                            offset=self.HEADER.size, shape=(count, self.dim + 2))
+            # A strided view, BLAS reads it in place without copying
+            self._vectors = raw[:, 2:]
+            self._ids = np.ascontiguousarray(raw[:, :2]).view(np.int64)[:, 0]
+            self._last_id = int(self._ids.max())
+        self._size = size
+
+    def _append(self, rows):
+        """Append (candidate_id, vector) rows, one write per row"""
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | getattr(os, 'O_BINARY', 0))
+        try:
+            for candidate_id, vector in rows:
+                os.write(fd, struct.pack('<q', candidate_id) + vector.astype('<f4').tobytes())
+        finally:
+            os.close(fd)
+
+    def _catch_up(self, extra=()):
+        """Append every stored candidate after the last indexed id, plus `extra` rows (caller holds the lock)"""
+        if self._size is None:
+            self._ensure_file()
+            self._remap()
+        rows = [(candidate_id, self.vectorizer.transform(text))
+                for candidate_id, text in self.db_manager.get_blind_resumes(self._last_id)]
+        known = {candidate_id for candidate_id, _ in rows}
+        rows += [(candidate_id, vector) for candidate_id, vector in extra
+                 if candidate_id > self._last_id and candidate_id not in known]
+        if rows:
+            # Ascending ids keep _last_id a valid high-water mark
+            self._append(sorted(rows, key=lambda row: row[0]))
+            if len(rows) > 1:
+                print(f"✅ Indexed {len(rows)} candidate vectors")
+        self._remap()
+
+    def sync(self):
+        """Index candidates stored since the last indexed id (e.g. by another worker)"""
+        version = self.db_manager.get_data_version()
+        with self._lock:
+            if version == self._data_version:
+                return
+            self._catch_up()
+            self._data_version = version
+
+    def add(self, candidate_id, text):
+        """Index one newly saved candidate, and any older ones not indexed yet.
+
+        Appending only this candidate would move the high-water mark past
+        older rows (e.g. on a fresh index file), so they would never be indexed.
+        """
+        vector = self.vectorizer.transform(text)
+        with self._lock:
+            if self._size is None:
+                self._ensure_file()
+                self._remap()
+            if candidate_id <= self._last_id:
+                return
+            self._catch_up(extra=[(candidate_id, vector)])
+
+    def search(self, text, top_k=20):
+        """Return [(candidate_id, cosine similarity)] for the most similar candidates"""
+        self.sync()
+        query = self.vectorizer.transform(text)
+        with self._lock:
+            ids, vectors = self._ids, self._vectors
+        if not ids.size or not query.any():
+            return []
+
+        scores = vectors @ query
+        # Rows appended concurrently by two workers can repeat an id; over-fetch, then dedupe
+        k = min(top_k * 2, scores.size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        results = []
+        seen = set()
+        for row in top:
+            candidate_id = int(ids[row])
+            if candidate_id in seen:
+                continue
+            seen.add(candidate_id)
+            results.append((candidate_id, round(float(scores[row]), 4)))
+            if len(results) == top_k:
+                break
+        return results
+
+    def __len__(self):
+        return int(self._ids.size)
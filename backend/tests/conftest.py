@@ -0,0 +1,17 @@
+import os
+import sys
+
+import pytest
+
+# Tests import services the same way app.py does, from the backend directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.database import DatabaseManager
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    """A DatabaseManager on a fresh, initialized database file"""
+    db_manager = DatabaseManager(str(tmp_path / 'test.db'))
+    db_manager.init_db()
+    return db_manager
@@ -0,0 +1,58 @@
+import pytest
+from werkzeug.datastructures import MultiDict
+
+from services.candidate_query import CandidateQueryService
+
+
+@pytest.fixture
+def query_service(db_manager):
+    # Scores repeat so pages have to break ties on id
+    for i in range(23):
+        db_manager.save_candidate({
+            'filename': f'resume_{i}.pdf',
+            'file_path': f'uploads/resume_{i}.pdf',
+            'resume_text': 'text',
+            'analysis': {'overall_score': 50 + (i % 5) * 10, 'category': 'Qualified',
+                         'contact_info': {'name': f'Candidate {i:02d}'}},
+            'upload_date': f'2026-01-{i + 1:02d}T00:00:00'
+        })
+    return CandidateQueryService(db_manager)
+
+
+def read_all_pages(query_service, **params):
+    ids = []
+    cursor = None
+    while True:
+        args = MultiDict(dict(params, limit='5', facets='false'))
+        if cursor:
+            args['cursor'] = cursor
+        page = query_service.query(args)
+        assert len(page['candidates']) <= 5
+        ids.extend(candidate['id'] for candidate in page['candidates'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            return ids, page['total']
+
+
+@pytest.mark.parametrize('sort,order', [('score', 'desc'), ('score', 'asc'), ('name', 'asc'), ('date', 'desc')])
+def test_cursor_pages_cover_every_candidate_once_in_order(query_service, sort, order):
+    ids, total = read_all_pages(query_service, sort=sort, order=order)
+    full = query_service.query(MultiDict({'sort': sort, 'order': order, 'limit': '100', 'facets': 'false'}))
+    assert total == 23
+    assert ids == [candidate['id'] for candidate in full['candidates']]
+
+
+def test_filters_apply_to_every_page(query_service):
+    ids, total = read_all_pages(query_service, min_score='80')
+    assert total == len(ids) == sum(1 for i in range(23) if 50 + (i % 5) * 10 >= 80)
+
+
+def test_invalid_cursor_is_rejected(query_service):
+    with pytest.raises(ValueError):
+        query_service.query(MultiDict({'cursor': 'not-a-cursor'}))
+
+
+def test_cursor_of_another_sort_is_rejected(query_service):
+    cursor = query_service.query(MultiDict({'sort': 'score', 'limit': '5'}))['next_cursor']
+    with pytest.raises(ValueError):
+        query_service.query(MultiDict({'sort': 'name', 'cursor': cursor}))
@@ -0,0 +1,109 @@
+import pytest
+
+from services import circuit_breaker
+from services.circuit_breaker import CircuitBreaker, CircuitOpenError, CLOSED, OPEN, HALF_OPEN
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(circuit_breaker.time, 'monotonic', clock)
+    return clock
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(window_seconds=60, min_calls=4, error_rate=0.5, slow_call_seconds=10,
+                          slow_rate=0.8, open_seconds=30)
+
+
+def fail(breaker, calls, latency=0.1):
+    for _ in range(calls):
+        breaker.allow()
+        breaker.record(False, latency)
+
+
+def open_circuit(breaker, clock):
+    fail(breaker, 4)
+    assert breaker.state == OPEN
+    clock.now += 31
+
+
+def test_stays_closed_below_min_calls(breaker):
+    fail(breaker, 3)
+    assert breaker.state == CLOSED
+
+
+def test_opens_on_error_rate_and_fails_fast(breaker):
+    breaker.allow()
+    breaker.record(True, 0.1)
+    fail(breaker, 3)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.allow()
+    assert error.value.retry_after == 31
+
+
+def test_opens_on_slow_calls(breaker):
+    for _ in range(4):
+        breaker.allow()
+        breaker.record(True, 12)
+    assert breaker.state == OPEN
+
+
+def test_old_failures_leave_the_window(breaker, clock):
+    fail(breaker, 3)
+    clock.now += 61
+    fail(breaker, 1)
+    assert breaker.state == CLOSED
+
+
+def test_healthy_probe_closes(breaker, clock):
+    open_circuit(breaker, clock)
+    breaker.allow()
+    assert breaker.state == HALF_OPEN
+    # Only one probe at a time
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+    breaker.record(True, 0.1)
+    assert breaker.state == CLOSED
+    breaker.allow()
+
+
+def test_failed_or_slow_probe_reopens(breaker, clock):
+    open_circuit(breaker, clock)
+    breaker.allow()
+    breaker.record(False, 0.1)
+    assert breaker.state == OPEN
+
+    clock.now += 31
+    breaker.allow()
+    breaker.record(True, 12)
+    assert breaker.state == OPEN
+
+
+def test_rate_limited_probe_leaves_it_half_open(breaker, clock):
+    open_circuit(breaker, clock)
+    breaker.allow()
+    breaker.record(True, 0.1, rate_limited=True)
+    assert breaker.state == HALF_OPEN
+    # The probe slot was given back
+    breaker.allow()
+    breaker.record(True, 0.1)
+    assert breaker.state == CLOSED
+
+
+def test_cancelled_probe_frees_the_slot(breaker, clock):
+    open_circuit(breaker, clock)
+    breaker.allow()
+    breaker.cancel()
+    breaker.allow()
+    assert breaker.state == HALF_OPEN
@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from services.llm_providers import FakeProvider, FakeProviderError
+from services.chat_sessions import CONTEXT_FIELDS
+
+
+def fake_provider(**rates):
+    return FakeProvider(latency_ms=0, latency_sigma=0, rate_429=0, rate_5xx=0, rate_malformed=0,
+                        stream_chunk_ms=0, seed=7, **rates)
+
+
+@pytest.fixture
+def ai_service(monkeypatch):
+    monkeypatch.setenv('LLM_CACHE_DISABLED', '1')
+    monkeypatch.setenv('GEMINI_MODEL', 'models/fake-gemini')
+    from services.gemini_service import GeminiService
+    return GeminiService(provider=fake_provider())
+
+
+def chat_conversation():
+    # Built like ChatSessionManager.conversation, with the analysis JSON in the context
+    context = {'name': 'Candidate', 'overall_score': 72, 'category': 'Qualified', 'key_skills': ['Python']}
+    assert 'overall_score' in CONTEXT_FIELDS
+    return {'name': 'Candidate', 'context': json.dumps(context), 'summary': '', 'turns': []}
+
+
+def test_analysis_prompt_gets_analysis_json(ai_service):
+    analysis = ai_service.analyze_resume("Experience\nBuilt Python and AWS services for 5 years",
+                                         "Python developer", bypass_cache=True)
+    assert analysis.get('analysis_source') != 'local'
+    assert 0 <= analysis['overall_score'] <= 100
+    assert 'Python' in analysis['key_skills']
+
+
+def test_chat_prompt_with_analysis_context_gets_chat_text(ai_service):
+    response = ai_service.chat_about_candidate(chat_conversation(), 'Is this candidate senior?')
+    assert response.startswith('**Regarding:** Is this candidate senior?')
+    with pytest.raises(ValueError):
+        json.loads(response)
+
+
+def test_streamed_chat_gets_chat_text(ai_service):
+    text = ''.join(ai_service.chat_about_candidate_stream(chat_conversation(), 'Any red flags?'))
+    assert text.startswith('**Regarding:** Any red flags?')
+
+
+def test_cut_stream_fails_after_partial_output():
+    model = fake_provider(rate_stream_cut=1).model('models/fake-gemini')
+    chunks = []
+    with pytest.raises(FakeProviderError) as error:
+        for chunk in model.generate_content('User Question: ' + 'word ' * 50, stream=True):
+            chunks.append(chunk.text)
+    assert error.value.code == 503
+    assert chunks
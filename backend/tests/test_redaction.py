@@ -0,0 +1,49 @@
+import pytest
+
+from services.bias_detection import BiasDetector
+
+RESUME = (
+    "Jane Doe\n"
+    "jane.doe@example.com | +1 555 123 4567\n"
+    "42 Main Street, Springfield\n"
+    "\n"
+    "Experience\n"
+    "She led the payments team; her work cut latency by 40%.\n"
+)
+
+
+@pytest.fixture(scope='module')
+def detector():
+    return BiasDetector()
+
+
+def assert_spans_consistent(text, blind, spans):
+    previous_end = previous_blind_end = 0
+    for span in spans:
+        assert text[span['start']:span['end']] == span['original']
+        assert blind[span['blind_start']:span['blind_end']] == span['replacement']
+        # Text between replacements is copied unchanged
+        assert text[previous_end:span['start']] == blind[previous_blind_end:span['blind_start']]
+        previous_end, previous_blind_end = span['end'], span['blind_end']
+    assert text[previous_end:] == blind[previous_blind_end:]
+
+
+def test_spans_map_original_and_blind_offsets(detector):
+    blind, spans = detector.redact_resume(RESUME)
+    types = [span['type'] for span in spans]
+    assert types[0] == 'name'
+    assert {'email', 'phone', 'pronoun'} <= set(types)
+    assert 'jane.doe@example.com' not in blind
+    assert_spans_consistent(RESUME, blind, spans)
+
+
+def test_crlf_line_endings_redact_the_same_spans(detector):
+    crlf = RESUME.replace('\n', '\r\n')
+    blind, spans = detector.redact_resume(crlf)
+    assert [span['type'] for span in spans] == [span['type'] for span in detector.redact_resume(RESUME)[1]]
+    assert blind.startswith('[CANDIDATE NAME]\r\n')
+    assert_spans_consistent(crlf, blind, spans)
+
+
+def test_empty_text(detector):
+    assert detector.redact_resume('') == ('', [])
@@ -66,11 +66,29 @@ const AIMatching = () => {
     setLoading(true);
     
     try {
-      // Simulate advanced AI matching with multiple factors
-      const matchedCandidates = candidates.map(candidate => {
+      // Semantic similarity from the backend vector index narrows the pool first
+      const queryText = [
+        jobRequirements.title,
+        jobRequirements.description,
+        jobRequirements.requiredSkills.join(', ')
+      ].filter(Boolean).join('\n');
+      let similarity = null;
+      if (queryText.trim()) {
+        const response = await apiService.matchCandidates(queryText, 50);
+        const matches = response.data.matches || [];
+        const best = matches.length ? matches[0].similarity || 1 : 1;
+        similarity = new Map(matches.map(m => [m.id, Math.max(0, m.similarity) / best * 100]));
+      }
+      const pool = similarity && similarity.size
+        ? candidates.filter(candidate => similarity.has(candidate.id))
+        : candidates;
+
+      // Combine semantic similarity with the structured matching factors
+      const matchedCandidates = pool.map(candidate => {
         const analysis = candidate.analysis || {};
         
         // Calculate multiple matching scores
+        const semanticMatch = similarity ? similarity.get(candidate.id) || 0 : 50;
         const skillsMatch = calculateSkillsMatch(analysis.key_skills || [], jobRequirements.requiredSkills);
         const experienceMatch = calculateExperienceMatch(analysis.experience_years || 0, jobRequirements.experienceLevel);
         const locationMatch = calculateLocationMatch(analysis.contact_info?.location, jobRequirements.location);
@@ -79,16 +97,18 @@ const AIMatching = () => {
         
         // AI-weighted overall score
         const overallMatch = (
-          skillsMatch * 0.35 +
-          experienceMatch * 0.25 +
-          locationMatch * 0.15 +
-          cultureMatch * 0.15 +
+          skillsMatch * 0.30 +
+          semanticMatch * 0.20 +
+          experienceMatch * 0.20 +
+          locationMatch * 0.10 +
+          cultureMatch * 0.10 +
           potentialScore * 0.10
         );
 
         return {
           ...candidate,
           matchScore: Math.round(overallMatch),
+          semanticMatch: Math.round(semanticMatch),
           skillsMatch: Math.round(skillsMatch),
           experienceMatch: Math.round(experienceMatch),
           locationMatch: Math.round(locationMatch),
@@ -1,4 +1,4 @@
-import React, { useState, useEffect, useMemo } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
 import { Link } from 'react-router-dom';
 import { 
@@ -25,11 +25,41 @@ import {
 import { apiService } from '../services/api';
 import toast from 'react-hot-toast';
 
+const PAGE_SIZE = 30;
+const SEARCH_DEBOUNCE_MS = 300;
+
+// Query parameters for /api/candidates/query; sliders at their outer bounds do not filter
+const buildQueryParams = (searchQuery, filters, sortBy) => ({
+  q: searchQuery.trim(),
+  min_score: filters.scoreRange[0] > 0 ? filters.scoreRange[0] : undefined,
+  max_score: filters.scoreRange[1] < 100 ? filters.scoreRange[1] : undefined,
+  min_experience: filters.experienceRange[0] > 0 ? filters.experienceRange[0] : undefined,
+  max_experience: filters.experienceRange[1] < 20 ? filters.experienceRange[1] : undefined,
+  category: filters.categories,
+  skill: filters.skills,
+  location: filters.locations,
+  education: filters.education,
+  date_range: filters.dateRange,
+  sort: sortBy,
+});
+
+// Facet values for a filter list, keeping selected values that no longer match anything
+const facetOptions = (facet = [], selected = []) => [
+  ...facet,
+  ...selected
+    .filter(value => !facet.some(option => option.value === value))
+    .map(value => ({ value, count: 0 })),
+];
+
 const AdvancedSearch = () => {
   const [candidates, setCandidates] = useState([]);
+  const [total, setTotal] = useState(0);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [searchQuery, setSearchQuery] = useState('');
   const [showFilters, setShowFilters] = useState(false);
+  const [sortBy, setSortBy] = useState('score');
   
   // Filter states
   const [filters, setFilters] = useState({
@@ -42,137 +72,64 @@ const AdvancedSearch = () => {
     dateRange: 'all' // all, today, week, month, year
   });
 
-  const [availableFilters, setAvailableFilters] = useState({
-    categories: [],
+  // Facet counts from the server: [{ value, count }] per filter
+  const [facets, setFacets] = useState({
+    category: [],
     skills: [],
-    locations: [],
+    location: [],
     education: []
   });
 
-  useEffect(() => {
-    fetchCandidates();
-  }, []);
+  // Only the response to the latest query may update the results
+  const queryId = useRef(0);
 
   useEffect(() => {
-    if (candidates.length > 0) {
-      extractAvailableFilters();
-    }
-  }, [candidates]);
+    const timer = setTimeout(fetchCandidates, SEARCH_DEBOUNCE_MS);
+    return () => clearTimeout(timer);
+  }, [searchQuery, filters, sortBy]);
 
   const fetchCandidates = async () => {
+    const id = ++queryId.current;
     try {
-      const response = await apiService.getCandidates();
+      const response = await apiService.queryCandidates({
+        ...buildQueryParams(searchQuery, filters, sortBy),
+        limit: PAGE_SIZE
+      });
+      if (id !== queryId.current) return;
       setCandidates(response.data.candidates);
+      setTotal(response.data.total);
+      setNextCursor(response.data.next_cursor);
+      setFacets(response.data.facets);
     } catch (error) {
+      if (id !== queryId.current) return;
       console.error('Error fetching candidates:', error);
       toast.error('Failed to load candidates');
     } finally {
-      setLoading(false);
+      if (id === queryId.current) setLoading(false);
     }
   };
 
-  const extractAvailableFilters = () => {
-    const categories = [...new Set(candidates.map(c => c.analysis?.category).filter(Boolean))];
-    const skills = [...new Set(candidates.flatMap(c => c.analysis?.key_skills || []))];
-    const locations = [...new Set(candidates.map(c => c.analysis?.contact_info?.location).filter(Boolean))];
-    const education = [...new Set(candidates.map(c => c.analysis?.education).filter(Boolean))];
-
-    setAvailableFilters({
-      categories: categories.sort(),
-      skills: skills.sort(),
-      locations: locations.sort(),
-      education: education.sort()
-    });
+  const loadMore = async () => {
+    const id = queryId.current;
+    setLoadingMore(true);
+    try {
+      const response = await apiService.queryCandidates({
+        ...buildQueryParams(searchQuery, filters, sortBy),
+        limit: PAGE_SIZE,
+        cursor: nextCursor,
+        facets: false
+      });
+      if (id !== queryId.current) return;
+      setCandidates(prev => [...prev, ...response.data.candidates]);
+      setNextCursor(response.data.next_cursor);
+    } catch (error) {
+      console.error('Error loading more candidates:', error);
+      toast.error('Failed to load more candidates');
+    } finally {
+      setLoadingMore(false);
+    }
   };
 
-  const filteredCandidates = useMemo(() => {
-    return candidates.filter(candidate => {
-      const analysis = candidate.analysis || {};
-      const contactInfo = analysis.contact_info || {};
-      
-      // Text search
-      if (searchQuery) {
-        const searchFields = [
-          contactInfo.name,
-          candidate.filename,
-          analysis.category,
-          ...(analysis.key_skills || []),
-          analysis.education,
-          contactInfo.location
-        ].filter(Boolean).join(' ').toLowerCase();
-        
-        if (!searchFields.includes(searchQuery.toLowerCase())) {
-          return false;
-        }
-      }
-
-      // Score range
-      const score = analysis.overall_score || 0;
-      if (score < filters.scoreRange[0] || score > filters.scoreRange[1]) {
-        return false;
-      }
-
-      // Categories
-      if (filters.categories.length > 0 && !filters.categories.includes(analysis.category)) {
-        return false;
-      }
-
-      // Experience range
-      const experience = analysis.experience_years || 0;
-      if (experience < filters.experienceRange[0] || experience > filters.experienceRange[1]) {
-        return false;
-      }
-
-      // Skills
-      if (filters.skills.length > 0) {
-        const candidateSkills = analysis.key_skills || [];
-        const hasRequiredSkills = filters.skills.some(skill => 
-          candidateSkills.some(candidateSkill => 
-            candidateSkill.toLowerCase().includes(skill.toLowerCase())
-          )
-        );
-        if (!hasRequiredSkills) {
-          return false;
-        }
-      }
-
-      // Locations
-      if (filters.locations.length > 0 && !filters.locations.includes(contactInfo.location)) {
-        return false;
-      }
-
-      // Education
-      if (filters.education.length > 0 && !filters.education.includes(analysis.education)) {
-        return false;
-      }
-
-      // Date range
-      if (filters.dateRange !== 'all') {
-        const uploadDate = new Date(candidate.upload_date);
-        const now = new Date();
-        const diffTime = now - uploadDate;
-        const diffDays = Math.ceil(diffTime / (1000 * 60 * 60 * 24));
-
-        switch (filters.dateRange) {
-          case 'today':
-            if (diffDays > 1) return false;
-            break;
-          case 'week':
-            if (diffDays > 7) return false;
-            break;
-          case 'month':
-            if (diffDays > 30) return false;
-            break;
-          case 'year':
-            if (diffDays > 365) return false;
-            break;
-        }
-      }
-
-      return true;
-    });
-  }, [candidates, searchQuery, filters]);
-
   const updateFilter = (key, value) => {
     setFilters(prev => ({ ...prev, [key]: value }));
   };
@@ -199,10 +156,30 @@ const AdvancedSearch = () => {
     setSearchQuery('');
   };
 
-  const exportResults = () => {
+  const exportResults = async () => {
+    // Export every match, not only the pages loaded so far
+    let results = [];
+    let cursor = null;
+    try {
+      do {
+        const response = await apiService.queryCandidates({
+          ...buildQueryParams(searchQuery, filters, sortBy),
+          limit: 100,
+          cursor,
+          facets: false
+        });
+        results = results.concat(response.data.candidates);
+        cursor = response.data.next_cursor;
+      } while (cursor);
+    } catch (error) {
+      console.error('Error exporting candidates:', error);
+      toast.error('Failed to export candidates');
+      return;
+    }
+
     const csvContent = [
       ['Name', 'Score', 'Category', 'Experience', 'Skills', 'Location', 'Education'].join(','),
-      ...filteredCandidates.map(candidate => [
+      ...results.map(candidate => [
         candidate.analysis?.contact_info?.name || candidate.filename,
         candidate.analysis?.overall_score || 0,
         candidate.analysis?.category || 'Unknown',
@@ -292,7 +269,7 @@ const AdvancedSearch = () => {
             {showFilters ? <ChevronUp className="h-4 w-4" /> : <ChevronDown className="h-4 w-4" />}
           </motion.button>
           
-          {filteredCandidates.length > 0 && (
+          {total > 0 && (
             <motion.button
               whileHover={{ scale: 1.05 }}
               whileTap={{ scale: 0.95 }}
@@ -427,15 +404,16 @@ const AdvancedSearch = () => {
               <div>
                 <label className="block text-sm font-medium text-gray-700 mb-2">Categories</label>
                 <div className="space-y-2 max-h-32 overflow-y-auto">
-                  {availableFilters.categories.map(category => (
-                    <label key={category} className="flex items-center">
+                  {facetOptions(facets.category, filters.categories).map(({ value, count }) => (
+                    <label key={value} className="flex items-center">
                       <input
                         type="checkbox"
-                        checked={filters.categories.includes(category)}
-                        onChange={() => toggleArrayFilter('categories', category)}
+                        checked={filters.categories.includes(value)}
+                        onChange={() => toggleArrayFilter('categories', value)}
                         className="mr-2 rounded border-gray-300 text-primary-600 focus:ring-primary-500"
                       />
-                      <span className="text-sm text-gray-700">{category}</span>
+                      <span className="text-sm text-gray-700">{value}</span>
+                      <span className="ml-auto text-xs text-gray-400">{count}</span>
                     </label>
                   ))}
                 </div>
@@ -445,15 +423,16 @@ const AdvancedSearch = () => {
               <div>
                 <label className="block text-sm font-medium text-gray-700 mb-2">Skills</label>
                 <div className="space-y-2 max-h-32 overflow-y-auto">
-                  {availableFilters.skills.slice(0, 10).map(skill => (
-                    <label key={skill} className="flex items-center">
+                  {facetOptions(facets.skills.slice(0, 10), filters.skills).map(({ value, count }) => (
+                    <label key={value} className="flex items-center">
                       <input
                         type="checkbox"
-                        checked={filters.skills.includes(skill)}
-                        onChange={() => toggleArrayFilter('skills', skill)}
+                        checked={filters.skills.includes(value)}
+                        onChange={() => toggleArrayFilter('skills', value)}
                         className="mr-2 rounded border-gray-300 text-primary-600 focus:ring-primary-500"
                       />
-                      <span className="text-sm text-gray-700">{skill}</span>
+                      <span className="text-sm text-gray-700">{value}</span>
+                      <span className="ml-auto text-xs text-gray-400">{count}</span>
                     </label>
                   ))}
                 </div>
@@ -463,15 +442,16 @@ const AdvancedSearch = () => {
               <div>
                 <label className="block text-sm font-medium text-gray-700 mb-2">Locations</label>
                 <div className="space-y-2 max-h-32 overflow-y-auto">
-                  {availableFilters.locations.map(location => (
-                    <label key={location} className="flex items-center">
+                  {facetOptions(facets.location, filters.locations).map(({ value, count }) => (
+                    <label key={value} className="flex items-center">
                       <input
                         type="checkbox"
-                        checked={filters.locations.includes(location)}
-                        onChange={() => toggleArrayFilter('locations', location)}
+                        checked={filters.locations.includes(value)}
+                        onChange={() => toggleArrayFilter('locations', value)}
                         className="mr-2 rounded border-gray-300 text-primary-600 focus:ring-primary-500"
                       />
-                      <span className="text-sm text-gray-700">{location}</span>
+                      <span className="text-sm text-gray-700">{value}</span>
+                      <span className="ml-auto text-xs text-gray-400">{count}</span>
                     </label>
                   ))}
                 </div>
@@ -489,33 +469,46 @@ const AdvancedSearch = () => {
         className="flex items-center justify-between"
       >
         <p className="text-gray-600">
-          Found <span className="font-semibold text-gray-900">{filteredCandidates.length}</span> candidates
-          {candidates.length !== filteredCandidates.length && (
-            <span> out of {candidates.length} total</span>
+          Found <span className="font-semibold text-gray-900">{total}</span> candidates
+          {candidates.length < total && (
+            <span>, showing {candidates.length}</span>
           )}
         </p>
         
-        <motion.button
-          whileHover={{ scale: 1.05 }}
-          whileTap={{ scale: 0.95 }}
-          onClick={fetchCandidates}
-          className="btn-secondary flex items-center space-x-2"
-        >
-          <RefreshCw className="h-4 w-4" />
-          <span>Refresh</span>
-        </motion.button>
+        <div className="flex items-center space-x-4">
+          <select
+            value={sortBy}
+            onChange={(e) => setSortBy(e.target.value)}
+            className="p-2 border border-gray-200 rounded-lg focus:ring-2 focus:ring-primary-500"
+          >
+            <option value="score">Sort by Score</option>
+            <option value="experience">Sort by Experience</option>
+            <option value="date">Sort by Upload Date</option>
+            <option value="name">Sort by Name</option>
+          </select>
+
+          <motion.button
+            whileHover={{ scale: 1.05 }}
+            whileTap={{ scale: 0.95 }}
+            onClick={fetchCandidates}
+            className="btn-secondary flex items-center space-x-2"
+          >
+            <RefreshCw className="h-4 w-4" />
+            <span>Refresh</span>
+          </motion.button>
+        </div>
       </motion.div>
 
       {/* Results Grid */}
       <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
         <AnimatePresence>
-          {filteredCandidates.map((candidate, index) => (
+          {candidates.map((candidate, index) => (
             <motion.div
               key={candidate.id}
               initial={{ opacity: 0, y: 20 }}
               animate={{ opacity: 1, y: 0 }}
               exit={{ opacity: 0, y: -20 }}
-              transition={{ delay: index * 0.05 }}
+              transition={{ delay: (index % PAGE_SIZE) * 0.05 }}
               className="card p-6 hover:shadow-xl transition-all duration-300 group"
             >
               {/* Candidate Header */}
@@ -614,8 +607,24 @@ const AdvancedSearch = () => {
         </AnimatePresence>
       </div>
 
+      {/* Next page */}
+      {nextCursor && (
+        <div className="flex justify-center">
+          <motion.button
+            whileHover={{ scale: 1.05 }}
+            whileTap={{ scale: 0.95 }}
+            onClick={loadMore}
+            disabled={loadingMore}
+            className="btn-secondary flex items-center space-x-2"
+          >
+            {loadingMore && <RefreshCw className="h-4 w-4 animate-spin" />}
+            <span>{loadingMore ? 'Loading...' : 'Load More'}</span>
+          </motion.button>
+        </div>
+      )}
+
       {/* No Results */}
-      {filteredCandidates.length === 0 && !loading && (
+      {candidates.length === 0 && !loading && (
         <motion.div
           initial={{ opacity: 0, y: 20 }}
           animate={{ opacity: 1, y: 0 }}
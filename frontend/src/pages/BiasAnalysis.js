@@ -35,26 +35,20 @@ const BiasAnalysis = () => {
 
   const fetchCandidatesWithBias = async () => {
     try {
-      const response = await apiService.getCandidates();
+      // Cohort statistics are aggregated server-side
+      const [response, summaryResponse] = await Promise.all([
+        apiService.getCandidates(),
+        apiService.getBiasSummary()
+      ]);
       const candidatesData = response.data.candidates;
-      
-      // Calculate bias statistics
-      const candidatesWithBias = candidatesData.filter(c => c.bias_analysis);
+      const summary = summaryResponse.data.summary;
+
       const stats = {
-        totalCandidates: candidatesWithBias.length,
-        highRisk: candidatesWithBias.filter(c => 
-          c.bias_analysis?.overall_bias_score >= config.BIAS_THRESHOLDS.HIGH
-        ).length,
-        mediumRisk: candidatesWithBias.filter(c => 
-          c.bias_analysis?.overall_bias_score >= config.BIAS_THRESHOLDS.MEDIUM &&
-          c.bias_analysis?.overall_bias_score < config.BIAS_THRESHOLDS.HIGH
-        ).length,
-        lowRisk: candidatesWithBias.filter(c => 
-          c.bias_analysis?.overall_bias_score < config.BIAS_THRESHOLDS.MEDIUM
-        ).length,
-        avgBiasScore: candidatesWithBias.length > 0 
-          ? Math.round(candidatesWithBias.reduce((acc, c) => acc + (c.bias_analysis?.overall_bias_score || 0), 0) / candidatesWithBias.length)
-          : 0
+        totalCandidates: summary.total_candidates,
+        highRisk: summary.risk_levels.high,
+        mediumRisk: summary.risk_levels.medium,
+        lowRisk: summary.risk_levels.low,
+        avgBiasScore: Math.round(summary.overall.mean)
       };
 
       setCandidates(candidatesData);
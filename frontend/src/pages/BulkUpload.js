@@ -1,4 +1,4 @@
-import React, { useState, useCallback } from 'react';
+import React, { useState, useCallback, useRef } from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
 import { useDropzone } from 'react-dropzone';
 import { 
@@ -30,6 +30,7 @@ const BulkUpload = () => {
   const [isPaused, setIsPaused] = useState(false);
   const [processedCount, setProcessedCount] = useState(0);
   const [results, setResults] = useState([]);
+  const abortRef = useRef(null);
 
   const onDrop = useCallback((acceptedFiles, rejectedFiles) => {
     // Handle accepted files
@@ -60,9 +61,16 @@ const BulkUpload = () => {
     onDrop,
     accept: {
       'application/pdf': ['.pdf'],
-      'application/vnd.openxmlformats-officedocument.wordprocessingml.document': ['.docx']
+      'application/vnd.openxmlformats-officedocument.wordprocessingml.document': ['.docx'],
+      'application/zip': ['.zip'],
+      'application/x-zip-compressed': ['.zip']
     },
-    maxSize: 16 * 1024 * 1024, // 16MB
+    // Resumes up to 16MB each; ZIP archives of resumes may be larger
+    validator: (file) => (
+      !file.name.toLowerCase().endsWith('.zip') && file.size > 16 * 1024 * 1024
+        ? { code: 'file-too-large', message: 'File is larger than 16MB' }
+        : null
+    ),
     multiple: true
   });
 
@@ -77,7 +85,8 @@ const BulkUpload = () => {
   };
 
   const processFiles = async () => {
-    if (files.length === 0) {
+    const batch = files.filter(f => f.status === 'pending');
+    if (batch.length === 0) {
       toast.error('Please add files to process');
       return;
     }
@@ -86,71 +95,95 @@ const BulkUpload = () => {
     setIsPaused(false);
     setProcessedCount(0);
     setResults([]);
+    setFiles(prev => prev.map(f => 
+      f.status === 'pending' 
+        ? { ...f, status: 'processing', progress: 0 }
+        : f
+    ));
 
-    for (let i = 0; i < files.length; i++) {
-      if (isPaused) break;
-
-      const fileData = files[i];
-      
-      // Update file status to processing
-      setFiles(prev => prev.map(f => 
-        f.id === fileData.id 
-          ? { ...f, status: 'processing', progress: 0 }
-          : f
-      ));
-
-      try {
-        // Simulate progress updates
-        for (let progress = 0; progress <= 100; progress += 20) {
-          if (isPaused) break;
-          
-          setFiles(prev => prev.map(f => 
-            f.id === fileData.id 
-              ? { ...f, progress }
-              : f
-          ));
-          
-          await new Promise(resolve => setTimeout(resolve, 200));
-        }
-
-        if (!isPaused) {
-          // Upload file
-          const formData = new FormData();
-          formData.append('file', fileData.file);
-          formData.append('job_description', jobDescription);
-
-          const response = await apiService.uploadResume(formData);
-
-          // Update file status to completed
-          setFiles(prev => prev.map(f => 
-            f.id === fileData.id 
-              ? { ...f, status: 'completed', progress: 100, result: response.data }
-              : f
-          ));
-
-          setResults(prev => [...prev, { ...response.data, fileName: fileData.file.name }]);
+    // A ZIP archive holds several resumes, so progress is tracked per uploaded file.
+    // The server finishes every resume it has started even after a pause, so
+    // resuming skips those (`skip` counts resumes started in earlier runs).
+    let sourceTotals = [];
+    const sourceStarted = batch.map(() => 0);
+    const sourceDone = batch.map(() => 0);
+    const sourceErrors = batch.map(() => []);
+
+    const handleEvent = (event) => {
+      if (event.type === 'batch') {
+        sourceTotals = event.sources;
+      } else if (event.type === 'started') {
+        sourceStarted[event.source] += 1;
+      } else if (event.type === 'result') {
+        const fileData = batch[event.source];
+        const skipped = fileData.skip || 0;
+        const total = sourceTotals[event.source] || 1;
+        sourceDone[event.source] += 1;
+
+        if (event.success) {
+          setResults(prev => [...prev, { ...event, fileName: event.filename }]);
           setProcessedCount(prev => prev + 1);
-          
-          toast.success(`${fileData.file.name} processed successfully`);
+        } else {
+          sourceErrors[event.source].push(`${event.filename}: ${event.error}`);
+          toast.error(`Failed to process ${event.filename}`);
         }
-      } catch (error) {
-        // Update file status to error
+
+        const errors = sourceErrors[event.source];
+        const finished = sourceDone[event.source] >= total;
         setFiles(prev => prev.map(f => 
           f.id === fileData.id 
-            ? { ...f, status: 'error', error: error.message }
+            ? {
+                ...f,
+                status: finished ? (errors.length === total ? 'error' : 'completed') : 'processing',
+                progress: Math.round(((skipped + sourceDone[event.source]) / (skipped + total)) * 100),
+                result: event.success ? event : f.result,
+                error: errors.length ? errors.join('; ') : null
+              }
             : f
         ));
-        
-        toast.error(`Failed to process ${fileData.file.name}`);
+      } else if (event.type === 'summary') {
+        toast.success(`${event.succeeded} resumes processed in ${event.elapsed_seconds}s`);
       }
+    };
+
+    const controller = new AbortController();
+    abortRef.current = controller;
+    try {
+      await apiService.uploadBatch(
+        batch.map(f => f.file), jobDescription, handleEvent, controller.signal, batch.map(f => f.skip || 0)
+      );
+      // Archives without any PDF or DOCX resumes never produced a result
+      setFiles(prev => prev.map(f => 
+        f.status === 'processing' 
+          ? { ...f, status: 'error', error: 'No PDF or DOCX resumes found' }
+          : f
+      ));
+    } catch (error) {
+      const paused = error.name === 'AbortError';
+      if (!paused) {
+        toast.error(error.message);
+      }
+      setFiles(prev => prev.map(f => {
+        if (f.status !== 'processing') return f;
+        if (!paused) return { ...f, status: 'error', error: error.message };
+
+        // When paused, only resumes the server has not started are sent again
+        const source = batch.findIndex(b => b.id === f.id);
+        const started = sourceStarted[source];
+        if (started > 0 && started >= sourceTotals[source]) {
+          return { ...f, status: 'completed', progress: 100 };
+        }
+        return { ...f, status: 'pending', skip: (f.skip || 0) + started };
+      }));
+    } finally {
+      abortRef.current = null;
+      setIsProcessing(false);
     }
-
-    setIsProcessing(false);
   };
 
   const pauseProcessing = () => {
     setIsPaused(true);
-    setIsProcessing(false);
+    abortRef.current?.abort();
   };
 
   const resumeProcessing = () => {
@@ -360,7 +393,7 @@ const BulkUpload = () => {
             {isDragActive ? 'Drop files here' : 'Drag & drop resumes here'}
           </h3>
           <p className="text-gray-600 mb-4">
-            or click to browse files (PDF, DOCX up to 16MB each)
+            or click to browse files (PDF, DOCX up to 16MB each, or a ZIP of resumes)
           </p>
           
           <motion.button
@@ -35,6 +35,8 @@ const CandidateDetail = () => {
   const [newMessage, setNewMessage] = useState('');
   const [isChatLoading, setIsChatLoading] = useState(false);
   const [showBlindResume, setShowBlindResume] = useState(false);
+  const [isPromoting, setIsPromoting] = useState(false);
+  const [chatSessionId, setChatSessionId] = useState(null);
 
   // Format AI responses for better display
   const formatAIResponse = (text) => {
@@ -49,6 +51,7 @@ const CandidateDetail = () => {
 
   useEffect(() => {
     fetchCandidateData();
+    fetchChatHistory();
   }, [id]);
 
   useEffect(() => {
@@ -86,6 +89,37 @@ const CandidateDetail = () => {
     }
   };
 
+  const fetchChatHistory = async () => {
+    try {
+      const response = await apiService.getChatHistory(id);
+      setChatSessionId(response.data.session_id);
+      setChatMessages(response.data.history.flatMap((turn) => [
+        { type: 'user', message: turn.message, timestamp: turn.timestamp },
+        { type: 'ai', message: turn.response, timestamp: turn.timestamp }
+      ]));
+    } catch (error) {
+      console.error('Error fetching chat history:', error);
+    }
+  };
+
+  const handlePromote = async () => {
+    setIsPromoting(true);
+    try {
+      const response = await apiService.promoteCandidate(id);
+      if (response.data.success) {
+        setCandidate((prev) => ({ ...prev, analysis: response.data.analysis }));
+        toast.success('AI review completed');
+      } else {
+        toast.error('AI service is unavailable, kept the local analysis');
+      }
+    } catch (error) {
+      console.error('Error requesting AI review:', error);
+      toast.error('Failed to request AI review');
+    } finally {
+      setIsPromoting(false);
+    }
+  };
+
   const handleSendMessage = async () => {
     if (!newMessage.trim() || isChatLoading) return;
 
@@ -102,15 +136,17 @@ const CandidateDetail = () => {
     setChatMessages(prev => [...prev, newUserMessage]);
 
     try {
-      const response = await apiService.chatWithCandidate(id, userMessage);
-      
-      // Add AI response to chat
-      const aiMessage = {
-        type: 'ai',
-        message: response.data.response,
-        timestamp: new Date().toISOString()
-      };
-      setChatMessages(prev => [...prev, aiMessage]);
+      // Add an empty AI response and fill it in as tokens stream in
+      setChatMessages(prev => [...prev, { type: 'ai', message: '', timestamp: new Date().toISOString() }]);
+      const appendToken = (text) => setChatMessages(prev => {
+        const updated = [...prev];
+        const last = updated[updated.length - 1];
+        updated[updated.length - 1] = { ...last, message: last.message + text };
+        return updated;
+      });
+
+      const result = await apiService.streamChatWithCandidate(id, userMessage, appendToken, chatSessionId);
+      if (result?.session_id) setChatSessionId(result.session_id);
 
     } catch (error) {
       console.error('Error sending message:', error);
@@ -122,7 +158,12 @@ const CandidateDetail = () => {
         message: 'Sorry, I encountered an error. Please try again.',
         timestamp: new Date().toISOString()
       };
-      setChatMessages(prev => [...prev, errorMessage]);
+      // Replace the empty streaming placeholder, keep any partial answer
+      setChatMessages(prev => {
+        const last = prev[prev.length - 1];
+        const kept = last && last.type === 'ai' && !last.message ? prev.slice(0, -1) : prev;
+        return [...kept, errorMessage];
+      });
     } finally {
       setIsChatLoading(false);
     }
@@ -225,6 +266,11 @@ const CandidateDetail = () => {
         </div>
         
         <div className="flex items-center space-x-3">
+          {candidate.analysis?.analysis_source === 'local' && (
+            <button onClick={handlePromote} disabled={isPromoting} className="btn-secondary text-sm">
+              {isPromoting ? 'Reviewing...' : 'Request AI review'}
+            </button>
+          )}
           <span className={`badge ${getCategoryColor(candidate.analysis?.category)}`}>
             {getCategoryIcon(candidate.analysis?.category)}
             <span className="ml-2">{candidate.analysis?.category || 'Pending'}</span>
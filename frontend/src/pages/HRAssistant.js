@@ -81,15 +81,23 @@ const HRAssistant = () => {
     setMessages(prev => [...prev, userMessage]);
 
     try {
-      const response = await apiService.hrChat(message);
+      // Add an empty AI response and fill it in as tokens stream in
+      setMessages(prev => [...prev, { type: 'ai', message: '', timestamp: new Date().toISOString() }]);
+      const appendToken = (text) => setMessages(prev => {
+        const updated = [...prev];
+        const last = updated[updated.length - 1];
+        updated[updated.length - 1] = { ...last, message: last.message + text };
+        return updated;
+      });
 
-      // Add AI response
-      const aiMessage = {
-        type: 'ai',
-        message: response.data.response,
-        timestamp: new Date().toISOString()
-      };
-      setMessages(prev => [...prev, aiMessage]);
+      const result = await apiService.streamHrChat(message, appendToken);
+      if (result) {
+        setMessages(prev => {
+          const updated = [...prev];
+          updated[updated.length - 1] = { type: 'ai', message: result.response, timestamp: result.timestamp };
+          return updated;
+        });
+      }
 
     } catch (error) {
       console.error('Error sending message:', error);
@@ -101,7 +109,12 @@ const HRAssistant = () => {
         message: 'Sorry, I encountered an error. Please try again.',
         timestamp: new Date().toISOString()
       };
-      setMessages(prev => [...prev, errorMessage]);
+      // Replace the empty streaming placeholder, keep any partial answer
+      setMessages(prev => {
+        const last = prev[prev.length - 1];
+        const kept = last && last.type === 'ai' && !last.message ? prev.slice(0, -1) : prev;
+        return [...kept, errorMessage];
+      });
     } finally {
       setIsLoading(false);
     }
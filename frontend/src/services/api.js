@@ -38,35 +38,194 @@ api.interceptors.response.use(
   }
 );
 
+// POST a JSON body to a Server-Sent Events endpoint and report each token as it arrives.
+// Resolves with the final payload of the 'done' event.
+const streamSSE = async (path, body, onToken) => {
+  const response = await fetch(`${config.API_BASE_URL}${path}`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', Accept: 'text/event-stream' },
+    body: JSON.stringify(body),
+  });
+  if (!response.ok || !response.body) {
+    throw new Error(`Stream request failed with status ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let result = null;
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let boundary;
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const rawEvent = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+
+      let event = 'message';
+      let data = '';
+      rawEvent.split('\n').forEach((line) => {
+        if (line.startsWith('event:')) event = line.slice(6).trim();
+        else if (line.startsWith('data:')) data += line.slice(5).trim();
+      });
+      if (!data) continue;
+
+      const payload = JSON.parse(data);
+      if (event === 'token') onToken?.(payload.text);
+      else if (event === 'done') result = payload;
+      else if (event === 'error') throw new Error(payload.error);
+    }
+  }
+
+  return result;
+};
+
+// POST a form to an NDJSON endpoint and report each JSON line as it arrives.
+const streamNDJSON = async (path, formData, onEvent, signal) => {
+  const response = await fetch(`${config.API_BASE_URL}${path}`, { method: 'POST', body: formData, signal });
+  if (!response.ok || !response.body) {
+    const error = await response.json().catch(() => ({}));
+    throw new Error(error.error || `Request failed with status ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let newline;
+    while ((newline = buffer.indexOf('\n')) !== -1) {
+      const line = buffer.slice(0, newline).trim();
+      buffer = buffer.slice(newline + 1);
+      if (line) onEvent(JSON.parse(line));
+    }
+  }
+};
+
+// Poll an upload job until it finishes, backing off while it runs.
+// Resolves with the upload result, the same shape /upload returns synchronously.
+// Plain polling works on any worker class; the /jobs/<id>/events SSE stream
+// holds a worker per job and needs gthread or gevent workers.
+const JOB_POLL_INITIAL_MS = 500;
+const JOB_POLL_MAX_MS = 3000;
+
+const waitForJob = async (jobId, onProgress) => {
+  let delay = JOB_POLL_INITIAL_MS;
+  let last = null;
+  while (true) {
+    let job;
+    try {
+      job = (await api.get(`/jobs/${jobId}`)).data.job;
+    } catch (error) {
+      if (error.response?.status === 404) throw new Error('Upload job not found');
+      // Transient network or server error: keep polling, more slowly
+      delay = Math.min(delay * 2, JOB_POLL_MAX_MS);
+      await new Promise((resolve) => setTimeout(resolve, delay));
+      continue;
+    }
+
+    if (job.status === 'done') return { ...job.result, success: true, job_id: jobId };
+    if (job.status === 'failed') throw new Error(job.error || 'Resume processing failed');
+
+    const state = `${job.status}:${job.stage}:${job.attempts}`;
+    if (state !== last) {
+      last = state;
+      delay = JOB_POLL_INITIAL_MS;
+      onProgress?.({ job_id: jobId, status: job.status, stage: job.stage, attempts: job.attempts });
+    } else {
+      delay = Math.min(delay * 1.5, JOB_POLL_MAX_MS);
+    }
+    await new Promise((resolve) => setTimeout(resolve, delay));
+  }
+};
+
 // API methods
 export const apiService = {
   // Health check
   healthCheck: () => api.get('/health'),
 
-  // Resume upload and analysis
-  uploadResume: (formData) => {
-    return api.post('/upload', formData, {
+  // Resume upload and analysis: the upload is queued on the server and its
+  // job is polled until the result is ready, so slow analyses do not hit
+  // the request timeout. Resolves with { data: result } like a plain post.
+  uploadResume: async (formData, onProgress) => {
+    formData.append('async', 'true');
+    const response = await api.post('/upload', formData, {
       headers: {
         'Content-Type': 'multipart/form-data',
       },
     });
+    if (response.status !== 202) return response;
+    return { data: await waitForJob(response.data.job_id, onProgress) };
+  },
+  getUploadJob: (jobId) => api.get(`/jobs/${jobId}`),
+
+  // Many resumes (or ZIP archives) in one request; onEvent gets the 'batch'
+  // header, one 'result' per resume as it finishes, then a 'summary'
+  // `skip` gives, per file, how many of its resumes a paused batch already started
+  uploadBatch: (files, jobDescription, onEvent, signal, skip = []) => {
+    const formData = new FormData();
+    files.forEach((file) => formData.append('files', file));
+    formData.append('job_description', jobDescription);
+    if (skip.some((count) => count > 0)) {
+      formData.append('skip', JSON.stringify(skip));
+    }
+    return streamNDJSON('/upload/batch', formData, onEvent, signal);
   },
 
   // Candidates
   getCandidates: () => api.get('/candidates'),
   getCandidate: (id) => api.get(`/candidates/${id}`),
 
+  // Server-side filtered search; array values are sent as repeated keys (?skill=a&skill=b)
+  queryCandidates: (params) => {
+    const query = new URLSearchParams();
+    Object.entries(params).forEach(([key, value]) => {
+      [].concat(value).forEach((item) => {
+        if (item !== undefined && item !== null && item !== '') query.append(key, item);
+      });
+    });
+    return api.get(`/candidates/query?${query.toString()}`);
+  },
+
+  // Semantic matching over the local vector index
+  matchCandidates: (jobDescription, top = 50) =>
+    api.get('/match', { params: { jd: jobDescription, top } }),
+
+  // Two-stage screening: send locally scored candidates to AI review
+  promoteCandidate: (id) => api.post(`/candidates/${id}/promote`),
+  promoteTopCandidates: (jobDescription, topK) =>
+    api.post('/screening/promote', { job_description: jobDescription, top_k: topK }),
+
   // Bias analysis
   getBiasAnalysis: (candidateId) => api.get(`/bias-analysis/${candidateId}`),
+  getBiasSummary: (jobDescription) =>
+    api.get('/bias-analysis/summary', { params: jobDescription ? { job_description: jobDescription } : {} }),
+  getBiasRescoreStatus: () => api.get('/bias-analysis/rescore'),
+  rescoreBiasAnalysis: () => api.post('/bias-analysis/rescore'),
   getBlindResume: (candidateId) => api.get(`/blind-resume/${candidateId}`),
 
   // Chat
-  chatWithCandidate: (candidateId, message) => 
-    api.post('/chat', { candidate_id: candidateId, message }),
+  chatWithCandidate: (candidateId, message, sessionId) => 
+    api.post('/chat', { candidate_id: candidateId, message, session_id: sessionId }),
+  getChatHistory: (candidateId) => api.get(`/chat/${candidateId}/history`),
   
   hrChat: (message) => 
     api.post('/hr-chat', { message }),
 
+  // Streaming chat (Server-Sent Events); onToken receives each text chunk
+  streamChatWithCandidate: (candidateId, message, onToken, sessionId) =>
+    streamSSE('/chat/stream', { candidate_id: candidateId, message, session_id: sessionId }, onToken),
+
+  streamHrChat: (message, onToken) =>
+    streamSSE('/hr-chat/stream', { message }, onToken),
+
   // Fair screening
   toggleFairScreening: (enabled) => 
     api.post('/fair-screening/toggle', { enabled }),